@@ -1,3 +1,10 @@
+import os
+import sys
+
+# import trace (opt-in), as in knavigation: set the environment variable KNAV_IMPORT_TRACE.
+if os.environ.get("KNAV_IMPORT_TRACE"):
+    print(f"import: __name__ = {__name__}, __package__ = {__package__}, sys.path[0] = {sys.path[0]}", file=sys.stderr)
+
 from .k1orderltisyssiso     import k1OrderLTIsysSisoContinuous, k1OrderLTIsysSisoDiscrete
 from .k1orderltisysmimo     import k1OrderLTIsysMimoDiscrete, fn_example_mimo
 from .k1orderltisyssiso     import fn_example_siso
@@ -12,12 +12,6 @@ Lizenz: MIT License
 GitHub: 
 """
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
-import sys
-print( "**************************************" )
-print(f"** __name__    = {__name__}")
-print(f"** __package__ = {__package__}")
-print(f"** sys.path[0] = {sys.path[0]}")
-#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 ##WWww=--  import section: --=wwWW##
 import numpy              as np
 
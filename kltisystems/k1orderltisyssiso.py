@@ -14,7 +14,6 @@ GitHub:
 #====================================#
 ##WWww=--  import section: --=wwWW##
 import numpy              as np
-import scipy.integrate    as Int
 
 ###################################
 ## First Order Continuous System ##
@@ -48,6 +47,7 @@ class k1OrderLTIsysSisoContinuous:
         return self.pole*(y-x)
 
     def update(self, t, x):
+        import scipy.integrate as Int # loaded only when needed
         y = Int.odeint(self._dydt, self.y, [self.t, t], (x,)) # returns y[t-1] e y[t]
         self.y = y.reshape(-1)[1]
         self.t = t
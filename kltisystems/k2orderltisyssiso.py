@@ -16,7 +16,6 @@ GitHub:
 import numpy           as np
 from   numpy           import dot
 from   numpy           import inf
-from   scipy.integrate import odeint
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
 #                                                                                  #
@@ -137,6 +136,7 @@ class k2OrderLTIsysSisoContinuous (kCommon2OrderLTIsysSiso):
         """
 
         if t > self.curr_t:
+            from scipy.integrate import odeint # loaded only when needed
             t0 = self.curr_t
             _,y = odeint(self._dstate_dt, self.get_state(), [t0, t], (u,))
             self.curr_t = t
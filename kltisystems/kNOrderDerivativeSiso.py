@@ -15,7 +15,6 @@ GitHub:
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 ##WWww=--  import section: --=wwWW##
 import numpy            as np
-import scipy.signal     as ss
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
 #                                                                                  #
@@ -25,10 +24,12 @@ class kSystemBA:
         self.B = num
         self.A = den
 
-        # initialize the filter:
+        # initialize the filter (scipy is loaded only when needed):
+        import scipy.signal as ss
         _, self.state = ss.lfilter(self.B, self.A, [0], zi=ss.lfiltic(self.B, self.A, []))
 
     def update(self, sample):
+        import scipy.signal as ss
         out, self.state = ss.lfilter(self.B, self.A, [sample], zi=self.state)
         return(out)
 
@@ -78,6 +79,7 @@ class kNOrderDerivativeSiso:
         return A, B, D
 
     def _setup_systems_for_each_derivative(self):
+        import scipy.signal as ss
         system = list()
         for i in range(self.order+1):
             # when i==0, the system will be a LP filter to smooth the input
@@ -1,6 +1,20 @@
-from .kArray    import kArray
-from .kArrayNav import kArrayNav
-from .kNavLib   import kNavLib
+import os
+import sys
+
+# import trace (opt-in): with the environment variable KNAV_IMPORT_TRACE set
+# (eg. KNAV_IMPORT_TRACE=1), the packages report their import on stderr.
+if os.environ.get("KNAV_IMPORT_TRACE"):
+    print(f"import: __name__ = {__name__}, __package__ = {__package__}, sys.path[0] = {sys.path[0]}", file=sys.stderr)
+
+# The classes have the same names as their modules, so they are imported here,
+# with the package: a later `import knavigation.kArray` does not rebind the name
+# to the module. scipy and mpmath are only loaded on first use.
+from .kArray         import kArray
+from .kArrayNav      import kArrayNav
+from .kNavLib        import kNavLib
+from .kNavValues     import Vec3, Mat3, Quat
+from .kNavStrapdown  import kNavStrapdown
+from .kNavBenchmarks import kNavBenchmarks
 
 __version__ = "1.0.0"
 __author__  = "Luciano A. Kruk"
@@ -11,24 +11,26 @@ Lizenz:
 GitHub: 
 """
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
-import sys
-print( "**************************************" )
-print(f"** __name__    = {__name__}")
-print(f"** __package__ = {__package__}")
-print(f"** sys.path[0] = {sys.path[0]}")
-#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 import numpy as np
 from .kArrayLib import kArrayLib
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+# multiplied element-wise by kArray.__mul__():
+_SCALARS = (int, float, np.number)
+
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kArrayCommon:
+    __slots__ = ()
 
     TYPE_ARRAY       = 0
     TYPE_VERTICAL    = 1
     TYPE_HORIZONTAL  = 2
     TYPE_SINGLEVALUE = 3
 
+    # relative tolerance of the comparisons (==):
+    EQ_TOL           = 1e-10
+
     @classmethod
     def _type(cls, val):
         """
@@ -39,7 +41,7 @@ class kArrayCommon:
         """
 
         assert isinstance(val, np.ndarray)
-        assert all( [i>0 for i in val.shape] )
+        assert 0 not in val.shape
 
         size = val.shape
         if len(size) == 1:
@@ -85,26 +87,46 @@ class kArrayCommon:
 
     #( --- miscelaneous --- )#
     def __eq__(self, y):
-        tol = 1e-10
-        ret = True
-        y   = self.__class__(y)
+        """
+        True when both have the same shape, and all elements are equal within
+        the relative tolerance: |a-b| <= max(|a|,|b|).EQ_TOL
+        """
+        y = self.__class__(y)
 
         if self.shape != y.shape:
-            ret = False
+            return False
 
-        if not all( [ abs(i-j) <= max( [abs(i), abs(j)] )*tol for i,j in zip(self, y) ] ):
-            ret = False
+        a = np.asarray(self)
+        b = np.asarray(y)
+        return bool( np.all( np.abs(a-b) <= (np.maximum(np.abs(a), np.abs(b))*self.EQ_TOL) ) )
 
-        return ret
+    @classmethod
+    def batch_eq(cls, A, B):
+        """
+        Compares two stacks of vectors/matrices [N x ...] with the same criterion
+        as '=='.
+
+        : return : ndarray [N] of bool, True where A[i] == B[i]
+        """
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float)
+        assert A.shape == B.shape
+
+        ok = np.abs(A-B) <= (np.maximum(np.abs(A), np.abs(B))*cls.EQ_TOL)
+        return ok.reshape(len(ok), -1).all(axis=1)
 
     def __ne__(self, y):
         return not self.__eq__(y)
 
     def to_list(self):
-        return self.reshape(-1).tolist()
+        return np.asarray(self).ravel().tolist()
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kArray (kArrayCommon, kArrayLib, np.ndarray):
+    # No instance __dict__: every view and slice (eg. `q[1:]`, `self[0,0]`)
+    # creates a new kArray, and none of them carries attributes. A subclass
+    # that needs attributes can omit __slots__ and implement __array_finalize__().
+    __slots__ = ()
 
     def __new__(cls, *args, hvector=None):
         """
@@ -162,26 +184,38 @@ class kArray (kArrayCommon, kArrayLib, np.ndarray):
 
         return obj
 
-    def __repr__(self):
-        return "{:s} |{:s}|".format(str(self.__class__.__name__), self._do_format("f"))
+    @classmethod
+    def _wrap(cls, val, vtype=kArrayCommon.TYPE_ARRAY):
+        """
+        Fast internal constructor, for library methods that already know the
+        shape of the result. It skips the classification of the input, and does
+        not copy 'val' when it is already an array of float64 (the result may
+        share memory with 'val').
+
+            vtype = TYPE_ARRAY       : 'val' is already 2D and keeps its shape
+            vtype = TYPE_VERTICAL    : reshaped to [N x 1]
+            vtype = TYPE_HORIZONTAL  : reshaped to [1 x N]
+            vtype = TYPE_SINGLEVALUE : reshaped to [1 x 1]
+        """
 
-    def __init__(self, *args, **kargs):
-        pass
+        val = np.asarray(val, dtype=float)
 
-    def __array_finalize__(self, obj) -> None:
-        """
-        Stattdessen wird array_finalize von NumPy selbst bei
-        View-/Slicing-Operationen aufgerufen und sollte Attribute von obj
-        kopieren oder initialisieren.
+        if vtype == cls.TYPE_VERTICAL:
+            val = val.reshape(-1,1)
+        elif vtype == cls.TYPE_HORIZONTAL:
+            val = val.reshape(1,-1)
+        elif vtype == cls.TYPE_SINGLEVALUE:
+            val = val.reshape(1,1)
+        else:
+            assert val.ndim == 2
 
-        Wird aufgerufen bei Slicing, uvm.
-        """
+        return val.view(cls)
 
-        if obj is None: return
+    def __repr__(self):
+        return "{:s} |{:s}|".format(str(self.__class__.__name__), self._do_format("f"))
 
-        # This attribute should be maintained!
-        default_attributes = {"attr": 1}
-        self.__dict__.update(default_attributes)
+    def __init__(self, *args, **kargs):
+        pass
 
     def __format__(self, fmt):
         return self._do_format(fmt)
@@ -189,21 +223,45 @@ class kArray (kArrayCommon, kArrayLib, np.ndarray):
     # NumPy implements matrix multiplication other than we learn in the school.
     # Here I will bring it back.
     def __mul__(self, y):
-        if isinstance(y, (int, float)):
-            ret = super().__mul__(y)
+        if isinstance(y, _SCALARS):
+            return super().__mul__(y)
 
-        elif isinstance(y, (self.__class__)) or True: # <-- before failing, try this anyway (eg. kArrayNav)
-            axb = self @ y
-            ret = axb.view(self.__class__)
+        # matrix product: the operands are taken as plain ndarrays, so numpy does
+        # not negotiate the subclass of the result (eg. kArrayNav), and the
+        # class is restored only once at the end:
+        axb = np.matmul(np.asarray(self), np.asarray(y))
 
-            # last check: if `ret` is a matrix [1x1], then return a float:
-            if ret.shape in [(1), (1,1)]:
-                ret = float(ret.squeeze())
+        # last check: if `axb` is a matrix [1x1], then return a float:
+        if axb.shape == (1,1):
+            return float(axb[0,0])
 
-        else:
-            raise(NameError(f"not prepared for type '{str(type(y))}' [self.__class__ = {self.__class__}]"))
+        return axb.view(self.__class__)
+
+    @staticmethod
+    def batch_matmul(A, B):
+        """
+        Matrix product A[i] * B[i] of each pair in two stacks of matrices. One of
+        them can be a single matrix, which is broadcasted. For stacks of vectors,
+        use batch_matvec().
+        : input  : A = ndarray [N x n x m] or [n x m]
+        : input  : B = ndarray [N x m x k] or [m x k]
+        : return : ndarray [N x n x k]
+        """
+        return np.matmul(np.asarray(A, dtype=float), np.asarray(B, dtype=float))
 
-        return ret
+    @staticmethod
+    def batch_matvec(A, V):
+        """
+        Product A[i] * V[i] of a stack of matrices with a stack of vectors, each
+        row of V being a vertical vector. A single matrix [n x m] or a single
+        vector [m] is broadcasted.
+        : input  : A = ndarray [N x n x m] or [n x m]
+        : input  : V = ndarray [N x m] or [m]
+        : return : ndarray [N x n] (or [n], with a single matrix and vector)
+        """
+        A = np.asarray(A, dtype=float)
+        V = np.asarray(V, dtype=float)
+        return np.einsum('...ij,...j->...i', A, V)
 
     # y * self:
     def __rmul__(self, y):
@@ -217,9 +275,10 @@ class kArray (kArrayCommon, kArrayLib, np.ndarray):
 
     #( --- iter --- )#
     def __iter__(self):
-        temp = self.reshape(-1).tolist()
-        for i in temp:
-            yield i
+        # iterates over all elements as python floats. For the sizes used here
+        # (up to 3x3), tolist() on the plain ndarray is cheaper than a flat
+        # iterator, which would yield numpy scalars:
+        return iter(np.asarray(self).ravel().tolist())
 
     def to_numpy(self):
         return np.asarray(self).copy()
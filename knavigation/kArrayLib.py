@@ -11,25 +11,20 @@ Lizenz:
 GitHub: 
 """
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
-import sys
-print( "**************************************" )
-print(f"** __name__    = {__name__}")
-print(f"** __package__ = {__package__}")
-print(f"** sys.path[0] = {sys.path[0]}")
-#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 import numpy as np
 from math import sqrt
-from scipy.linalg import svd, qr
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kArrayLib:
+    __slots__ = ()
+
     def to_skew(self):
         vtype = self._type(self)
         if vtype in [ self.TYPE_HORIZONTAL, self.TYPE_VERTICAL ]:
             val  = self.squeeze()
             assert len(val) == 3
-            return self.__class__( [
+            return self._wrap( [
                 [0, -val[2], val[1]],
                 [val[2], 0, -val[0]],
                 [-val[1], val[0], 0] 
@@ -48,11 +43,44 @@ class kArrayLib:
         a = self.squeeze()
         b = y.squeeze()
 
-        return self.__class__( [
+        return self._wrap( [
             (a[1]*b[2]) - (a[2]*b[1]),
             (a[2]*b[0]) - (a[0]*b[2]),
             (a[0]*b[1]) - (a[1]*b[0])
-        ], hvector=False )
+        ], self.TYPE_VERTICAL )
+
+    @staticmethod
+    def batch_to_skew(V):
+        """
+        Skew-symmetric matrix of each vector in a stack.
+        : input  : V = ndarray [N x 3]
+        : return : ndarray [N x 3 x 3]
+        """
+        V = np.asarray(V, dtype=float)
+        assert V.ndim == 2 and V.shape[1] == 3
+
+        S = np.zeros((len(V), 3, 3))
+        S[:,0,1] = -V[:,2]
+        S[:,0,2] =  V[:,1]
+        S[:,1,0] =  V[:,2]
+        S[:,1,2] = -V[:,0]
+        S[:,2,0] = -V[:,1]
+        S[:,2,1] =  V[:,0]
+        return S
+
+    @staticmethod
+    def batch_X(A, B):
+        """
+        Cross-product A[i] X B[i] of each pair in two stacks of vectors.
+        One of them can be a single vector [3], which is broadcasted.
+        : input  : A, B = ndarray [N x 3]
+        : return : ndarray [N x 3]
+        """
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float)
+        assert A.shape[-1] == 3 and B.shape[-1] == 3
+
+        return np.cross(A, B)
 
     def apply(self, fn):
         """
@@ -66,11 +94,22 @@ class kArrayLib:
     def norm(self):
         vtype = self._type(self)
         if vtype in [ self.TYPE_HORIZONTAL, self.TYPE_VERTICAL ]:
-            return sqrt( sum( [i**2 for i in self.squeeze()] ))
+            v = np.asarray(self).reshape(-1)
+            return sqrt( v.dot(v) )
         elif vtype == self.TYPE_SINGLEVALUE:
             return abs(float(self.squeeze()))
         else:
-            raise(NameError(f"not prepared for type '{str(type(y))}' [self.__class__ = {self.__class__}]"))
+            raise(NameError(f"norm() is only defined for vectors [shape = {self.shape}, self.__class__ = {self.__class__}]"))
+
+    @staticmethod
+    def batch_norm(V):
+        """
+        Euclidean norm of each vector in a stack.
+        : input  : V = ndarray [N x k]
+        : return : ndarray [N]
+        """
+        V = np.asarray(V, dtype=float)
+        return np.sqrt( np.einsum('...i,...i->...', V, V) )
 
     def inv(self):
         return np.linalg.inv(self).view(self.__class__)
@@ -80,17 +119,63 @@ class kArrayLib:
         Orthogonalizes the given matrix.
 
         The methods are:
-           'qr'  :  decomposition QR
-           'svd' :  nearest orthogonal matrix to 'self' in Frobenius norm (using SVD)
+           'qr'     :  decomposition QR
+           'svd'    :  nearest orthogonal matrix to 'self' in Frobenius norm (using SVD)
+           'bjorck' :  iterations of Björck, for square matrices near orthogonal
+                       (see batch_to_orth())
         """
 
+        if method == "bjorck":
+            return self._wrap( self.batch_to_orth(np.asarray(self)[np.newaxis], method)[0] )
+
+        # scipy is loaded only when needed:
+        from scipy.linalg import svd, qr
+
         if method == "qr":
             Q, _ = qr(self, mode="economic")
-            return self.__class__(Q)
+            return self._wrap(Q)
 
         elif method == "svd":
             U, s, Vt = svd(self, full_matrices=False)
-            return self.__class__(U @ Vt)
+            return self._wrap(U @ Vt)
+
+        else:
+            raise NameError(f'method "{method}" is still not supported')
+
+    @staticmethod
+    def batch_to_orth(M, method="svd", iterations=3):
+        """
+        Orthogonalizes each matrix in a stack, in one call.
+
+        The methods are:
+           'qr'     :  decomposition QR, as to_orth("qr")
+           'svd'    :  nearest orthogonal matrix in Frobenius norm, as to_orth("svd")
+           'bjorck' :  'iterations' steps of X <- X + 0.5.X.(I - X^T.X), which
+                       converge to the result of 'svd' for square matrices near
+                       orthogonal (eg. a DCM integrated along the time) using
+                       only matrix products.
+
+        : input  : M = ndarray [N x n x n]
+        : return : ndarray [N x n x n]
+        """
+        M = np.asarray(M, dtype=float)
+        assert M.ndim == 3
+
+        if method == "qr":
+            Q, _ = np.linalg.qr(M, mode="reduced")
+            return Q
+
+        elif method == "svd":
+            U, s, Vt = np.linalg.svd(M, full_matrices=False)
+            return U @ Vt
+
+        elif method == "bjorck":
+            assert M.shape[1] == M.shape[2]
+            I = np.eye(M.shape[1])
+            X = M.copy()
+            for i in range(iterations):
+                X = X + (0.5 * (X @ (I - (X.transpose(0,2,1) @ X))))
+            return X
 
         else:
             raise NameError(f'method "{method}" is still not supported')
@@ -11,29 +11,23 @@ Lizenz:
 GitHub:
 """
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
-import sys
-print( "**************************************" )
-print(f"** __name__    = {__name__}")
-print(f"** __package__ = {__package__}")
-print(f"** sys.path[0] = {sys.path[0]}")
-#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 import numpy as np
 from math      import sin, sqrt, cos, tan, atan, atan2, asin, pi
-from mpmath    import sec
 from .kArray   import kArray
 from .kNavLib  import kNavLib
-from .kQuatNav import kQuatNav
+from .kQuatNav import kQuatNav, _C2Q_shepperd
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kNavTransformations(kNavLib, kQuatNav):
+    __slots__ = ()
 
     def to_deg(self):
-        return self.__class__(self * 180. / pi)
+        return self * (180. / pi)
         #return val * 180. / pi
 
     def to_rad(self):
-        return self.__class__(self * pi / 180.)
+        return self * (pi / 180.)
         #return val * pi / 180.
 
     def euler2Q(self):
@@ -50,17 +44,17 @@ class kNavTransformations(kNavLib, kQuatNav):
         Return
             (kArray)  :  Q4 (a + b.i + c.j + d.k)
         """
-        array = self.squeeze()
+        array = self.to_list()
         assert len(array) == 3
 
         half_phi, half_theta, half_psi = (0.5*i for i in array)
 
-        return self.__class__( [
+        return self._wrap( [
             (cos(half_phi)*cos(half_theta)*cos(half_psi)) + (sin(half_phi)*sin(half_theta)*sin(half_psi)),
             (sin(half_phi)*cos(half_theta)*cos(half_psi)) - (cos(half_phi)*sin(half_theta)*sin(half_psi)),
             (cos(half_phi)*sin(half_theta)*cos(half_psi)) + (sin(half_phi)*cos(half_theta)*sin(half_psi)),
             (cos(half_phi)*cos(half_theta)*sin(half_psi)) - (sin(half_phi)*sin(half_theta)*cos(half_psi))
-        ], hvector=False );
+        ], self.TYPE_VERTICAL );
 
     def Q2euler(self):
         """
@@ -74,7 +68,7 @@ class kNavTransformations(kNavLib, kQuatNav):
             (kArray) [rad] [phi, theta, psi]
         """
 
-        q     = self.squeeze()
+        q     = self.to_list()
         assert len(q) == 4
 
         c11 = (q[0]**2.0) + (q[1]**2.0) - (q[2]**2.0) - (q[3]**2.0) # C[0,0]
@@ -87,7 +81,7 @@ class kNavTransformations(kNavLib, kQuatNav):
         psi   = atan2(c21, c11)
         theta = asin(-c31)
 
-        return self.__class__( (phi, theta, psi) )
+        return self._wrap( (phi, theta, psi), self.TYPE_HORIZONTAL )
 
     def Q2C(self):
         """
@@ -109,7 +103,7 @@ class kNavTransformations(kNavLib, kQuatNav):
 
         """
 
-        q = self.squeeze()
+        q = self.to_list()
         assert len(q) == 4
 
         C = np.empty((3,3))
@@ -125,7 +119,7 @@ class kNavTransformations(kNavLib, kQuatNav):
         C[2,1] = 2.0 * ((q[2]*q[3]) - (q[0]*q[1]));
         C[2,2] = (q[0]**2.0) - (q[1]**2.0) - (q[2]**2.0) + (q[3]**2.0);
 
-        return self.__class__( C )
+        return self._wrap( C )
 
     def _Q2C(self):
         """
@@ -170,7 +164,7 @@ class kNavTransformations(kNavLib, kQuatNav):
         psi   = atan2(c21, c11)
         theta = asin(-c31)
 
-        return self.__class__( (phi, theta, psi) )
+        return self._wrap( (phi, theta, psi), self.TYPE_HORIZONTAL )
 
     def euler2C(self):
         """
@@ -192,7 +186,7 @@ class kNavTransformations(kNavLib, kQuatNav):
             C  :  Transformation Matrix
         """
 
-        a = self.squeeze()
+        a = self.to_list()
         assert len(a) == 3
 
         sphi, stheta, spsi = (sin(i) for i in a)
@@ -211,13 +205,173 @@ class kNavTransformations(kNavLib, kQuatNav):
         C[2][1] = (cphi*stheta*spsi) - (sphi*cpsi)
         C[2][2] = cphi*ctheta
 
-        return self.__class__( C )
+        return self._wrap( C )
 
     def C2Q(self):
         """
-        Navigation -- from C to Q
+        Navigation -- from C to Q, directly (Shepperd's method), without the
+        euler angles. It has no singularity at theta = +-90deg.
+
+        Return
+            (kArray)  :  Q4 (a + b.i + c.j + d.k), with a >= 0
+        """
+        assert self.shape == (3,3)
+        return self._wrap( _C2Q_shepperd(self.to_list()), self.TYPE_VERTICAL )
+
+    #( --- batch conversions: stacks of attitudes, with the equations above --- )#
+    @staticmethod
+    def batch_euler2Q(E):
+        """
+        : input  : E = ndarray [N x 3] euler angles [rad] [phi, theta, psi]
+        : return : ndarray [N x 4] Q4 (a + b.i + c.j + d.k)
+        """
+        E = np.asarray(E, dtype=float)
+        assert E.ndim == 2 and E.shape[1] == 3
+
+        s = np.sin(0.5*E)
+        c = np.cos(0.5*E)
+        sphi, stta, spsi = s[:,0], s[:,1], s[:,2]
+        cphi, ctta, cpsi = c[:,0], c[:,1], c[:,2]
+
+        Q = np.empty((len(E), 4))
+        Q[:,0] = (cphi*ctta*cpsi) + (sphi*stta*spsi)
+        Q[:,1] = (sphi*ctta*cpsi) - (cphi*stta*spsi)
+        Q[:,2] = (cphi*stta*cpsi) + (sphi*ctta*spsi)
+        Q[:,3] = (cphi*ctta*spsi) - (sphi*stta*cpsi)
+        return Q
+
+    @staticmethod
+    def batch_Q2euler(Q):
+        """
+        : input  : Q = ndarray [N x 4] quaternions
+        : return : ndarray [N x 3] euler angles [rad] [phi, theta, psi]
+                   (theta is NaN where the quaternion is out of the domain of asin)
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.ndim == 2 and Q.shape[1] == 4
+        q0, q1, q2, q3 = Q[:,0], Q[:,1], Q[:,2], Q[:,3]
+
+        c11 = (q0*q0) + (q1*q1) - (q2*q2) - (q3*q3)
+        c21 = 2.0 * ((q1*q2) + (q0*q3))
+        c31 = 2.0 * ((q1*q3) - (q0*q2))
+        c32 = 2.0 * ((q2*q3) + (q0*q1))
+        c33 = (q0*q0) - (q1*q1) - (q2*q2) + (q3*q3)
+
+        E = np.empty((len(Q), 3))
+        E[:,0] = np.arctan2(c32, c33)
+        E[:,1] = np.arcsin(-c31)
+        E[:,2] = np.arctan2(c21, c11)
+        return E
+
+    @staticmethod
+    def batch_Q2C(Q):
+        """
+        : input  : Q = ndarray [N x 4] quaternions
+        : return : ndarray [N x 3 x 3] transformation matrices
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.ndim == 2 and Q.shape[1] == 4
+        q0, q1, q2, q3 = Q[:,0], Q[:,1], Q[:,2], Q[:,3]
+
+        C = np.empty((len(Q), 3, 3))
+        C[:,0,0] = (q0*q0) + (q1*q1) - (q2*q2) - (q3*q3)
+        C[:,0,1] = 2.0 * ((q1*q2) + (q0*q3))
+        C[:,0,2] = 2.0 * ((q1*q3) - (q0*q2))
+
+        C[:,1,0] = 2.0 * ((q1*q2) - (q0*q3))
+        C[:,1,1] = (q0*q0) - (q1*q1) + (q2*q2) - (q3*q3)
+        C[:,1,2] = 2.0 * ((q2*q3) + (q0*q1))
+
+        C[:,2,0] = 2.0 * ((q1*q3) + (q0*q2))
+        C[:,2,1] = 2.0 * ((q2*q3) - (q0*q1))
+        C[:,2,2] = (q0*q0) - (q1*q1) - (q2*q2) + (q3*q3)
+        return C
+
+    @staticmethod
+    def batch_C2euler(C):
+        """
+        : input  : C = ndarray [N x 3 x 3] transformation matrices
+        : return : ndarray [N x 3] euler angles [rad] [phi, theta, psi]
+        """
+        C = np.asarray(C, dtype=float)
+        assert C.ndim == 3 and C.shape[1:] == (3,3)
+
+        E = np.empty((len(C), 3))
+        E[:,0] = np.arctan2(C[:,1,2], C[:,2,2])
+        E[:,1] = np.arcsin(-C[:,0,2])
+        E[:,2] = np.arctan2(C[:,0,1], C[:,0,0])
+        return E
+
+    @staticmethod
+    def batch_euler2C(E):
+        """
+        : input  : E = ndarray [N x 3] euler angles [rad] [phi, theta, psi]
+        : return : ndarray [N x 3 x 3] transformation matrices
+        """
+        E = np.asarray(E, dtype=float)
+        assert E.ndim == 2 and E.shape[1] == 3
+
+        s = np.sin(E)
+        c = np.cos(E)
+        sphi, stheta, spsi = s[:,0], s[:,1], s[:,2]
+        cphi, ctheta, cpsi = c[:,0], c[:,1], c[:,2]
+
+        C = np.empty((len(E), 3, 3))
+        C[:,0,0] = ctheta * cpsi
+        C[:,0,1] = ctheta * spsi
+        C[:,0,2] = -stheta
+
+        C[:,1,0] = (sphi*stheta*cpsi) - (cphi*spsi)
+        C[:,1,1] = (cphi*cpsi) + (sphi*stheta*spsi)
+        C[:,1,2] = sphi*ctheta
+
+        C[:,2,0] = (sphi*spsi) + (cphi*stheta*cpsi)
+        C[:,2,1] = (cphi*stheta*spsi) - (sphi*cpsi)
+        C[:,2,2] = cphi*ctheta
+        return C
+
+    @staticmethod
+    def batch_C2Q(C):
+        """
+        Shepperd's method, as C2Q(). The products 4.qi.qj are all linear in the
+        elements of C:
+
+            P = 4.q.q^T = [[ 1+tr        ,  c12-c21         ,  c20-c02         ,  c01-c10         ],
+                           [ c12-c21     ,  1+c00-c11-c22   ,  c01+c10         ,  c02+c20         ],
+                           [ c20-c02     ,  c01+c10         ,  1-c00+c11-c22   ,  c12+c21         ],
+                           [ c01-c10     ,  c02+c20         ,  c12+c21         ,  1-c00-c11+c22   ]]
+
+        and the row with the largest diagonal gives q = P[i,:] / (2.sqrt(P[i,i])).
+
+        : input  : C = ndarray [N x 3 x 3] transformation matrices
+        : return : ndarray [N x 4] quaternions, with the real part >= 0
         """
-        return self.__class__( self.C2euler().euler2Q() )
+        C = np.asarray(C, dtype=float)
+        assert C.ndim == 3 and C.shape[1:] == (3,3)
+
+        c00, c01, c02 = C[:,0,0], C[:,0,1], C[:,0,2]
+        c10, c11, c12 = C[:,1,0], C[:,1,1], C[:,1,2]
+        c20, c21, c22 = C[:,2,0], C[:,2,1], C[:,2,2]
+
+        P = np.empty((len(C), 4, 4))
+        P[:,0,0] = 1.0 + c00 + c11 + c22
+        P[:,1,1] = 1.0 + c00 - c11 - c22
+        P[:,2,2] = 1.0 - c00 + c11 - c22
+        P[:,3,3] = 1.0 - c00 - c11 + c22
+        P[:,0,1] = P[:,1,0] = c12 - c21
+        P[:,0,2] = P[:,2,0] = c20 - c02
+        P[:,0,3] = P[:,3,0] = c01 - c10
+        P[:,1,2] = P[:,2,1] = c01 + c10
+        P[:,1,3] = P[:,3,1] = c02 + c20
+        P[:,2,3] = P[:,3,2] = c12 + c21
+
+        # (the first of the largest, as in _C2Q_shepperd()):
+        n = np.arange(len(C))
+        i = np.argmax( np.diagonal(P, axis1=1, axis2=2), axis=1 )
+
+        Q = P[n,i,:] / (2.0 * np.sqrt(P[n,i,i]))[:,np.newaxis]
+        Q[Q[:,0] < 0] *= -1.0
+        return Q
 
     def ecef_llh2xyz(self):
         """
@@ -226,7 +380,7 @@ class kNavTransformations(kNavLib, kQuatNav):
         : output  : xzy_e [m]
         """
 
-        geo = self.squeeze()
+        geo = self.to_list()
         assert len(geo) == 3
         lat = geo[0]
         lon = geo[1]
@@ -235,11 +389,11 @@ class kNavTransformations(kNavLib, kQuatNav):
         s  = sin(lat);
         RN = self.earth_a / sqrt(1.0 - (self.earth_e2 * s * s));
 
-        return self.__class__( [
+        return self._wrap( [
             (RN + h) * cos(lat) * cos(lon),
             (RN + h) * cos(lat) * sin(lon),
             ((RN * (1.0 - self.earth_e2)) + h) * sin(lat)
-        ], hvector=False )
+        ], self.TYPE_VERTICAL )
 
     def ecef_xyz2llh(self):
         """
@@ -248,7 +402,7 @@ class kNavTransformations(kNavLib, kQuatNav):
         : output : llh  = (lat_rad, lon_rad, h_m)
         """
 
-        rect = self.squeeze()
+        rect = self.to_list()
         assert len(rect) == 3
         x = rect[0]
         y = rect[1]
@@ -272,7 +426,72 @@ class kNavTransformations(kNavLib, kQuatNav):
 
         lon = atan2(y, x);
 
-        return self.__class__( [lat, lon, h] )
+        return self._wrap( [lat, lon, h], self.TYPE_HORIZONTAL )
+
+    @classmethod
+    def batch_ecef_llh2xyz(cls, LLH):
+        """
+        : input  : LLH = ndarray [N x 3] (lat_rad, lon_rad, h_m)
+        : output : ndarray [N x 3] xyz_e [m]
+        """
+        LLH = np.asarray(LLH, dtype=float)
+        assert LLH.ndim == 2 and LLH.shape[1] == 3
+        lat, lon, h = LLH[:,0], LLH[:,1], LLH[:,2]
+
+        s    = np.sin(lat)
+        clat = np.cos(lat)
+        RN   = cls.earth_a / np.sqrt(1.0 - (cls.earth_e2 * s * s))
+
+        XYZ = np.empty_like(LLH)
+        XYZ[:,0] = (RN + h) * clat * np.cos(lon)
+        XYZ[:,1] = (RN + h) * clat * np.sin(lon)
+        XYZ[:,2] = ((RN * (1.0 - cls.earth_e2)) + h) * s
+        return XYZ
+
+    @classmethod
+    def batch_ecef_xyz2llh(cls, XYZ):
+        """
+        Closed-form inversion of Vermeille (2004), "Computing geodetic coordinates
+        from geocentric coordinates", J. Geodesy 78. No iterations: all points
+        are converted with the same sequence of ufuncs.
+
+        Accuracy, against the round trip llh -> xyz -> llh for heights in
+        [-10 km, 1000 km]: below 1e-8 m in height and 1e-15 rad in latitude.
+        ecef_xyz2llh() stops its iterations at 1 cm, with errors up to ~1e-4 m
+        and ~1e-11 rad. The method is valid for points farther than ~43 km
+        from the center of the earth.
+
+        : input  : XYZ = ndarray [N x 3] xyz_e [m]
+        : output : ndarray [N x 3] (lat_rad, lon_rad, h_m)
+        """
+        XYZ = np.asarray(XYZ, dtype=float)
+        assert XYZ.ndim == 2 and XYZ.shape[1] == 3
+        x, y, z = XYZ[:,0], XYZ[:,1], XYZ[:,2]
+
+        a  = cls.earth_a
+        e2 = cls.earth_e2
+        e4 = e2 * e2
+
+        rho2 = (x * x) + (y * y)
+        rho  = np.sqrt(rho2)
+
+        p = rho2 / (a * a)
+        q = ((1.0 - e2) * z * z) / (a * a)
+        r = (p + q - e4) / 6.0
+        s = (e4 * p * q) / (4.0 * r * r * r)
+        t = np.cbrt(1.0 + s + np.sqrt(s * (2.0 + s)))
+        u = r * (1.0 + t + (1.0 / t))
+        v = np.sqrt((u * u) + (e4 * q))
+        w = (e2 * (u + v - q)) / (2.0 * v)
+        k = np.sqrt(u + v + (w * w)) - w
+        D = (k * rho) / (k + e2)
+        Dz = np.sqrt((D * D) + (z * z))
+
+        LLH = np.empty_like(XYZ)
+        LLH[:,0] = 2.0 * np.arctan2(z, D + Dz)
+        LLH[:,1] = np.arctan2(y, x)
+        LLH[:,2] = ((k + e2 - 1.0) / k) * Dz
+        return LLH
 
     def dEulerDt(self, w):
         """
@@ -287,7 +506,7 @@ class kNavTransformations(kNavLib, kQuatNav):
             d[phi, theta, psi]/dt [rad/s]
         """
 
-        a = self.squeeze()
+        a = self.to_list()
         assert len(a) == 3
 
         phi, theta, psi = a # [rad]
@@ -302,13 +521,15 @@ class kNavTransformations(kNavLib, kQuatNav):
         aux = (b[1]*sin(phi)) + (b[2]*cos(phi))
         dphi = (aux * tan(theta)) + b[0]
         dtta = (b[1]*cos(phi)) - (b[2]*sin(phi))
-        dpsi = aux * sec(theta)
+        dpsi = aux / cos(theta) # sec(theta)
 
-        return self.__class__( [dphi, dtta, dpsi] )
+        return self._wrap( [dphi, dtta, dpsi], self.TYPE_HORIZONTAL )
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 
 class kArrayNav (kArray, kNavTransformations):
+    __slots__ = ()
+
     def __init__(self, *args, **kargs):
         if len(args) > 0:
             super().__init__(*args, **kargs)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kNavBenchmarks.py
+Beschreibung: Micro-benchmarks of kArray/kArrayNav against plain ndarray, with
+    results written to JSON to track regressions along the time.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz: Please keep this header with the file.
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+import numpy as np
+from kunspecific.kBenchmarks import kBenchmarks
+from .kArrayNav import kArrayNav
+from .kNavStrapdown import kNavStrapdown
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class kNavBenchmarks(kBenchmarks):
+    """
+    Benchmarks:
+        slicing      :  cost of views and slices of kArrayNav vs. ndarray, as used
+                        inside kNavTransformations (eg. `q[1:]`, `self[0,0]`, `.T`)
+        earth_model  :  latency of dWen_dt() and Jacobian_dwin_LLH(): scalar,
+                        with a kNavEpoch, and batch (per call of N points)
+        quaternion   :  one step of attitude: dqdt() (one evaluation of the RHS)
+                        and q_propagate(), scalar and batch (per quaternion)
+        resample     :  batch_q_resample() of a log of N attitudes to N other
+                        instants, per output sample
+        strapdown    :  kNavStrapdown.run(), per IMU sample
+
+    Use:
+        kNavBenchmarks(verbose=True).do_benchmarks("bench_knav.json")
+
+    The timing and the report are the ones of kunspecific.kBenchmarks.
+    """
+
+    BENCHMARKS = ("bench_slicing", "bench_earth_model", "bench_quaternion", "bench_resample", "bench_strapdown")
+
+    # statements evaluated with `a` (matrix [3x3]) and `q` (vector [4x1]):
+    SLICING = (
+        "a[1:]",
+        "a[0,0]",
+        "a.T",
+        "a.view()",
+        "q[1:]",
+        "q.squeeze()",
+        "q.reshape(-1)",
+    )
+
+    # statements evaluated with the scalars lat, h, vN, vE, vD, vNp, vEp:
+    EARTH_MODEL = (
+        "kArrayNav.dWen_dt(lat, vN, vE, vD, h, vNp, vEp)",
+        "kArrayNav.Jacobian_dwin_LLH(vN, vE, lat, h)",
+        "ep.dWen_dt(vN, vE, vD, vNp, vEp)",
+        "ep.Jacobian_dwin_LLH(vN, vE)",
+    )
+
+    # the same, with arrays [N]:
+    EARTH_MODEL_BATCH = (
+        "kArrayNav.batch_dWen_dt(lat, vN, vE, vD, h, vNp, vEp)",
+        "kArrayNav.batch_Jacobian_dwin_LLH(vN, vE, lat, h)",
+    )
+
+    # statements evaluated with `q` (quaternion [4x1]), `w` (list [3]) and `dt`:
+    QUATERNION = (
+        "q.dqdt(w)",
+        "q.q_propagate(w, dt)",
+    )
+
+    # methods of batch_q_resample():
+    RESAMPLE = ("slerp", "nlerp", "squad")
+
+    def __init__(self, calls=20000, repeat=5, sizes=(1000, 100000), verbose=False):
+        super().__init__(repeat=repeat, verbose=verbose)
+        self.calls   = calls
+        self.sizes   = sizes
+
+    def bench_slicing(self):
+        a = kArrayNav( np.random.randn(3,3) )
+        q = kArrayNav( [1,0,0,0], hvector=False )
+
+        namespaces = {
+            "kArrayNav" : { "a": a, "q": q },
+            "ndarray"   : { "a": a.to_numpy(), "q": q.to_numpy() },
+        }
+
+        for stmt in self.SLICING:
+            for label, namespace in namespaces.items():
+                self._measure("slicing", { "stmt": stmt, "class": label }, stmt, number=self.calls, namespace=namespace)
+
+    def bench_earth_model(self):
+        lat, h = 0.7, 100.0
+        namespace = {
+            "kArrayNav" : kArrayNav,
+            "ep"        : kArrayNav.epoch(lat, h),
+            "lat"       : lat,
+            "h"         : h,
+            "vN"        : 10.0,
+            "vE"        : 20.0,
+            "vD"        : 1.0,
+            "vNp"       : 0.1,
+            "vEp"       : 0.2,
+        }
+
+        for stmt in self.EARTH_MODEL:
+            self._measure("earth_model", { "stmt": stmt }, stmt, number=self.calls, namespace=namespace)
+
+        for n in self.sizes:
+            namespace.update( {
+                "lat" : np.linspace(-1.4, 1.4, n),
+                "h"   : np.linspace(0, 1e4, n),
+                "vN"  : np.full(n, 10.0),
+                "vE"  : np.full(n, 20.0),
+                "vD"  : np.full(n, 1.0),
+                "vNp" : np.full(n, 0.1),
+                "vEp" : np.full(n, 0.2),
+            } )
+
+            for stmt in self.EARTH_MODEL_BATCH:
+                self._measure("earth_model", { "stmt": stmt, "N": n }, stmt, number=max(1, self.calls // n), namespace=namespace)
+
+    def bench_quaternion(self):
+        namespace = {
+            "kArrayNav" : kArrayNav,
+            "q"         : kArrayNav( [0.1, -0.2, 0.3] ).euler2Q(),
+            "w"         : [0.01, 0.02, -0.03],
+            "dt"        : 0.005,
+        }
+
+        for stmt in self.QUATERNION:
+            self._measure("quaternion", { "stmt": stmt }, stmt, number=self.calls, namespace=namespace)
+
+        stmt = "kArrayNav.batch_q_propagate(Q, W, dt)"
+        for n in self.sizes:
+            namespace.update( {
+                "Q" : kArrayNav.batch_euler2Q( np.random.randn(n, 3) ),
+                "W" : np.random.randn(n, 3),
+            } )
+            self._measure("quaternion", { "stmt": stmt, "N": n }, stmt, number=max(1, self.calls // n), samples=n, namespace=namespace)
+
+    def bench_resample(self):
+        for n in self.sizes:
+            t         = np.arange(n) * 0.01
+            namespace = {
+                "kArrayNav" : kArrayNav,
+                "t"         : t,
+                "Q"         : kArrayNav.batch_euler2Q( np.cumsum(np.random.randn(n, 3) * 0.01, axis=0) ),
+                "t_new"     : np.sort( np.random.rand(n) * t[-1] ),
+            }
+
+            for method in self.RESAMPLE:
+                stmt = "kArrayNav.batch_q_resample(t, Q, t_new, {:s})".format(repr(method))
+                self._measure("resample", { "method": method, "N": n }, stmt, number=max(1, self.calls // n), samples=n, namespace=namespace)
+
+    def bench_strapdown(self):
+        n  = max(1, self.calls // 10)
+        dt = 1/200.
+        namespace = {
+            "kNavStrapdown" : kNavStrapdown,
+            "dtheta"        : np.random.randn(n, 3) * 1e-3,
+            "dv"            : (np.random.randn(n, 3) * 1e-2) + [0, 0, -9.8*dt],
+            "dt"            : dt,
+        }
+
+        stmt = "kNavStrapdown([0.7, 0.1, 100.], [0, 0, 0], [1, 0, 0, 0], dt).run(dtheta, dv)"
+        self._measure("strapdown", { "N": n, "dt": dt }, stmt, samples=n, namespace=namespace)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
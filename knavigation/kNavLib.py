@@ -15,8 +15,75 @@ from math import sqrt, sin, cos, tan
 import numpy as np
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+# Kernels of the earth model (radii and gravity), used by the scalar and batch
+# methods, kNavEpoch and kNavStrapdown. As the kernels below, they use only
+# arithmetic, and s, c = sin(lat), cos(lat) are calculated by the caller.
+
+def _radii_kernel(a, e2, s):
+    """
+    : return : sq = sqrt(1 - e2.s^2), R_phi, R_lbd  (Farrell/Barth, eq 6-13 and 6-14)
+    """
+    W  = 1.0 - (e2 * s * s)
+    sq = W ** 0.5
+    return sq, a / sq, (a * (1.0 - e2)) / (W * sq)
+
+def _gravity_kernel(coef, s, c, h):
+    """
+    : parameter : coef  : coefficients of the model (kNavLib.earth_gravity)
+    : return    : gravity [m/s2]  (Farrell, (6-141) and (6-142))
+    """
+    g0, g1, g2, g3, g4, g5 = coef
+    s2 = s * s
+    return (g0 * ( 1. + (g1*s2) - (g2*4.0*s2*c*c) )) - ((g3 - (g4*s2))*h) + (g5*h*h)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+# Kernels of the sympy expressions of dWen_dt() and Jacobian_dwin_LLH(), after
+# elimination of the common subexpressions. They use only arithmetic, so the
+# same code runs with floats (scalar methods, kNavEpoch) and with ndarrays
+# (batch methods). The trigonometric terms are calculated by the caller:
+#
+#   s, c  :  sin(lat), cos(lat)
+#   sq    :  sqrt(1 - e2.s^2)
+
+def _dWen_dt_kernel(a, e2, s, c, sq, h, vN, vE, vD, vNp, vEp):
+    W    = sq * sq                              # 1 - e2.s^2
+    sq3  = W * sq
+    sc   = s * c
+    aRh  = a + (sq * h)                         # sq.(Rphi + h)
+    B    = (a * (e2 - 1.0)) - (sq3 * h)         # -sq^3.(Rlambda + h)
+    dLat = -(vN * sq3) / B
+
+    P    = (a * e2 * sc * dLat) - (sq3 * vD)
+    den  = aRh * aRh * sq
+
+    wp_en_x = ((aRh * W * vEp) - (P * vE)) / den
+    wp_en_y = ((B * sq3 * vNp) - (sq * ((3.0 * a * e2 * (e2 - 1.0) * sc * dLat) + (W * sq3 * vD)) * vN)) / (B * B)
+    wp_en_z = ((P * vE * sc) - (aRh * W * ((vE * dLat) + (sc * vEp)))) / (den * c * c)
+
+    return wp_en_x, wp_en_y, wp_en_z
+
+def _Jacobian_dwin_LLH_kernel(a, e2, wie, s, c, sq, h, vN, vE):
+    W    = sq * sq                              # 1 - e2.s^2
+    sq3  = W * sq
+    aRh  = a + (sq * h)
+    aRh2 = aRh * aRh
+    B    = (a * (e2 - 1.0)) - (sq3 * h)
+    B2   = B * B
+
+    J_00 = -((a * e2 * vE * s * c) / (aRh2 * sq)) - (wie * s)
+    J_10 = -(3.0 * a * e2 * (e2 - 1.0) * vN * sq * s * c) / B2
+    J_20 = ((a * e2 * vE * s * s) - ((vE * aRh * W) / (c * c)) - (wie * aRh2 * sq * c)) / (aRh2 * sq)
+    J_01 = -(vE * W) / aRh2
+    J_11 = (vN * W * W * W) / B2
+    J_21 = (vE * W * s) / (c * aRh2)
+
+    return J_00, J_10, J_20, J_01, J_11, J_21
+
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kNavLib:
+    __slots__ = ()
+
     # Earth Elliptic Model #
     earth_a  = 6378137.0; # [m]
     earth_b  = 6356752.3142; # [m]
@@ -25,9 +92,22 @@ class kNavLib:
     earth_e  = sqrt(earth_f*(2.0-earth_f));
     earth_e2 = (earth_e**2.0);
 
+    # normal gravity, see _gravity_kernel():
+    #   g = g0.(1 + g1.sin(lat)^2 - g2.sin(2.lat)^2) - (g3 - g4.sin(lat)^2).h + g5.h^2
+    earth_gravity = (9.780327, 0.0053024, 0.0000058, 3.0877e-6, 0.0044e-6, 0.072e-12)
+
     def __init__(self, **kargs):
         super().__init__(**kargs)
 
+    @classmethod
+    def epoch(cls, lat_rad, h_m):
+        """
+        Returns a kNavEpoch for (lat_rad, h_m): the trigonometric terms and the
+        radii of the earth are calculated once, and shared by all quantities of
+        the same navigation epoch. See kNavEpoch.
+        """
+        return kNavEpoch(cls, lat_rad, h_m)
+
     @classmethod
     def Rlambda(cls, lat_rad):
         """
@@ -35,7 +115,7 @@ class kNavLib:
         : output    : R_lbd
         : (Farrell/Barth, eq 6-13)
         """
-        return (cls.earth_a*(1.-cls.earth_e2)) / ((1.-(cls.earth_e2*(sin(lat_rad)**2)))**1.5);
+        return _radii_kernel(cls.earth_a, cls.earth_e2, sin(lat_rad))[2]
 
     @classmethod
     def Rphi(cls, lat_rad):
@@ -44,7 +124,7 @@ class kNavLib:
         : output    : R_phi
         : (Farrell/Barth, eq 6-14)
         """
-        return cls.earth_a / sqrt(1.-(cls.earth_e2*(sin(lat_rad)**2.0)));
+        return _radii_kernel(cls.earth_a, cls.earth_e2, sin(lat_rad))[1]
 
     @classmethod
     def gravity(cls, lat_rad, h_m):
@@ -57,12 +137,7 @@ class kNavLib:
         : parameter : h_m     [m]    altitude above sea level
         : return    : gravity [m/s2] model of gravity for WGS-84
         """
-        s2  = (sin(lat_rad))**2
-        s22 = (sin(2.0*lat_rad))**2
-        gamma_lat   = 9.780327 * ( 1. + (0.0053024*s2) - (0.0000058*s22) )
-        gamma_lat_h = gamma_lat - ((3.0877e-6 - (0.0044e-6*s2) )*h_m) + (0.072e-12*(h_m**2))
-
-        return gamma_lat_h
+        return _gravity_kernel(cls.earth_gravity, sin(lat_rad), cos(lat_rad), h_m)
 
     @classmethod
     def dLat_dt(cls, vN, lat_rad, h_m):
@@ -112,7 +187,7 @@ class kNavLib:
         Re2n[2,1] = -cos(lat)*sin(lon);
         Re2n[2,2] = -sin(lat);
 
-        return cls( Re2n )
+        return cls._wrap( Re2n )
 
     @classmethod
     def gravity_n(cls, lat_rad, h_m):
@@ -124,7 +199,7 @@ class kNavLib:
         : return    : vector with local gravity [3x1]
         """
 
-        return cls( [0,0,cls.gravity(lat_rad, h_m)], hvector=False )
+        return cls._wrap( [0,0,cls.gravity(lat_rad, h_m)], cls.TYPE_VERTICAL )
 
     @classmethod
     def dLLH_dt(cls, vN, vE, vD, lat_rad, h_m):
@@ -139,10 +214,10 @@ class kNavLib:
         : parameter : h_m     : [m]   altitude above sea level
         """
 
-        return cls( [
+        return cls._wrap( [
             cls.dLat_dt(vN, lat_rad, h_m),
             cls.dLong_dt(vE, lat_rad, h_m),
-            -vD ], hvector=False )
+            -vD ], cls.TYPE_VERTICAL )
 
     @classmethod
     def w_ie_n(cls, lat_rad):
@@ -153,11 +228,11 @@ class kNavLib:
         """
 
         wie = cls.wie
-        return cls( [
+        return cls._wrap( [
             wie * cos(lat_rad),
             0.0,
             -wie * sin(lat_rad)
-        ], hvector=False )
+        ], cls.TYPE_VERTICAL )
 
     @classmethod
     def w_en_n(cls, dLat_dt, dLong_dt, lat_rad):
@@ -169,11 +244,11 @@ class kNavLib:
         : parameter : lat_rad   : [rad]   latitude
         """
 
-        return cls( [
+        return cls._wrap( [
             dLong_dt * cos(lat_rad),
             - dLat_dt,
             - dLong_dt * sin(lat_rad)
-        ], hvector=False )
+        ], cls.TYPE_VERTICAL )
 
     @classmethod
     def w_in_n(cls, vN, vE, lat_rad, h_m):
@@ -199,7 +274,7 @@ class kNavLib:
     def dWen_dt(cls, lat_rad, vN, vE, vD, h_m, vNp, vEp):
         """
         Calculates the first derivative of w_en_n, i.e d(w_en_n)/dt.
-        (The expressions were obtained with sympy!)
+        (The expressions were obtained with sympy, see _dWen_dt_kernel())
 
         : parameter : lat_rad [rad]  latitude
         : parameter : vN      [m/s]  velocity north
@@ -210,16 +285,12 @@ class kNavLib:
         : parameter : vEp     [m/s2] d(vE)/dt
         """
 
-        dLat     = cls.dLat_dt(vN, lat_rad, h_m)
-        slat     = sin(lat_rad)
-        clat     = cos(lat_rad)
-        e2s2l2   = cls.earth_e2 * slat**2.0
+        slat = sin(lat_rad)
+        sq   = sqrt(1.0 - (cls.earth_e2 * slat * slat))
 
-        wp_en_x =  ((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vEp - (1.0*cls.earth_a*cls.earth_e2*slat*clat*dLat + (-e2s2l2 + 1.0)**(3/2)*-vD)*vE)/((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)**2*sqrt(-e2s2l2 + 1.0))
-        wp_en_y =  ((cls.earth_a*(cls.earth_e2 - 1.0) - (-e2s2l2 + 1.0)**1.5*h_m)*(-e2s2l2 + 1.0)**1.5*vNp - (-e2s2l2 + 1.0)**0.5*(1.5*cls.earth_a*cls.earth_e2*(cls.earth_e2 - 1.0)*sin(2*lat_rad)*dLat - (-e2s2l2 + 1.0)**2.5*-vD)*vN)/(cls.earth_a*(cls.earth_e2 - 1.0) - (-e2s2l2 + 1.0)**1.5*h_m)**2
-        wp_en_z =  (-(cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vE*slat**2*dLat - (cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vE*clat**2*dLat - (cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*slat*clat*vEp + (1.0*cls.earth_a*cls.earth_e2*slat*clat*dLat + (-e2s2l2 + 1.0)**(3/2)*-vD)*vE*slat*clat)/((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)**2*sqrt(-e2s2l2 + 1.0)*clat**2)
+        wp_en_x, wp_en_y, wp_en_z = _dWen_dt_kernel(cls.earth_a, cls.earth_e2, slat, cos(lat_rad), sq, h_m, vN, vE, vD, vNp, vEp)
 
-        return cls( [ wp_en_x, wp_en_y, wp_en_z ], hvector=False )
+        return cls._wrap( [ wp_en_x, wp_en_y, wp_en_z ], cls.TYPE_VERTICAL )
 
 
     @classmethod
@@ -241,7 +312,7 @@ class kNavLib:
         Rphi = cls.Rphi(lat_rad)
         Rlbd = cls.Rlambda(lat_rad)
 
-        J = cls( [
+        J = cls._wrap( [
             [     0,          1/(h_m + Rphi),          0   ],
             [-1/(h_m + Rlbd),         0,               0   ],
             [     0,    -tan(lat_rad)/(h_m + Rphi),    0   ],
@@ -253,7 +324,7 @@ class kNavLib:
     def Jacobian_dwin_LLH(cls, vN, vE, lat_rad, h_m):
         """
         Calculates the Jacobian of w_in_n by (lat/h):
-        (by sympy!)
+        (by sympy, see _Jacobian_dwin_LLH_kernel())
 
             [ d(win_n_x)/dlat   d(win_n_x)/dlon   d(win_n_x)/dh ]
         J = | d(win_n_y)/dlat   d(win_n_y)/dlon   d(win_n_y)/dh ]
@@ -266,35 +337,255 @@ class kNavLib:
           h_m     : [m]   altitude above sea level
 
         """
-        slat  = sin(lat_rad)
-        clat  = cos(lat_rad)
-        s2lat = sin(2*lat_rad)
-        c2lat = cos(2*lat_rad)
-        slat2 = slat**2
-        clat2 = clat**2
-        lat   = lat_rad
-        h     = h_m
+        slat = sin(lat_rad)
+        sq   = sqrt(1.0 - (cls.earth_e2 * slat * slat))
+
+        J_00, J_10, J_20, J_01, J_11, J_21 = _Jacobian_dwin_LLH_kernel(cls.earth_a, cls.earth_e2, cls.wie, slat, cos(lat_rad), sq, h_m, vN, vE)
+
+        J = cls._wrap( [
+            [J_00, 0.0, J_01],
+            [J_10, 0.0, J_11],
+            [J_20, 0.0, J_21],
+        ])
+
+        return J
+
+    #( --- batch versions: arrays [N] of lat/h/velocities, with the equations above --- )#
+    # (the stacks [N x 3] and [N x 3 x 3] take scalar inputs as N = 1)
+    @classmethod
+    def batch_Rlambda(cls, lat_rad):
+        """
+        : parameter : lat_rad [rad] latitudes [N]
+        : output    : R_lbd [N]
+        """
+        slat = np.sin(np.asarray(lat_rad, dtype=float))
+        return _radii_kernel(cls.earth_a, cls.earth_e2, slat)[2]
 
-        J_00 = -1.0*cls.earth_a*cls.earth_e2*vE*slat**1.0*clat/((cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0)) - cls.wie*slat
+    @classmethod
+    def batch_Rphi(cls, lat_rad):
+        """
+        : parameter : lat_rad [rad] latitudes [N]
+        : output    : R_phi [N]
+        """
+        slat = np.sin(np.asarray(lat_rad, dtype=float))
+        return _radii_kernel(cls.earth_a, cls.earth_e2, slat)[1]
 
-        J_10 = -1.06066017177982*cls.earth_a*cls.earth_e2*vN*(cls.earth_e2 - 1.0)*(cls.earth_e2*c2lat - cls.earth_e2 + 2)**0.5*s2lat/(-cls.earth_a*cls.earth_e2 + cls.earth_a + h*(0.5*cls.earth_e2*c2lat - 0.5*cls.earth_e2 + 1)**1.5)**2
+    @classmethod
+    def batch_gravity(cls, lat_rad, h_m):
+        """
+        : parameter : lat_rad [rad]  latitudes [N]
+        : parameter : h_m     [m]    altitudes [N]
+        : return    : gravity [m/s2] [N]
+        """
+        lat_rad = np.asarray(lat_rad, dtype=float)
+        return _gravity_kernel(cls.earth_gravity, np.sin(lat_rad), np.cos(lat_rad), np.asarray(h_m, dtype=float))
 
-        J_20 = (1.0*cls.earth_a*cls.earth_e2*vE*slat2 - vE*(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))*(-cls.earth_e2*slat2 + 1.0)/clat2 - cls.wie*(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0)*clat)/(
-                (cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0))
+    @classmethod
+    def batch_dLat_dt(cls, vN, lat_rad, h_m):
+        """
+        : return : d(latitude)/dt [rad/s] [N]
+        """
+        return np.asarray(vN, dtype=float) / (cls.batch_Rlambda(lat_rad) + h_m)
 
-        J_01 = vE*(cls.earth_e2*slat2 - 1.0)/(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2
+    @classmethod
+    def batch_dLong_dt(cls, vE, lat_rad, h_m):
+        """
+        : return : d(longitude)/dt [rad/s] [N]
+        """
+        return np.asarray(vE, dtype=float) / (np.cos(lat_rad) * (cls.batch_Rphi(lat_rad) + h_m))
 
-        J_11 = vN*(-cls.earth_e2*slat2 + 1.0)**3.0/(cls.earth_a*(cls.earth_e2 - 1.0) - h*(-cls.earth_e2*slat2 + 1.0)**1.5)**2
+    @classmethod
+    def batch_Re2n(cls, lat, lon):
+        """
+        : input    : lat   [rad] [N]
+        : input    : lon   [rad] [N]
+        : output   : Re2n [N x 3 x 3]
+        """
+        lat, lon   = np.broadcast_arrays(np.atleast_1d(np.asarray(lat, dtype=float)), np.asarray(lon, dtype=float))
+        slat, clat = np.sin(lat), np.cos(lat)
+        slon, clon = np.sin(lon), np.cos(lon)
+
+        Re2n = np.zeros((len(lat), 3, 3))
+        Re2n[:,0,0] = -slat*clon
+        Re2n[:,0,1] = -slat*slon
+        Re2n[:,0,2] = clat
+        Re2n[:,1,0] = -slon
+        Re2n[:,1,1] = clon
+        Re2n[:,2,0] = -clat*clon
+        Re2n[:,2,1] = -clat*slon
+        Re2n[:,2,2] = -slat
+
+        return Re2n
 
-        J_21 = vE*(-cls.earth_e2*slat2 + 1.0)*tan(lat)/(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2
+    @classmethod
+    def batch_gravity_n(cls, lat_rad, h_m):
+        """
+        : return : local gravity vectors [N x 3]
+        """
+        g = np.atleast_1d(cls.batch_gravity(lat_rad, h_m))
+        return np.stack( (np.zeros_like(g), np.zeros_like(g), g), axis=1 )
 
-        J = cls( [
+    @classmethod
+    def batch_dLLH_dt(cls, vN, vE, vD, lat_rad, h_m):
+        """
+        : return : derivatives of latitude, longitude and altitude [N x 3]
+        """
+        vN, vE, vD, lat_rad, h_m = np.broadcast_arrays( *[np.atleast_1d(np.asarray(i, dtype=float)) for i in (vN, vE, vD, lat_rad, h_m)] )
+
+        return np.stack( (
+            cls.batch_dLat_dt(vN, lat_rad, h_m),
+            cls.batch_dLong_dt(vE, lat_rad, h_m),
+            -vD ), axis=1 )
+
+    @classmethod
+    def batch_w_ie_n(cls, lat_rad):
+        """
+        : return : angular velocities of the earth over the inertial frame, at 'n' [N x 3]
+        """
+        lat_rad = np.atleast_1d(np.asarray(lat_rad, dtype=float))
+        wie     = cls.wie
+        return np.stack( (
+            wie * np.cos(lat_rad),
+            np.zeros_like(lat_rad),
+            -wie * np.sin(lat_rad) ), axis=1 )
+
+    @classmethod
+    def batch_w_en_n(cls, dLat_dt, dLong_dt, lat_rad):
+        """
+        : return : angular velocities of the navigation frame over the earth frame, at 'n' [N x 3]
+        """
+        dLat_dt, dLong_dt, lat_rad = np.broadcast_arrays( *[np.atleast_1d(np.asarray(i, dtype=float)) for i in (dLat_dt, dLong_dt, lat_rad)] )
+        return np.stack( (
+            dLong_dt * np.cos(lat_rad),
+            - dLat_dt,
+            - dLong_dt * np.sin(lat_rad) ), axis=1 )
+
+    @classmethod
+    def batch_w_in_n(cls, vN, vE, lat_rad, h_m):
+        """
+        : return : angular velocities of the navigation frame, at 'n' [N x 3]
+        """
+        dLatDt = cls.batch_dLat_dt(vN, lat_rad, h_m)
+        dLonDt = cls.batch_dLong_dt(vE, lat_rad, h_m)
+
+        return cls.batch_w_ie_n(lat_rad) + cls.batch_w_en_n(dLatDt, dLonDt, lat_rad)
+
+    @classmethod
+    def batch_dWen_dt(cls, lat_rad, vN, vE, vD, h_m, vNp, vEp):
+        """
+        : return : d(w_en_n)/dt [N x 3]
+        """
+        lat_rad = np.atleast_1d(np.asarray(lat_rad, dtype=float))
+        slat    = np.sin(lat_rad)
+        sq      = np.sqrt(1.0 - (cls.earth_e2 * slat * slat))
+
+        ret = _dWen_dt_kernel(cls.earth_a, cls.earth_e2, slat, np.cos(lat_rad), sq, h_m, vN, vE, vD, vNp, vEp)
+        return np.stack( np.broadcast_arrays(*ret), axis=1 )
+
+    @classmethod
+    def batch_Jacobian_dwin_LLH(cls, vN, vE, lat_rad, h_m):
+        """
+        : return : Jacobians of w_in_n by (lat/h) [N x 3 x 3]
+        """
+        lat_rad = np.atleast_1d(np.asarray(lat_rad, dtype=float))
+        slat    = np.sin(lat_rad)
+        sq      = np.sqrt(1.0 - (cls.earth_e2 * slat * slat))
+
+        J_00, J_10, J_20, J_01, J_11, J_21 = np.broadcast_arrays( *_Jacobian_dwin_LLH_kernel(cls.earth_a, cls.earth_e2, cls.wie, slat, np.cos(lat_rad), sq, h_m, vN, vE) )
+
+        J = np.zeros((len(J_00), 3, 3))
+        J[:,0,0], J[:,1,0], J[:,2,0] = J_00, J_10, J_20
+        J[:,0,2], J[:,1,2], J[:,2,2] = J_01, J_11, J_21
+        return J
+
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class kNavEpoch:
+    """
+    The earth-model quantities of kNavLib for one navigation epoch, ie. one
+    (lat, h). sin(lat), cos(lat) and sqrt(1 - e2.sin(lat)^2) are calculated only
+    once, at the creation, instead of in every method:
+
+        ep     = kArrayNav.epoch(lat_rad, h_m)
+        w_in_n = ep.w_in_n(vN, vE)
+        J      = ep.Jacobian_dwin_LLH(vN, vE)
+        g_n    = ep.gravity_n()
+
+    The methods have the same names and results as in kNavLib, without the
+    arguments lat_rad and h_m. The arrays are created with the class given by
+    'nav' (eg. kArrayNav).
+    """
+    __slots__ = ("nav", "lat", "h", "slat", "clat", "tlat", "sq", "Rphi", "Rlambda", "g")
+
+    def __init__(self, nav, lat_rad, h_m):
+        self.nav     = nav
+        self.lat     = lat_rad
+        self.h       = h_m
+        self.slat    = sin(lat_rad)
+        self.clat    = cos(lat_rad)
+        self.tlat    = self.slat / self.clat
+
+        # sqrt(1 - e2.sin(lat)^2) and the radii:
+        self.sq, self.Rphi, self.Rlambda = _radii_kernel(nav.earth_a, nav.earth_e2, self.slat)
+        self.g       = _gravity_kernel(nav.earth_gravity, self.slat, self.clat, h_m)
+
+    def gravity(self):
+        return self.g
+
+    def gravity_n(self):
+        return self.nav._wrap( [0, 0, self.gravity()], self.nav.TYPE_VERTICAL )
+
+    def dLat_dt(self, vN):
+        return vN / (self.Rlambda + self.h)
+
+    def dLong_dt(self, vE):
+        return vE / (self.clat * (self.Rphi + self.h))
+
+    def dLLH_dt(self, vN, vE, vD):
+        return self.nav._wrap( [ self.dLat_dt(vN), self.dLong_dt(vE), -vD ], self.nav.TYPE_VERTICAL )
+
+    def w_ie_n(self):
+        wie = self.nav.wie
+        return self.nav._wrap( [ wie * self.clat, 0.0, -wie * self.slat ], self.nav.TYPE_VERTICAL )
+
+    def w_en_n(self, vN, vE):
+        """
+        (in kNavLib, the arguments are the derivatives of lat and long)
+        """
+        dLong = self.dLong_dt(vE)
+        return self.nav._wrap( [ dLong * self.clat, -self.dLat_dt(vN), -dLong * self.slat ], self.nav.TYPE_VERTICAL )
+
+    def w_in_n(self, vN, vE):
+        dLat  = self.dLat_dt(vN)
+        dLong = self.dLong_dt(vE)
+        wie   = self.nav.wie
+        return self.nav._wrap( [
+            (wie + dLong) * self.clat,
+            -dLat,
+            -(wie + dLong) * self.slat
+        ], self.nav.TYPE_VERTICAL )
+
+    def dWen_dt(self, vN, vE, vD, vNp, vEp):
+        nav = self.nav
+        ret = _dWen_dt_kernel(nav.earth_a, nav.earth_e2, self.slat, self.clat, self.sq, self.h, vN, vE, vD, vNp, vEp)
+        return nav._wrap( ret, nav.TYPE_VERTICAL )
+
+    def Jacobian_dwin_vNED(self):
+        Rphi_h = self.h + self.Rphi
+        return self.nav._wrap( [
+            [     0,                  1/Rphi_h,          0   ],
+            [-1/(self.h + self.Rlambda),   0,            0   ],
+            [     0,           -self.tlat/Rphi_h,        0   ],
+        ])
+
+    def Jacobian_dwin_LLH(self, vN, vE):
+        nav = self.nav
+        J_00, J_10, J_20, J_01, J_11, J_21 = _Jacobian_dwin_LLH_kernel(nav.earth_a, nav.earth_e2, nav.wie, self.slat, self.clat, self.sq, self.h, vN, vE)
+
+        return nav._wrap( [
             [J_00, 0.0, J_01],
             [J_10, 0.0, J_11],
             [J_20, 0.0, J_21],
         ])
 
-        return J
-
-
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
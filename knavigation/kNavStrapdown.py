@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kNavStrapdown.py
+Beschreibung: Strapdown INS mechanization (attitude, velocity and position in
+    the geografic frame, NED) from the increments of angle and velocity of an IMU.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz: Please keep this header with the file.
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from math import sqrt, sin, cos
+import numpy as np
+from .kNavLib import kNavLib, _radii_kernel, _gravity_kernel
+from .kQuatNav import _rotvec2q
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class kNavStrapdown:
+    """
+    Strapdown mechanization in the geografic frame (n = NED), with the WGS-84
+    model of kNavLib. The IMU delivers, for each interval 'dt':
+
+        dtheta  :  [rad] increment of angle,    integral of w_ib_b
+        dv      :  [m/s] increment of velocity, integral of the specific force f_b
+
+    and each interval is processed with (Titterton, chapter 11):
+
+        - coning compensation (two samples):
+            phi    = dtheta + 1/12 . dtheta_prev x dtheta
+        - rotation and sculling compensation (two samples):
+            dv_b   = dv + 1/2 . dtheta x dv + 1/12 . (dtheta_prev x dv + dv_prev x dtheta)
+        - velocity, with the rotation of 'n' along the interval (zeta = w_in_n.dt):
+            dv_n   = Cb2n . dv_b - 1/2 . zeta x (Cb2n . dv_b)
+            v_n   += dv_n + (g_n - (2.w_ie_n + w_en_n) x v_n) . dt
+        - position (trapezoidal, with dLLH_dt()):
+            llh   += dLLH_dt(v_mid) . dt
+        - attitude, with the convention of kQuatNav (q_n2b, cascade with q_x_q()):
+            q_n2b  = q(-w_in_n.dt) o q_n2b o q(phi)
+
+    The earth terms are evaluated with the state at the beginning of each
+    interval. With coning=False or sculling=False, the respective terms are not
+    used (first-order update).
+
+    The loop runs on floats and writes into preallocated arrays, so no kArray is
+    created per sample. The state is kept between the calls of run(), so a log
+    can be processed in blocks:
+
+        ins      = kNavStrapdown(llh0=[lat, lon, h], v0_n=[0,0,0], q0_n2b=q, dt=1/200.)
+        Q, V, P  = ins.run(dtheta, dv)  # [N x 3] each
+
+    Q [N+1 x 4], V [N+1 x 3] and P [N+1 x 3] (lat, lon, h) have the initial state
+    in the first row. The euler angles are kArrayNav.batch_Q2euler(Q).
+    """
+
+    def __init__(self, llh0, v0_n, q0_n2b, dt, coning=True, sculling=True, nav=kNavLib):
+        """
+        Use:
+            llh0     :  [rad, rad, m] initial latitude, longitude and height
+            v0_n     :  [m/s]         initial velocity (NED)
+            q0_n2b   :  initial attitude, quaternion from 'n' to 'b' (eg. euler2Q())
+            dt       :  [s]           sampling interval of the IMU
+            nav      :  class with the earth model (earth_a, earth_e2, wie and
+                        earth_gravity, as in kNavLib)
+        """
+
+        llh0 = np.asarray(llh0, dtype=float).ravel()
+        v0_n = np.asarray(v0_n, dtype=float).ravel()
+        q0   = np.asarray(q0_n2b, dtype=float).ravel()
+
+        if (len(llh0) != 3) or (len(v0_n) != 3) or (len(q0) != 4):
+            raise(NameError("kNavStrapdown: llh0 and v0_n shall have 3 elements, and q0_n2b 4."))
+        if not (dt > 0):
+            raise(NameError("kNavStrapdown: dt shall be positive."))
+
+        self.nav      = nav
+        self.dt       = float(dt)
+        self.coning   = coning
+        self.sculling = sculling
+
+        self.llh      = llh0.tolist()
+        self.v_n      = v0_n.tolist()
+        self.q_n2b    = (q0 / sqrt(q0.dot(q0))).tolist()
+
+        # increments of the previous interval (coning and sculling):
+        self._dtheta  = [0.0, 0.0, 0.0]
+        self._dv      = [0.0, 0.0, 0.0]
+
+    def run(self, dtheta, dv):
+        """
+        Processes the intervals in 'dtheta' and 'dv' [N x 3].
+
+        : return : Q [N+1 x 4], V [N+1 x 3], LLH [N+1 x 3]
+        """
+
+        dtheta = np.asarray(dtheta, dtype=float).reshape(-1,3)
+        dv     = np.asarray(dv, dtype=float).reshape(-1,3)
+        if dtheta.shape != dv.shape:
+            raise(NameError("kNavStrapdown: dtheta and dv shall have the same shape [N x 3]."))
+
+        n   = dtheta.shape[0]
+        Q   = np.empty((n+1, 4))
+        V   = np.empty((n+1, 3))
+        LLH = np.empty((n+1, 3))
+
+        # constants and state as local floats:
+        dt       = self.dt
+        a        = self.nav.earth_a
+        e2       = self.nav.earth_e2
+        wie      = self.nav.wie
+        g_coef   = self.nav.earth_gravity
+        k_con    = (1.0/12.0) if self.coning   else 0.0
+        k_scul   = (1.0/12.0) if self.sculling else 0.0
+        k_rot    = 0.5        if self.sculling else 0.0
+
+        q0, q1, q2, q3 = self.q_n2b
+        vN, vE, vD     = self.v_n
+        lat, lon, h    = self.llh
+        px, py, pz     = self._dtheta
+        ux, uy, uz     = self._dv
+
+        Q[0]   = (q0, q1, q2, q3)
+        V[0]   = (vN, vE, vD)
+        LLH[0] = (lat, lon, h)
+
+        for k, (tx, ty, tz, bx, by, bz) in enumerate(np.hstack((dtheta, dv)).tolist(), 1):
+
+            #( --- earth model at the beginning of the interval (kNavEpoch) --- )#
+            slat    = sin(lat)
+            clat    = cos(lat)
+            _, Rphi, Rlambda = _radii_kernel(a, e2, slat)
+            g       = _gravity_kernel(g_coef, slat, clat, h)
+
+            dLat    = vN / (Rlambda + h)
+            dLong   = vE / (clat * (Rphi + h))
+
+            # w_ie_n, w_en_n:
+            ie_x, ie_z = wie * clat, -wie * slat
+            en_x, en_y, en_z = dLong * clat, -dLat, -dLong * slat
+
+            #( --- coning and sculling --- )#
+            phx = tx + (k_con * ((py*tz) - (pz*ty)))
+            phy = ty + (k_con * ((pz*tx) - (px*tz)))
+            phz = tz + (k_con * ((px*ty) - (py*tx)))
+
+            dbx = bx + (k_rot * ((ty*bz) - (tz*by))) + (k_scul * (((py*bz) - (pz*by)) + ((uy*tz) - (uz*ty))))
+            dby = by + (k_rot * ((tz*bx) - (tx*bz))) + (k_scul * (((pz*bx) - (px*bz)) + ((uz*tx) - (ux*tz))))
+            dbz = bz + (k_rot * ((tx*by) - (ty*bx))) + (k_scul * (((px*by) - (py*bx)) + ((ux*ty) - (uy*tx))))
+
+            #( --- velocity --- )#
+            # Cb2n = Q2C(q_n2b)^T:
+            c00 = (q0*q0) + (q1*q1) - (q2*q2) - (q3*q3)
+            c01 = 2.0 * ((q1*q2) + (q0*q3))
+            c02 = 2.0 * ((q1*q3) - (q0*q2))
+            c10 = 2.0 * ((q1*q2) - (q0*q3))
+            c11 = (q0*q0) - (q1*q1) + (q2*q2) - (q3*q3)
+            c12 = 2.0 * ((q2*q3) + (q0*q1))
+            c20 = 2.0 * ((q1*q3) + (q0*q2))
+            c21 = 2.0 * ((q2*q3) - (q0*q1))
+            c22 = (q0*q0) - (q1*q1) - (q2*q2) + (q3*q3)
+
+            # (2.w_ie_n + w_en_n) x v_n:
+            wx = (2.0 * ie_x) + en_x
+            wy = en_y
+            wz = (2.0 * ie_z) + en_z
+
+            dnx = (c00*dbx) + (c10*dby) + (c20*dbz)
+            dny = (c01*dbx) + (c11*dby) + (c21*dbz)
+            dnz = (c02*dbx) + (c12*dby) + (c22*dbz)
+
+            # zeta = w_in_n.dt:
+            zx  = (ie_x + en_x) * dt
+            zy  = en_y * dt
+            zz  = (ie_z + en_z) * dt
+
+            vN1 = vN + dnx - (k_rot * ((zy*dnz) - (zz*dny))) - (((wy*vD) - (wz*vE)) * dt)
+            vE1 = vE + dny - (k_rot * ((zz*dnx) - (zx*dnz))) - (((wz*vN) - (wx*vD)) * dt)
+            vD1 = vD + dnz - (k_rot * ((zx*dny) - (zy*dnx))) + ((g - ((wx*vE) - (wy*vN))) * dt)
+
+            #( --- position --- )#
+            lat1 = lat + ((0.5 * (vN + vN1) * dt) / (Rlambda + h))
+            lon  = lon + ((0.5 * (vE + vE1) * dt) / (clat * (Rphi + h)))
+            h    = h - (0.5 * (vD + vD1) * dt)
+            lat  = lat1
+            vN, vE, vD = vN1, vE1, vD1
+
+            #( --- attitude --- )#
+            # q_n2b o q(phi):
+            r0, r1, r2, r3 = _rotvec2q(phx, phy, phz)
+            s0 = (q0*r0) - (q1*r1) - (q2*r2) - (q3*r3)
+            s1 = (q1*r0) + (q0*r1) - (q3*r2) + (q2*r3)
+            s2 = (q2*r0) + (q0*r2) + (q3*r1) - (q1*r3)
+            s3 = (q3*r0) + (q0*r3) - (q2*r1) + (q1*r2)
+
+            # q(-w_in_n.dt) o (...):
+            r0, r1, r2, r3 = _rotvec2q(-zx, -zy, -zz)
+            q0 = (r0*s0) - (r1*s1) - (r2*s2) - (r3*s3)
+            q1 = (r1*s0) + (r0*s1) - (r3*s2) + (r2*s3)
+            q2 = (r2*s0) + (r0*s2) + (r3*s1) - (r1*s3)
+            q3 = (r3*s0) + (r0*s3) - (r2*s1) + (r1*s2)
+
+            nq = 1.0 / sqrt((q0*q0) + (q1*q1) + (q2*q2) + (q3*q3))
+            q0, q1, q2, q3 = q0*nq, q1*nq, q2*nq, q3*nq
+
+            px, py, pz = tx, ty, tz
+            ux, uy, uz = bx, by, bz
+
+            Q[k]   = (q0, q1, q2, q3)
+            V[k]   = (vN, vE, vD)
+            LLH[k] = (lat, lon, h)
+
+        self.q_n2b   = [q0, q1, q2, q3]
+        self.v_n     = [vN, vE, vD]
+        self.llh     = [lat, lon, h]
+        self._dtheta = [px, py, pz]
+        self._dv     = [ux, uy, uz]
+
+        return Q, V, LLH
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kNavValues.py
+Beschreibung: Fixed-size value types (Vec3, Mat3, Quat) with the navigation API
+    of kArrayNav, calculated with plain floats for single-sample paths.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz:
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from math      import sin, sqrt, cos, tan, atan, atan2, asin, pi
+from .kNavLib   import kNavLib
+from .kQuatNav  import _C2Q_shepperd, _rotvec2q
+from .kArrayNav import kArrayNav
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class kNavValue:
+    """
+    Common part of the value types. The conversion to/from kArrayNav is
+    explicit:
+
+        v = Vec3.from_kArrayNav( kArrayNav([1,2,3]) )
+        a = v.to_kArrayNav()
+    """
+    __slots__ = ()
+
+    # relative tolerance of the comparisons (==), as in kArray:
+    EQ_TOL = 1e-10
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, y):
+        if not isinstance(y, self.__class__):
+            return NotImplemented
+        return all( [ abs(i-j) <= max(abs(i), abs(j))*self.EQ_TOL for i,j in zip(self.to_list(), y.to_list()) ] )
+
+    def __ne__(self, y):
+        ret = self.__eq__(y)
+        return ret if ret is NotImplemented else not ret
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{:s}({:s})".format(self.__class__.__name__, ", ".join( [repr(i) for i in self.to_list()] ))
+
+    @classmethod
+    def from_kArrayNav(cls, val):
+        """
+        Creates the value from a kArrayNav (or ndarray, or sequence) with the
+        right number of elements, in any shape.
+        """
+        if hasattr(val, "reshape"):
+            val = val.reshape(-1).tolist()
+        return cls(*val)
+
+    def to_kArrayNav(self):
+        return kArrayNav( self.to_list(), hvector=False )
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class Vec3 (kNavValue):
+    """
+    3D vector (x, y, z). Also used for euler angles [phi, theta, psi] and
+    geodetic coordinates [lat, lon, h].
+    """
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def to_list(self):
+        return [self.x, self.y, self.z]
+
+    def to_kArrayNav(self, hvector=False):
+        """
+        Euler angles and llh are horizontal in kArrayNav (hvector=True);
+        other vectors are vertical.
+        """
+        return kArrayNav( self.to_list(), hvector=hvector )
+
+    #( --- arithmetic --- )#
+    def __add__(self, y):
+        return Vec3(self.x + y.x, self.y + y.y, self.z + y.z)
+
+    def __sub__(self, y):
+        return Vec3(self.x - y.x, self.y - y.y, self.z - y.z)
+
+    def __neg__(self):
+        return Vec3(-self.x, -self.y, -self.z)
+
+    def __mul__(self, k):
+        return Vec3(self.x*k, self.y*k, self.z*k)
+
+    __rmul__ = __mul__
+
+    def dot(self, y):
+        return (self.x*y.x) + (self.y*y.y) + (self.z*y.z)
+
+    def X(self, y):
+        """
+        Cross-product self X y.
+        """
+        return Vec3(
+            (self.y*y.z) - (self.z*y.y),
+            (self.z*y.x) - (self.x*y.z),
+            (self.x*y.y) - (self.y*y.x)
+        )
+
+    def norm(self):
+        return sqrt( (self.x*self.x) + (self.y*self.y) + (self.z*self.z) )
+
+    def to_skew(self):
+        return Mat3(
+            0, -self.z, self.y,
+            self.z, 0, -self.x,
+            -self.y, self.x, 0
+        )
+
+    def to_deg(self):
+        return self * (180. / pi)
+
+    def to_rad(self):
+        return self * (pi / 180.)
+
+    #( --- navigation (see kNavTransformations) --- )#
+    def euler2Q(self):
+        """
+        euler [rad] [phi, theta, psi] to Q4 (a + b.i + c.j + d.k).
+        (Titterton (3.65))
+        """
+        sphi, cphi = sin(0.5*self.x), cos(0.5*self.x)
+        stta, ctta = sin(0.5*self.y), cos(0.5*self.y)
+        spsi, cpsi = sin(0.5*self.z), cos(0.5*self.z)
+
+        return Quat(
+            (cphi*ctta*cpsi) + (sphi*stta*spsi),
+            (sphi*ctta*cpsi) - (cphi*stta*spsi),
+            (cphi*stta*cpsi) + (sphi*ctta*spsi),
+            (cphi*ctta*spsi) - (sphi*stta*cpsi)
+        )
+
+    def euler2C(self):
+        """
+        euler [rad] [phi, theta, psi] to the transformation matrix.
+        (Titterton (3.63), see kNavTransformations.euler2C())
+        """
+        sphi, stheta, spsi = sin(self.x), sin(self.y), sin(self.z)
+        cphi, ctheta, cpsi = cos(self.x), cos(self.y), cos(self.z)
+
+        return Mat3(
+            ctheta * cpsi,
+            ctheta * spsi,
+            -stheta,
+            (sphi*stheta*cpsi) - (cphi*spsi),
+            (cphi*cpsi) + (sphi*stheta*spsi),
+            sphi*ctheta,
+            (sphi*spsi) + (cphi*stheta*cpsi),
+            (cphi*stheta*spsi) - (sphi*cpsi),
+            cphi*ctheta
+        )
+
+    def dEulerDt(self, w):
+        """
+        Derivative of the euler angles [rad/s] for the angular velocity w [rad/s].
+        (Titterton (3-52))
+        """
+        wx, wy, wz = w
+        sphi, cphi = sin(self.x), cos(self.x)
+
+        aux = (wy*sphi) + (wz*cphi)
+        return Vec3(
+            (aux * tan(self.y)) + wx,
+            (wy*cphi) - (wz*sphi),
+            aux / cos(self.y)
+        )
+
+    def ecef_llh2xyz(self):
+        """
+        (lat_rad, lon_rad, h_m) to xyz_e [m].
+        """
+        lat, lon, h = self.x, self.y, self.z
+
+        s  = sin(lat)
+        RN = kNavLib.earth_a / sqrt(1.0 - (kNavLib.earth_e2 * s * s))
+
+        return Vec3(
+            (RN + h) * cos(lat) * cos(lon),
+            (RN + h) * cos(lat) * sin(lon),
+            ((RN * (1.0 - kNavLib.earth_e2)) + h) * s
+        )
+
+    def ecef_xyz2llh(self):
+        """
+        xyz_e [m] to (lat_rad, lon_rad, h_m), with the same iterations as
+        kNavTransformations.ecef_xyz2llh().
+        """
+        x, y, z = self.x, self.y, self.z
+        e2      = kNavLib.earth_e2
+
+        p  = sqrt((x * x) + (y * y))
+        h  = 0
+        RN = kNavLib.earth_a
+        for i in range(100): # timeout
+            lasth = h
+
+            # algorithm (Farrell/Barth p.28)
+            s   = z / (((1.0 - e2) * RN) + h)
+            lat = atan((z + (e2 * RN * s)) / p)
+            RN  = kNavLib.earth_a / sqrt(1.0 - (e2 * s * s))
+            h   = (p / cos(lat)) - RN
+
+            # centimeter accuracy:
+            if abs(lasth-h) < 0.01:
+                break
+
+        return Vec3(lat, atan2(y, x), h)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class Mat3 (kNavValue):
+    """
+    3x3 matrix, with the elements given row by row.
+    """
+    __slots__ = ("m",)
+
+    def __init__(self, *m):
+        if len(m) != 9:
+            raise(NameError("Mat3 expects 9 elements"))
+        self.m = tuple( [float(i) for i in m] )
+
+    @classmethod
+    def eye(cls):
+        return cls(1,0,0, 0,1,0, 0,0,1)
+
+    def to_list(self):
+        return list(self.m)
+
+    def to_kArrayNav(self):
+        m = self.m
+        return kArrayNav( [m[0:3], m[3:6], m[6:9]] )
+
+    def __getitem__(self, rc):
+        r, c = rc
+        return self.m[(3*r) + c]
+
+    @property
+    def T(self):
+        m = self.m
+        return Mat3(m[0], m[3], m[6], m[1], m[4], m[7], m[2], m[5], m[8])
+
+    #( --- arithmetic --- )#
+    def __add__(self, y):
+        return Mat3( *[i+j for i,j in zip(self.m, y.m)] )
+
+    def __sub__(self, y):
+        return Mat3( *[i-j for i,j in zip(self.m, y.m)] )
+
+    def __neg__(self):
+        return Mat3( *[-i for i in self.m] )
+
+    def __mul__(self, y):
+        """
+        Mat3 * Mat3, Mat3 * Vec3 (matrix product), or Mat3 * scalar.
+        """
+        a = self.m
+        if isinstance(y, Vec3):
+            return Vec3(
+                (a[0]*y.x) + (a[1]*y.y) + (a[2]*y.z),
+                (a[3]*y.x) + (a[4]*y.y) + (a[5]*y.z),
+                (a[6]*y.x) + (a[7]*y.y) + (a[8]*y.z)
+            )
+        elif isinstance(y, Mat3):
+            b = y.m
+            return Mat3(
+                (a[0]*b[0]) + (a[1]*b[3]) + (a[2]*b[6]),
+                (a[0]*b[1]) + (a[1]*b[4]) + (a[2]*b[7]),
+                (a[0]*b[2]) + (a[1]*b[5]) + (a[2]*b[8]),
+                (a[3]*b[0]) + (a[4]*b[3]) + (a[5]*b[6]),
+                (a[3]*b[1]) + (a[4]*b[4]) + (a[5]*b[7]),
+                (a[3]*b[2]) + (a[4]*b[5]) + (a[5]*b[8]),
+                (a[6]*b[0]) + (a[7]*b[3]) + (a[8]*b[6]),
+                (a[6]*b[1]) + (a[7]*b[4]) + (a[8]*b[7]),
+                (a[6]*b[2]) + (a[7]*b[5]) + (a[8]*b[8])
+            )
+        else:
+            return Mat3( *[i*y for i in a] )
+
+    def __rmul__(self, k):
+        return Mat3( *[i*k for i in self.m] )
+
+    #( --- navigation (see kNavTransformations) --- )#
+    def C2euler(self):
+        """
+        Transformation matrix to euler [rad] [phi, theta, psi].
+        (Titterton (3.66), with the transposed matrix)
+        """
+        m = self.m
+        return Vec3(
+            atan2(m[5], m[8]),
+            asin(-m[2]),
+            atan2(m[1], m[0])
+        )
+
+    def C2Q(self):
+        """
+        Transformation matrix to Q4, directly (Shepperd's method).
+        """
+        return Quat( *_C2Q_shepperd(self.m) )
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class Quat (kNavValue):
+    """
+    Quaternion with the real part as the first element:
+
+            q = q0 + i.q1 + j.q2 + k.q3
+
+    The operations follow kQuatNav (Titterton & Weston).
+    """
+    __slots__ = ("q0", "q1", "q2", "q3")
+
+    def __init__(self, q0, q1, q2, q3):
+        self.q0 = float(q0)
+        self.q1 = float(q1)
+        self.q2 = float(q2)
+        self.q3 = float(q3)
+
+    def to_list(self):
+        return [self.q0, self.q1, self.q2, self.q3]
+
+    def __mul__(self, k):
+        return Quat(self.q0*k, self.q1*k, self.q2*k, self.q3*k)
+
+    __rmul__ = __mul__
+
+    #( --- quaternions (see kQuatNav) --- )#
+    def q_conj(self):
+        return Quat(self.q0, -self.q1, -self.q2, -self.q3)
+
+    def q_inv(self):
+        n2 = (self.q0*self.q0) + (self.q1*self.q1) + (self.q2*self.q2) + (self.q3*self.q3)
+        return Quat(self.q0/n2, -self.q1/n2, -self.q2/n2, -self.q3/n2)
+
+    def q_norm(self):
+        n = sqrt( (self.q0*self.q0) + (self.q1*self.q1) + (self.q2*self.q2) + (self.q3*self.q3) )
+        return Quat(self.q0/n, self.q1/n, self.q2/n, self.q3/n)
+
+    def q_x_q(self, q2):
+        """
+        self o q2 (Titterton (3.55)-(3.56)), ie. qa2c = qa2b.q_x_q(qb2c)
+        """
+        a0, a1, a2, a3 = self.q0, self.q1, self.q2, self.q3
+        b0, b1, b2, b3 = q2.q0, q2.q1, q2.q2, q2.q3
+
+        return Quat(
+            (a0*b0) - (a1*b1) - (a2*b2) - (a3*b3),
+            (a1*b0) + (a0*b1) - (a3*b2) + (a2*b3),
+            (a2*b0) + (a0*b2) + (a3*b1) - (a1*b3),
+            (a3*b0) + (a0*b3) - (a2*b1) + (a1*b2)
+        )
+
+    def q_x_3d(self, vector):
+        """
+        Resolves the Vec3 'vector' in another frame, as in kQuatNav.q_x_3d():
+        rb = q_a2b*  o  ra  o  q_a2b
+        """
+        q = self.q_inv()
+        r = q.q_x_q( Quat(0, vector.x, vector.y, vector.z) ).q_x_q( q.q_conj() )
+        return Vec3(r.q1, r.q2, r.q3)
+
+    def dqdt(self, w):
+        """
+        $\\dot{q} = 1/2 .B(w).q$, with the same normalization term as kQuatNav.dqdt().
+        """
+        K          = 1e1
+        wx, wy, wz = w
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+        ke         = K * (1.0 - ((q0*q0) + (q1*q1) + (q2*q2) + (q3*q3)))
+
+        return Quat(
+            (0.5*((-wx*q1) - (wy*q2) - (wz*q3))) + (ke*q0),
+            (0.5*(( wx*q0) + (wz*q2) - (wy*q3))) + (ke*q1),
+            (0.5*(( wy*q0) - (wz*q1) + (wx*q3))) + (ke*q2),
+            (0.5*(( wz*q0) + (wy*q1) - (wx*q2))) + (ke*q3)
+        )
+
+    def q_propagate(self, w, dt):
+        """
+        q(t+dt) = q(t) o q(w.dt), as kQuatNav.q_propagate().
+        """
+        wx, wy, wz = w
+        return self.q_x_q( Quat(*_rotvec2q(wx*dt, wy*dt, wz*dt)) )
+
+    #( --- navigation (see kNavTransformations) --- )#
+    def Q2C(self):
+        """
+        Q4 to the transformation matrix. (Titterton (3.59))
+        """
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+
+        return Mat3(
+            (q0*q0) + (q1*q1) - (q2*q2) - (q3*q3),
+            2.0 * ((q1*q2) + (q0*q3)),
+            2.0 * ((q1*q3) - (q0*q2)),
+            2.0 * ((q1*q2) - (q0*q3)),
+            (q0*q0) - (q1*q1) + (q2*q2) - (q3*q3),
+            2.0 * ((q2*q3) + (q0*q1)),
+            2.0 * ((q1*q3) + (q0*q2)),
+            2.0 * ((q2*q3) - (q0*q1)),
+            (q0*q0) - (q1*q1) - (q2*q2) + (q3*q3)
+        )
+
+    def Q2euler(self):
+        """
+        Q4 to euler [rad] [phi, theta, psi]. (Titterton (3.66))
+        """
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+
+        c11 = (q0*q0) + (q1*q1) - (q2*q2) - (q3*q3)
+        c21 = 2.0 * ((q1*q2) + (q0*q3))
+        c31 = 2.0 * ((q1*q3) - (q0*q2))
+        c32 = 2.0 * ((q2*q3) + (q0*q1))
+        c33 = (q0*q0) - (q1*q1) - (q2*q2) + (q3*q3)
+
+        return Vec3( atan2(c32, c33), asin(-c31), atan2(c21, c11) )
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
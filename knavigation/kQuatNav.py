@@ -11,15 +11,64 @@ Lizenz:
 GitHub:
 """
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
-import sys
-print( "**************************************" )
-print(f"** __name__    = {__name__}")
-print(f"** __package__ = {__package__}")
-print(f"** sys.path[0] = {sys.path[0]}")
-#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 import numpy as np
-from .kArray    import kArray
+from math       import sqrt, sin, cos
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+def _C2Q_shepperd(c):
+    """
+    Quaternion from the transformation matrix 'c' (9 floats, row by row),
+    with the convention of Q2C(). Shepperd's method: the largest of
+    (trace, c00, c11, c22) selects the component calculated with the square
+    root, so the division is always by a value >= 0.5, also near theta = +-90deg.
+    The sign is chosen to have the real part >= 0.
+
+    : return : [q0, q1, q2, q3]
+    """
+    c00, c01, c02, c10, c11, c12, c20, c21, c22 = c
+    tr = c00 + c11 + c22
+
+    if (tr >= c00) and (tr >= c11) and (tr >= c22):
+        q0 = 0.5 * sqrt(1.0 + tr)
+        k  = 0.25 / q0
+        q  = [q0, (c12-c21)*k, (c20-c02)*k, (c01-c10)*k]
+    elif (c00 >= c11) and (c00 >= c22):
+        q1 = 0.5 * sqrt(1.0 + c00 - c11 - c22)
+        k  = 0.25 / q1
+        q  = [(c12-c21)*k, q1, (c01+c10)*k, (c02+c20)*k]
+    elif c11 >= c22:
+        q2 = 0.5 * sqrt(1.0 - c00 + c11 - c22)
+        k  = 0.25 / q2
+        q  = [(c20-c02)*k, (c01+c10)*k, q2, (c12+c21)*k]
+    else:
+        q3 = 0.5 * sqrt(1.0 - c00 - c11 + c22)
+        k  = 0.25 / q3
+        q  = [(c01-c10)*k, (c02+c20)*k, (c12+c21)*k, q3]
+
+    if q[0] < 0:
+        q = [-i for i in q]
+
+    return q
+
+def _rotvec2q(x, y, z):
+    """
+    Quaternion of the rotation vector [x,y,z] [rad] (Titterton (11.10)), ie. the
+    quaternion from a frame to the same frame rotated by [x,y,z]. For small
+    angles, cos(n/2) and sin(n/2)/n are replaced by their series.
+
+    : return : q0, q1, q2, q3
+    """
+    n2 = (x*x) + (y*y) + (z*z)
+    if n2 < 1e-6:
+        c = 1.0 - (n2 / 8.0)  + (n2 * n2 / 384.0)
+        s = 0.5 - (n2 / 48.0) + (n2 * n2 / 3840.0)
+    else:
+        n = sqrt(n2)
+        c = cos(0.5 * n)
+        s = sin(0.5 * n) / n
+
+    return c, s*x, s*y, s*z
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 class kQuatNav:
@@ -29,16 +78,17 @@ class kQuatNav:
 
             q = R + i.U + j.V + k.W
     """
+    __slots__ = ()
 
     def q_inv(self):
         """
         Calculates the inverse of a quaternion. This is similar to inverting a
         transformation matrix.
         """
-        shape = self.shape
-        tmp   = self.squeeze().tolist()
-        ret   = [tmp[0]] + [-i for i in tmp[1:]]
-        return self.__class__( np.asarray(ret).reshape(shape) / sum( [i**2 for i in ret] ))
+        q     = np.asarray(self).ravel()
+        ret   = q / (-q.dot(q))
+        ret[0] = -ret[0]
+        return self._wrap( ret.reshape(self.shape) )
 
     def q_conj(self):
         """
@@ -46,14 +96,16 @@ class kQuatNav:
 
         **Remark**: the first element is the real part of the quaternion here: (a + b.i + c.j + d.k)
         """
-        #return self.__class__( np.hstack(([self[0]] + [-i for i in self[1:]])), hvector=False )
-        return self.__class__( [-i if idx >= 1 else i for idx,i in enumerate(self) ], hvector=False )
+        q      = np.array(self, dtype=float).reshape(-1)
+        q[1:] *= -1.0
+        return self._wrap( q, self.TYPE_VERTICAL )
 
     def q_norm(self):
         """
         Normalizes the given quaternion.
         """
-        return self.__class__( self / np.sqrt(sum( [i**2 for i in self] )))
+        q = np.asarray(self).ravel()
+        return self / sqrt( q.dot(q) )
 
     def q_x_q(self, q2):
         """
@@ -72,12 +124,10 @@ class kQuatNav:
         output: np.array quaternion q3=q1.q2
         """
 
-        q1 = self.squeeze()
+        q1 = self.to_list()
         assert len(q1) == 4
 
-        if hasattr(q2, "squeeze"):
-            q2 = q2.squeeze()
-
+        q2 = np.asarray(q2).ravel().tolist()
         assert len(q2) == 4
 
         q3 = np.array([
@@ -87,7 +137,7 @@ class kQuatNav:
             (q1[3]*q2[0]) + (q1[0]*q2[3]) - (q1[2]*q2[1]) + (q1[1]*q2[2]),
         ])
 
-        return self.__class__( q3, hvector=False )
+        return self._wrap( q3, self.TYPE_VERTICAL )
 
     def _q_x_q(self, q2):
         """
@@ -110,7 +160,7 @@ class kQuatNav:
         s3 = (s1*s2) - (v1.dot(v2))
         v3 = (s1*v2) + (s2*v1) + np.cross(v1,v2)
 
-        return self.__class__( np.hstack( (s3,v3) ), hvector=False )
+        return self._wrap( np.hstack( (s3,v3) ), self.TYPE_VERTICAL )
 
     def q_x_3d(self, vector):
         """
@@ -141,21 +191,21 @@ class kQuatNav:
         # To be complete, we shall include the next line to invert the
         # quaternion and have the correct input for the transformation without
         # the C matrix.
-        q = self.q_inv().squeeze() # <== first, use the inverse; see comments in the docstring
-        v = vector.squeeze()
+        q = self.q_inv() # <== first, use the inverse; see comments in the docstring
+        v = np.asarray(vector).ravel().tolist()
 
         # checks:
-        assert len(q) == 4
+        assert q.size == 4
         assert len(v) == 3
 
         # augmenting v to be an imaginary quaternion:
-        v = np.hstack((0, v))
+        v = [0.0] + v
 
         # conjugate q:
         q_j = q.q_conj()
 
         # transformed vector (without the real part):
-        ret = self.__class__(q).q_x_q(v).q_x_q(q_j)[1:] # <= to remove the real part
+        ret = q.q_x_q(v).q_x_q(q_j)[1:] # <= to remove the real part
 
         return ret
 
@@ -173,23 +223,294 @@ class kQuatNav:
 
         """
 
-        assert len(self.squeeze()) == 4
+        q = np.asarray(self, dtype=float).ravel()
+        assert len(q) == 4
 
-        K      = 1e1
-        cq     = kArray( [i for i in self], hvector=False )
-        cq2    = kArray( [i*i for i in self], hvector=False )
-        W      = kArray( w, hvector=True )
-        epslon = 1.0 - sum(cq2.to_list())
+        K          = 1e1
+        wx, wy, wz = np.asarray(w, dtype=float).ravel().tolist()
+        epslon     = 1.0 - q.dot(q)
 
-        B = kArray( [
-            [   0, -W[0][0], -W[0][1], -W[0][2]],
-            [W[0][0],     0,  W[0][2], -W[0][1]],
-            [W[0][1], -W[0][2],     0,  W[0][0]],
-            [W[0][2],  W[0][1], -W[0][0],     0]
+        B = np.array( [
+            [ 0, -wx, -wy, -wz],
+            [wx,   0,  wz, -wy],
+            [wy, -wz,   0,  wx],
+            [wz,  wy, -wx,   0]
         ] )
 
-        dq = (0.5 * B * cq) + (K*epslon*cq)
-        return self.__class__( dq )
+        dq = (0.5 * B.dot(q)) + (K*epslon*q)
+        return self._wrap( dq, self.TYPE_VERTICAL )
+
+    def q_propagate(self, w, dt):
+        """
+        Propagates the quaternion over 'dt' with a constant angular velocity 'w'.
+        This is the exact solution of $\\dot{q} = 1/2 .B(w).q$ (see dqdt()), ie.
+        the product with the exponential of the rotation vector w.dt:
+
+            q(t+dt) = q(t) o q(w.dt)
+
+        The norm of the quaternion is kept (there is no feedback as in dqdt()).
+
+        Inputs:
+            Q4 (a + b.i + c.j + d.k)  :  quaternions
+            w_ib_b                    :  [rad/s] angular velocity
+            dt                        :  [s] step
+
+        Returns:
+            Q4 at t+dt
+        """
+
+        wx, wy, wz = np.asarray(w, dtype=float).ravel().tolist()
+        return self.q_x_q( _rotvec2q(wx*dt, wy*dt, wz*dt) )
+
+    #( --- batch operations: stacks of quaternions [N x 4], with the equations above --- )#
+    @staticmethod
+    def batch_q_x_q(Q1, Q2):
+        """
+        Product Q1[i] o Q2[i] of each pair in two stacks, with the convention of
+        q_x_q(). One of them can be a single quaternion [4], which is broadcasted.
+        : input  : Q1, Q2 = ndarray [N x 4]
+        : return : ndarray [N x 4]
+        """
+        Q1 = np.asarray(Q1, dtype=float)
+        Q2 = np.asarray(Q2, dtype=float)
+        assert Q1.shape[-1] == 4 and Q2.shape[-1] == 4
+
+        a0, a1, a2, a3 = Q1[...,0], Q1[...,1], Q1[...,2], Q1[...,3]
+        b0, b1, b2, b3 = Q2[...,0], Q2[...,1], Q2[...,2], Q2[...,3]
+
+        Q3 = np.empty(np.broadcast_shapes(Q1.shape, Q2.shape))
+        Q3[...,0] = (a0*b0) - (a1*b1) - (a2*b2) - (a3*b3)
+        Q3[...,1] = (a1*b0) + (a0*b1) - (a3*b2) + (a2*b3)
+        Q3[...,2] = (a2*b0) + (a0*b2) + (a3*b1) - (a1*b3)
+        Q3[...,3] = (a3*b0) + (a0*b3) - (a2*b1) + (a1*b2)
+        return Q3
+
+    @staticmethod
+    def batch_q_conj(Q):
+        """
+        : input  : Q = ndarray [N x 4]
+        : return : ndarray [N x 4] conjugated quaternions
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.shape[-1] == 4
+        return Q * (1.0, -1.0, -1.0, -1.0)
+
+    @staticmethod
+    def batch_q_inv(Q):
+        """
+        : input  : Q = ndarray [N x 4]
+        : return : ndarray [N x 4] inverse quaternions, conj(q)/|q|^2
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.shape[-1] == 4
+        n2 = np.einsum('...i,...i->...', Q, Q)
+        return (Q * (1.0, -1.0, -1.0, -1.0)) / n2[...,None]
+
+    @staticmethod
+    def batch_q_norm(Q):
+        """
+        : input  : Q = ndarray [N x 4]
+        : return : ndarray [N x 4] normalized quaternions
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.shape[-1] == 4
+        return Q / np.sqrt( np.einsum('...i,...i->...', Q, Q) )[...,None]
+
+    @staticmethod
+    def batch_q_x_3d(Q, V):
+        """
+        Resolves each vector V[i] in another frame with Q[i], with the convention
+        of q_x_3d() (Q from a^ to b^, V from a^ to b^). One of them can be single
+        ([4] or [3]), which is broadcasted.
+
+        Instead of the two quaternion products, it uses the rotation formula
+        for unit quaternions q = [s u^T]^T:
+
+            t  = 2 . (v x u)
+            rb = v + s.t - (u x t)
+
+        so Q shall be normalized (see batch_q_norm()).
+
+        : input  : Q = ndarray [N x 4], V = ndarray [N x 3]
+        : return : ndarray [N x 3]
+        """
+        Q = np.asarray(Q, dtype=float)
+        V = np.asarray(V, dtype=float)
+        assert Q.shape[-1] == 4 and V.shape[-1] == 3
+
+        s = Q[...,0:1]
+        u = Q[...,1:]
+        t = 2.0 * np.cross(V, u)
+        return V + (s*t) - np.cross(u, t)
+
+    @staticmethod
+    def batch_q_propagate(Q, W, dt):
+        """
+        q_propagate() of each pair Q[i], W[i]: Q[i] o q(W[i].dt). One of them can be
+        single ([4] or [3]), which is broadcasted; dt can be a scalar or [N].
+        : input  : Q = ndarray [N x 4], W = ndarray [N x 3] [rad/s], dt [s]
+        : return : ndarray [N x 4]
+        """
+        W = np.asarray(W, dtype=float)
+        assert W.shape[-1] == 3
+
+        R     = W * np.asarray(dt, dtype=float)[...,None]
+        n2    = np.einsum('...i,...i->...', R, R)
+        small = n2 < 1e-6
+        n     = np.sqrt(n2)
+
+        c = np.where(small, 1.0 - (n2 / 8.0)  + (n2 * n2 / 384.0),  np.cos(0.5 * n))
+        s = np.where(small, 0.5 - (n2 / 48.0) + (n2 * n2 / 3840.0), np.sin(0.5 * n) / np.where(small, 1.0, n))
+
+        return kQuatNav.batch_q_x_q( Q, np.concatenate((c[...,None], s[...,None]*R), axis=-1) )
+
+    #( --- interpolation of attitudes: stacks of unit quaternions [N x 4] --- )#
+    @staticmethod
+    def batch_q_slerp(Q1, Q2, tau):
+        """
+        Spherical linear interpolation from Q1[i] (tau = 0) to Q2[i] (tau = 1),
+        with constant angular rate, along the shortest path (Q2[i] or -Q2[i]).
+        For very close quaternions, it falls back to batch_q_nlerp().
+        : input  : Q1, Q2 = ndarray [N x 4] unit quaternions, tau = [N] or scalar
+        : return : ndarray [N x 4]
+        """
+        Q1  = np.asarray(Q1, dtype=float)
+        Q2  = np.asarray(Q2, dtype=float)
+        tau = np.asarray(tau, dtype=float)[...,None]
+        assert Q1.shape[-1] == 4 and Q2.shape[-1] == 4
+
+        d   = np.einsum('...i,...i->...', Q1, Q2)[...,None]
+        Q2  = np.where(d < 0, -Q2, Q2)
+        d   = np.minimum(np.abs(d), 1.0)
+
+        theta = np.arccos(d)
+        sin_t = np.sin(theta)
+        close = sin_t < 1e-6
+        sin_t = np.where(close, 1.0, sin_t)
+
+        k1 = np.where(close, 1.0 - tau, np.sin((1.0 - tau) * theta) / sin_t)
+        k2 = np.where(close, tau,       np.sin(tau * theta) / sin_t)
+        Q  = (k1 * Q1) + (k2 * Q2)
+
+        # (normalized for the fallback, and against the rounding):
+        return Q / np.sqrt( np.einsum('...i,...i->...', Q, Q) )[...,None]
+
+    @staticmethod
+    def batch_q_nlerp(Q1, Q2, tau):
+        """
+        Normalized linear interpolation from Q1[i] (tau = 0) to Q2[i] (tau = 1),
+        along the shortest path. Cheaper than batch_q_slerp(), but the angular rate
+        is not constant (the error is small for close quaternions).
+        : input  : Q1, Q2 = ndarray [N x 4] unit quaternions, tau = [N] or scalar
+        : return : ndarray [N x 4]
+        """
+        Q1  = np.asarray(Q1, dtype=float)
+        Q2  = np.asarray(Q2, dtype=float)
+        tau = np.asarray(tau, dtype=float)[...,None]
+        assert Q1.shape[-1] == 4 and Q2.shape[-1] == 4
+
+        d   = np.einsum('...i,...i->...', Q1, Q2)[...,None]
+        Q   = ((1.0 - tau) * Q1) + (np.where(d < 0, -tau, tau) * Q2)
+        return Q / np.sqrt( np.einsum('...i,...i->...', Q, Q) )[...,None]
+
+    @staticmethod
+    def _batch_q_log(Q):
+        """
+        Logarithm of unit quaternions [s u^T]^T: the vector part u.a/sin(a), with
+        a = atan2(|u|, s) (half of the angle of rotation).
+        : return : ndarray [N x 3]
+        """
+        u = Q[...,1:]
+        n = np.sqrt( np.einsum('...i,...i->...', u, u) )
+        a = np.arctan2(n, Q[...,0])
+        small = n < 1e-6
+        k = np.where(small, 1.0 + (a*a/6.0), a / np.where(small, 1.0, n))
+        return k[...,None] * u
+
+    @staticmethod
+    def _batch_q_exp(V):
+        """
+        Exponential of the vectors V [N x 3] (pure quaternions), the inverse of
+        _batch_q_log().
+        : return : ndarray [N x 4]
+        """
+        n = np.sqrt( np.einsum('...i,...i->...', V, V) )
+        small = n < 1e-6
+        k = np.where(small, 1.0 - (n*n/6.0), np.sin(n) / np.where(small, 1.0, n))
+        return np.concatenate((np.cos(n)[...,None], k[...,None]*V), axis=-1)
+
+    @staticmethod
+    def batch_q_squad_points(Q):
+        """
+        Control points of squad for a sequence of unit quaternions Q [N x 4], which
+        shall be continuous in sign (see batch_q_resample()):
+
+            s_i = q_i o exp( -(log(q_i^-1 o q_i+1) + log(q_i^-1 o q_i-1)) / 4 )
+
+        with s_0 = q_0 and s_N-1 = q_N-1.
+        : return : ndarray [N x 4]
+        """
+        Q = np.asarray(Q, dtype=float)
+        assert Q.ndim == 2 and Q.shape[1] == 4
+
+        S = Q.copy()
+        if len(Q) > 2:
+            Qi  = kQuatNav.batch_q_conj(Q[1:-1])
+            L   = kQuatNav._batch_q_log( kQuatNav.batch_q_x_q(Qi, Q[2:]) ) \
+                + kQuatNav._batch_q_log( kQuatNav.batch_q_x_q(Qi, Q[:-2]) )
+            S[1:-1] = kQuatNav.batch_q_x_q( Q[1:-1], kQuatNav._batch_q_exp(-0.25 * L) )
+        return S
+
+    @staticmethod
+    def batch_q_squad(Q1, Q2, S1, S2, tau):
+        """
+        Spherical quadrangle interpolation between Q1[i] and Q2[i], with the control
+        points S1[i] and S2[i] (see batch_q_squad_points()). The angular rate is
+        continuous at the samples.
+        : input  : Q1, Q2, S1, S2 = ndarray [N x 4], tau = [N] or scalar
+        : return : ndarray [N x 4]
+        """
+        tau = np.asarray(tau, dtype=float)
+        return kQuatNav.batch_q_slerp(
+            kQuatNav.batch_q_slerp(Q1, Q2, tau),
+            kQuatNav.batch_q_slerp(S1, S2, tau),
+            2.0 * tau * (1.0 - tau) )
+
+    @staticmethod
+    def batch_q_resample(t, Q, t_new, method="slerp"):
+        """
+        Resamples a log of attitudes Q [N x 4], at the instants 't' [N] (increasing),
+        to the instants 't_new' [M], in one pass. As np.interp(), the first and the
+        last attitudes are kept out of [t[0], t[-1]].
+
+        The signs of Q are made continuous first (q and -q are the same attitude).
+
+        : input  : method = "slerp", "nlerp" or "squad"
+        : return : ndarray [M x 4]
+        """
+        t     = np.asarray(t, dtype=float)
+        Q     = np.asarray(Q, dtype=float)
+        t_new = np.asarray(t_new, dtype=float)
+        assert Q.ndim == 2 and Q.shape[1] == 4 and len(Q) == len(t) and len(t) >= 2
+
+        if method not in ("slerp", "nlerp", "squad"):
+            raise(NameError("batch_q_resample: unknown method '{:s}'.".format(str(method))))
+
+        # continuous signs:
+        d = np.einsum('ij,ij->i', Q[:-1], Q[1:])
+        Q = Q * np.cumprod( np.concatenate(([1.0], np.where(d < 0, -1.0, 1.0))) )[:,None]
+
+        # brackets t[i] <= t_new < t[i+1]:
+        i   = np.clip( np.searchsorted(t, t_new, side='right') - 1, 0, len(t) - 2 )
+        tau = np.clip( (t_new - t[i]) / (t[i+1] - t[i]), 0.0, 1.0 )
+
+        if method == "slerp":
+            return kQuatNav.batch_q_slerp(Q[i], Q[i+1], tau)
+        elif method == "nlerp":
+            return kQuatNav.batch_q_nlerp(Q[i], Q[i+1], tau)
+        else:
+            S = kQuatNav.batch_q_squad_points(Q)
+            return kQuatNav.batch_q_squad(Q[i], Q[i+1], S[i], S[i+1], tau)
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
@@ -0,0 +1,61 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+import subprocess
+import sys
+import os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_python(code, **env):
+    """
+    Runs 'code' in a fresh interpreter (cold import), with the additional
+    environment variables 'env', and returns its stdout/stderr.
+    """
+    environ = { k: v for k, v in os.environ.items() if k != "KNAV_IMPORT_TRACE" }
+    environ.update(env)
+    ret = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, env=environ)
+    assert ret.returncode == 0, ret.stderr
+    return ret.stdout, ret.stderr
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_Import:
+
+    def test_silent_import(self):
+        out, err = run_python("from knavigation import kArrayNav; import kltisystems")
+        assert out == ""
+        assert err == ""
+
+    def test_import_trace(self):
+        _, err = run_python("from knavigation import kArrayNav; import kltisystems", KNAV_IMPORT_TRACE="1")
+        assert "import: __name__ = knavigation," in err
+        assert "import: __name__ = kltisystems," in err
+
+    def test_heavy_modules_not_imported(self):
+        out, _ = run_python(
+            "import sys\n"
+            "import knavigation\n"
+            "print([i for i in ('scipy', 'mpmath') if i in sys.modules])")
+        assert out.strip() == "[]"
+
+    def test_class_not_hidden_by_module(self):
+        out, _ = run_python(
+            "import knavigation.kArray\n"
+            "from knavigation import kArray, kArrayNav\n"
+            "print(isinstance(kArray, type), isinstance(kArrayNav, type))")
+        assert out.strip() == "True True"
+
+    def test_class_after_submodule_import(self):
+        # a submodule imported directly does not hide the classes of the package:
+        out, _ = run_python(
+            "from knavigation.kArrayNav import kArrayNav\n"
+            "from knavigation.kNavBenchmarks import kNavBenchmarks\n"
+            "from knavigation import kArray, kNavStrapdown\n"
+            "print(kArray([1,2,3]).shape, isinstance(kNavStrapdown, type))")
+        assert out.strip() == "(1, 3) True"
+
+    def test_unknown_attribute(self):
+        import knavigation
+        with pytest.raises(AttributeError):
+            knavigation.not_there
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
@@ -100,6 +100,13 @@ class TestClass_kArray:
         for i,j in zip(a,[1,2,3]):
             assert i == j
 
+    def test_iter_matrix(self):
+        a = kArray( [[1,2],[3,4]] )
+        assert list(a) == [1.,2.,3.,4.]
+        assert all( [type(i) == float for i in a] )
+        assert list(a.T) == [1.,3.,2.,4.]
+        assert a.T.to_list() == [1.,3.,2.,4.]
+
     def test_vector_eq(self):
         print("==== eq ====")
         a = kArray([1,2,3])
@@ -112,6 +119,39 @@ class TestClass_kArray:
         print("a == a: {:s}".format((a==a).__str__()))
         print("a == b: {:s}".format((a==b).__str__()))
 
+    def test_eq_relative_tolerance(self):
+        a = kArray( [1e6, 1e-6, 0] )
+        assert a == kArray( [1e6*(1+1e-11), 1e-6*(1-1e-11), 0] )
+        assert a != kArray( [1e6*(1+1e-9), 1e-6, 0] )
+        assert a != kArray( [1e6, 1e-6, 1e-300] )
+        assert kArray( [np.nan] ) != kArray( [np.nan] )
+
+    def test_eq_matrix_transposed(self):
+        a = kArray( [[1,2],[3,4]] )
+        assert a != a.T
+        assert a == a.T.T
+
+    def test_batch_eq(self):
+        A = np.random.randn(10,3)
+        B = A.copy()
+        B[3,1] *= (1 + 1e-6)
+        ret = kArray.batch_eq(A, B)
+        assert ret.shape == (10,)
+        assert not ret[3]
+        assert ret.sum() == 9
+
+        for a,b,r in zip(A, B, ret):
+            assert (kArray(a) == kArray(b)) == r
+
+        # stacks of matrices:
+        assert all( kArray.batch_eq(np.ones((4,3,3)), np.ones((4,3,3))) )
+
+    def test_no_instance_dict(self):
+        a = kArray( [[1,2,3],[4,5,6]] )
+        for i in [ a, a[1:], a.T, a.view(), a*2.0 ]:
+            assert type(i) == kArray
+            assert not hasattr(i, "__dict__")
+
     def test_vector_sum(self):
         print("==== sum ====")
         a = kArray((1,2,3))
@@ -258,6 +298,44 @@ class TestClass_kArray:
         if not ok:
             raise(NameError("it should not reach here"))
 
+    def test_matrix_multiplication_class(self):
+        from knavigation import kArrayNav
+
+        M = kArray( np.eye(3) )
+        v = kArrayNav( [1,2,3], hvector=False )
+        assert type(M*v) == kArray
+        assert type(v.T*M) == kArrayNav
+        assert type(v.T*v) == float
+        assert M*np.int64(2) == 2*M
+        assert M*np.float32(2) == 2*M
+
+    def test_batch_matmul(self):
+        A = np.random.randn(10,3,3)
+        B = np.random.randn(10,3,3)
+        v = np.random.randn(10,3)
+
+        AB = kArray.batch_matmul(A, B)
+        Av = kArray.batch_matvec(A, v)
+        assert AB.shape == (10,3,3)
+        assert Av.shape == (10,3)
+
+        for i in range(10):
+            assert kArray(A[i]) * kArray(B[i]) == AB[i]
+            assert kArray(A[i]) * kArray(v[i], hvector=False) == kArray(Av[i], hvector=False)
+
+        # broadcast of a single matrix or vector:
+        assert np.allclose( kArray.batch_matmul(A[0], B), A[0] @ B )
+        assert np.allclose( kArray.batch_matvec(A, v[0]), A @ v[0] )
+
+    def test_batch_matvec(self):
+        # a single matrix [3x3] and a stack of 3 vectors [3x3] (also N != m):
+        A = np.random.randn(3,3)
+        for v in [np.random.randn(3,3), np.random.randn(7,3)]:
+            Av = kArray.batch_matvec(A, v)
+            assert Av.shape == v.shape
+            for i in range(len(v)):
+                assert np.allclose( Av[i], A @ v[i] )
+
     def test_matrix_indexing(self):
         print("==== indexing ====")
         a = kArray( [[1,2,3], [4,5,6]] ) # 2x3
@@ -281,5 +359,44 @@ class TestClass_kArray:
         b = kArray(a).reshape(5,5).copy()
         assert a == b
 
+    #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+    @pytest.mark.parametrize(
+            "content, vtype, shape", [
+                ( [1,2,3],       kArray.TYPE_VERTICAL,    (3,1) ),
+                ( [[1],[2],[3]], kArray.TYPE_HORIZONTAL,  (1,3) ),
+                ( [5],           kArray.TYPE_SINGLEVALUE, (1,1) ),
+                ( [[1,2],[3,4]], kArray.TYPE_ARRAY,       (2,2) ),
+    ])
+    def test_wrap_shapes(self, content, vtype, shape):
+        a = kArray._wrap( content, vtype )
+        assert isinstance(a, kArray)
+        assert a.shape == shape
+        assert a.dtype == np.float64
+        assert a == kArray( np.asarray(content).reshape(shape) )
+
+    def test_wrap_does_not_classify(self):
+        with patch.object(kArray, "_type") as mock_type:
+            kArray._wrap( np.eye(3) )
+            assert mock_type.call_count == 0
+
+    def test_wrap_float_without_copy(self):
+        val = np.eye(3)
+        a   = kArray._wrap( val )
+        assert np.shares_memory(a, val)
+
+        # the regular constructor still copies:
+        b   = kArray( val )
+        assert not np.shares_memory(b, val)
+
+    def test_wrap_int_with_cast(self):
+        val = np.eye(3, dtype=int)
+        a   = kArray._wrap( val )
+        assert a.dtype == np.float64
+        assert not np.shares_memory(a, val)
+
+    def test_wrap_array_shall_be_2D(self):
+        with pytest.raises(AssertionError):
+            kArray._wrap( [1,2,3] )
+
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
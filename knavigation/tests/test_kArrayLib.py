@@ -75,6 +75,34 @@ class TestClass_kArrayLib:
         with pytest.raises(Exception):
             assert kArray( [[1,2],[3,4]] ).norm()
 
+    def test_batch_norm(self):
+        V   = np.random.randn(20,3)
+        ret = kArray.batch_norm(V)
+        assert ret.shape == (20,)
+        for v,n in zip(V, ret):
+            assert abs(kArray(v).norm() - n) < 1e-12
+
+    def test_batch_to_skew(self):
+        V   = np.random.randn(20,3)
+        ret = kArray.batch_to_skew(V)
+        assert ret.shape == (20,3,3)
+        for v,S in zip(V, ret):
+            assert kArray(v, hvector=False).to_skew() == S
+
+    def test_batch_X(self):
+        A   = np.random.randn(20,3)
+        B   = np.random.randn(20,3)
+        ret = kArray.batch_X(A, B)
+        assert ret.shape == (20,3)
+        for a,b,c in zip(A, B, ret):
+            assert kArray(a, hvector=False).X(kArray(b, hvector=False)) == kArray(c, hvector=False)
+
+        # skew(a).b == a X b:
+        assert np.allclose( np.einsum('nij,nj->ni', kArray.batch_to_skew(A), B), ret )
+
+        # a single vector is broadcasted:
+        assert np.allclose( kArray.batch_X(A, B[0]), kArray.batch_X(A, np.tile(B[0], (20,1))) )
+
     def test_matrix_inv(self):
         print("==== inv() ====")
         M = [[1,2,3], [40,5,6], [7,8,9]]
@@ -106,6 +134,39 @@ class TestClass_kArrayLib:
         assert C.inv() == C.T
 
 
+    def get_noisy_dcms(self, N, noise):
+        # stack of DCMs [N x 3 x 3] with a small error, as after an integration:
+        M = np.empty((N,3,3))
+        for i in range(N):
+            Q, _ = np.linalg.qr(np.random.randn(3,3))
+            M[i] = Q + (noise * np.random.randn(3,3))
+        return M
+
+    @pytest.mark.parametrize("method", [ 'qr', 'svd' ])
+    def test_batch_orthogonalization(self, method):
+        M = self.get_noisy_dcms(10, 0.1)
+        C = kArray.batch_to_orth(M, method)
+        assert C.shape == (10,3,3)
+
+        for m,c in zip(M, C):
+            assert kArray(m).to_orth(method) == c
+            assert kArray(c).inv() == kArray(c).T
+
+    def test_batch_orthogonalization_bjorck(self):
+        M   = self.get_noisy_dcms(10, 1e-3)
+        C   = kArray.batch_to_orth(M, "bjorck")
+        ref = kArray.batch_to_orth(M, "svd")
+
+        assert np.abs(C - ref).max() < 1e-12
+        assert np.abs( (C.transpose(0,2,1) @ C) - np.eye(3) ).max() < 1e-12
+
+        # single matrix:
+        assert np.abs( kArray(M[0]).to_orth("bjorck") - ref[0] ).max() < 1e-12
+
+    def test_batch_orthogonalization_wrong_method(self):
+        with pytest.raises(NameError):
+            kArray.batch_to_orth(np.ones((2,3,3)), "dkfljsdl")
+
     def test_orthogonalization_wrong_method(self):
         A = kArray([0])
         with pytest.raises(NameError):
@@ -29,6 +29,53 @@ class TestClass_kArrayNav:
         for i,j in zip(euler_deg, euler_deg_t):
             assert abs(i-j) < 1e-10
 
+    def get_random_euler_rad_stack(self, N):
+        # [N x 3] random euler angles [-pi/2, pi/2]
+        return (((np.random.rand(N,3)*2.0)-1)*90) * pi/180
+
+    def test_batch_euler_Q_C(self):
+        E = self.get_random_euler_rad_stack(50)
+
+        Q  = kArrayNav.batch_euler2Q(E)
+        C  = kArrayNav.batch_euler2C(E)
+        assert Q.shape == (50,4)
+        assert C.shape == (50,3,3)
+
+        EQ = kArrayNav.batch_Q2euler(Q)
+        CQ = kArrayNav.batch_Q2C(Q)
+        EC = kArrayNav.batch_C2euler(C)
+        QC = kArrayNav.batch_C2Q(C)
+
+        for i in range(len(E)):
+            e = kArrayNav( E[i] )
+            q = e.euler2Q()
+            c = e.euler2C()
+
+            # same results as the scalar versions:
+            assert q == kArrayNav( Q[i], hvector=False )
+            assert c == C[i]
+            assert q.Q2euler() == kArrayNav( EQ[i] )
+            assert q.Q2C() == CQ[i]
+            assert c.C2euler() == kArrayNav( EC[i] )
+            assert c.C2Q() == kArrayNav( QC[i], hvector=False )
+
+        assert np.abs(EQ - E).max() < 1e-10
+        assert np.abs(EC - E).max() < 1e-10
+
+    def test_quat_shapes(self):
+        qh = kArrayNav( [1,2,3,4], hvector=True )
+        qv = kArrayNav( [1,2,3,4], hvector=False )
+
+        assert qh.q_conj().shape == (4,1)
+        assert qh.q_inv().shape == (1,4)
+        assert qv.q_inv().shape == (4,1)
+        assert qh.q_inv().q_x_q(qv) == kArrayNav( [1,0,0,0], hvector=False )
+        assert type(qv.dqdt([1,2,3])) == kArrayNav
+        assert qv.dqdt([1,2,3]).shape == (4,1)
+
+        # vector as list:
+        assert qv.q_norm().q_x_3d([1,2,3]) == qv.q_norm().q_x_3d(kArrayNav([1,2,3]))
+
     def test_quat_conjugate(self):
         q  = kArrayNav( [1,2,3,4], hvector=False )
         qj = q.q_conj()
@@ -94,6 +141,89 @@ class TestClass_kArrayNav:
             for j,k in zip(q, q_t):
                 assert abs(j-k) < 1e-10
 
+    def get_random_quaternions(self, N):
+        # [N x 4] unit quaternions, over all the attitudes (any sign of q0):
+        Q = np.random.randn(N,4)
+        return Q / np.linalg.norm(Q, axis=1)[:,None]
+
+    def test_C2Q_direct(self):
+        Q = self.get_random_quaternions(200)
+        Q[:10] = [[1,0,0,0],[0,1,0,0],[0,0,1,0],[0,0,0,1],[0,0,0,-1],
+                  [0.5,0.5,0.5,0.5],[-0.5,0.5,0.5,0.5],[0,0.6,0.8,0],[0.6,0,0,0.8],[0,0,0.6,-0.8]]
+
+        for q in Q:
+            q = kArrayNav( q, hvector=False )
+            C = q.Q2C()
+            q_t = C.C2Q()
+
+            # the same rotation (q and -q), with q0 >= 0:
+            assert q_t[0,0] >= 0
+            assert np.abs( np.abs(q_t.T * q) - 1 ) < 1e-12
+            assert q_t.Q2C() == C
+
+    def test_C2Q_pitch_90deg(self):
+        for theta in [ pi/2, -pi/2, (pi/2)-1e-9 ]:
+            euler = kArrayNav( [0.3, theta, -1.1] )
+            C     = euler.euler2C()
+            q_t   = C.C2Q()
+            assert abs(q_t.norm() - 1) < 1e-12
+            assert np.abs(q_t.Q2C() - C).max() < 1e-12
+
+    def test_batch_C2Q(self):
+        Q  = self.get_random_quaternions(200)
+        C  = kArrayNav.batch_Q2C(Q)
+        QC = kArrayNav.batch_C2Q(C)
+
+        for c,q in zip(C, QC):
+            assert kArrayNav(c).C2Q() == kArrayNav( q, hvector=False )
+
+        assert np.abs( np.abs((QC*Q).sum(axis=1)) - 1 ).max() < 1e-12
+
+    def test_batch_quaternion_algebra(self):
+        N  = 50
+        Q1 = np.random.randn(N,4)       # not normalized
+        Q2 = np.random.randn(N,4)
+        Qn = self.get_random_quaternions(N)
+        V  = np.random.randn(N,3)
+
+        Q12 = kArrayNav.batch_q_x_q(Q1, Q2)
+        Qc  = kArrayNav.batch_q_conj(Q1)
+        Qi  = kArrayNav.batch_q_inv(Q1)
+        Qm  = kArrayNav.batch_q_norm(Q1)
+        Vb  = kArrayNav.batch_q_x_3d(Qn, V)
+        assert Q12.shape == Qc.shape == Qi.shape == Qm.shape == (N,4)
+        assert Vb.shape == (N,3)
+
+        for i in range(N):
+            q1 = kArrayNav( Q1[i], hvector=False )
+            assert q1.q_x_q(Q2[i])  == kArrayNav( Q12[i], hvector=False )
+            assert q1.q_conj()      == kArrayNav( Qc[i],  hvector=False )
+            assert q1.q_inv()       == kArrayNav( Qi[i],  hvector=False )
+            assert q1.q_norm()      == kArrayNav( Qm[i],  hvector=False )
+
+            qn = kArrayNav( Qn[i], hvector=False )
+            assert np.abs( qn.q_x_3d(V[i]).to_numpy().ravel() - Vb[i] ).max() < 1e-12
+
+        # same as the transformation matrices:
+        C = kArrayNav.batch_Q2C(Qn)
+        assert np.abs( np.einsum('nij,nj->ni', C, V) - Vb ).max() < 1e-12
+
+        # inverse and conjugate:
+        assert np.abs( kArrayNav.batch_q_x_q(Q1, Qi) - [1,0,0,0] ).max() < 1e-12
+        assert np.abs( kArrayNav.batch_q_x_3d(kArrayNav.batch_q_conj(Qn), Vb) - V ).max() < 1e-12
+
+    def test_batch_quaternion_broadcast(self):
+        Q = self.get_random_quaternions(10)
+        q = Q[0]
+        v = np.array([1., -2., 3.])
+
+        assert kArrayNav.batch_q_x_q(q, Q).shape   == (10,4)
+        assert kArrayNav.batch_q_x_q(Q, q).shape   == (10,4)
+        assert kArrayNav.batch_q_x_q(q, q).shape   == (4,)
+        assert kArrayNav.batch_q_x_3d(Q, v).shape  == (10,3)
+        assert kArrayNav.batch_q_x_3d(q, np.tile(v, (10,1))).shape == (10,3)
+        assert np.abs( kArrayNav.batch_q_x_q(q, Q)[3] - kArrayNav.batch_q_x_q(q, Q[3]) ).max() < 1e-15
+
     def test_q_x_3d(self):
         vector = kArrayNav( [1,2,-3], hvector=False )
         for _ in range(30):
@@ -279,6 +409,132 @@ class TestClass_kArrayNav:
         else:
             assert euler_1s[idx] > euler[0][idx] > (euler_1s[idx] - 0.2)
 
+    @pytest.mark.parametrize("idx", [0, 1, 2])
+    def test_q_propagate_single_axis(self, idx):
+        # constant rate around one axis: the euler angle grows linearly
+        w      = [0., 0., 0.]
+        w[idx] = 0.3
+        q      = kArrayNav( [0,0,0] ).euler2Q()
+        for _ in range(100):
+            q = q.q_propagate(w, 0.01)
+
+        euler      = [0., 0., 0.]
+        euler[idx] = 0.3
+        assert type(q) == kArrayNav
+        assert q.shape == (4,1)
+        assert q == kArrayNav( euler ).euler2Q()
+
+    def test_q_propagate_vs_dqdt(self):
+        import scipy.integrate  as Int
+
+        for _ in range(10):
+            q0 = kArrayNav( self.get_random_euler_rad() ).euler2Q()
+            w  = np.random.randn(3)
+            y  = Int.odeint(lambda q, t: kArrayNav(q).dqdt(w).to_list(), q0.to_list(), [0, 0.1], rtol=1e-12, atol=1e-12)[-1]
+
+            q1 = q0.q_propagate(w, 0.1)
+            assert np.abs( q1.to_numpy().ravel() - y ).max() < 1e-9
+            assert abs( q1.norm() - 1 ) < 1e-14
+
+    def test_q_propagate_small_angle(self):
+        # around the switch to the series, both expressions shall agree:
+        q = kArrayNav( [1,0,0,0], hvector=False )
+        w = np.array([1., -2., 0.5])
+        n = np.linalg.norm(w)
+        for dt in (1e-12, 1e-6, 0.999e-3/n, 1.001e-3/n):
+            q1 = q.q_propagate(w, dt).to_numpy().ravel()
+            q2 = np.hstack(( math.cos(0.5*n*dt), math.sin(0.5*n*dt) * w/n ))
+            assert np.abs( q1 - q2 ).max() < 1e-16
+
+    def test_batch_q_propagate(self):
+        N  = 50
+        Q  = self.get_random_quaternions(N)
+        W  = np.random.randn(N,3)
+        W[:5] *= 1e-6   # series
+        dt = np.random.rand(N) * 0.1
+
+        Qp = kArrayNav.batch_q_propagate(Q, W, dt)
+        assert Qp.shape == (N,4)
+        for i in range(N):
+            assert kArrayNav( Q[i], hvector=False ).q_propagate(W[i], dt[i]) == kArrayNav( Qp[i], hvector=False )
+
+        # broadcast:
+        assert kArrayNav.batch_q_propagate(Q[0], W, 0.01).shape == (N,4)
+        assert kArrayNav.batch_q_propagate(Q, W[0], 0.01).shape == (N,4)
+        assert np.abs( np.linalg.norm(Qp, axis=1) - 1 ).max() < 1e-14
+
+    def get_angle_between(self, Q1, Q2):
+        # [rad] angle of rotation between the attitudes Q1[i] and Q2[i]:
+        d = np.abs( np.einsum('ij,ij->i', Q1, Q2) )
+        return 2*np.arccos( np.minimum(d, 1.0) )
+
+    def test_batch_q_slerp_nlerp(self):
+        Q1 = self.get_random_quaternions(50)
+        Q2 = self.get_random_quaternions(50)
+
+        for fn in (kArrayNav.batch_q_slerp, kArrayNav.batch_q_nlerp):
+            assert self.get_angle_between(fn(Q1, Q2, 0.0), Q1).max() < 1e-7
+            assert self.get_angle_between(fn(Q1, Q2, 1.0), Q2).max() < 1e-7
+            assert np.abs( np.linalg.norm(fn(Q1, Q2, 0.3), axis=1) - 1 ).max() < 1e-14
+
+            # shortest path, independent of the sign of Q2:
+            assert np.abs( fn(Q1, Q2, 0.3) - fn(Q1, -Q2, 0.3) ).max() < 1e-14
+
+        # slerp: constant rate
+        a  = self.get_angle_between(Q1, Q2)
+        a1 = self.get_angle_between(Q1, kArrayNav.batch_q_slerp(Q1, Q2, 0.3))
+        assert np.abs( a1 - (0.3*a) ).max() < 1e-7
+
+        # identical quaternions (fallback):
+        assert np.abs( kArrayNav.batch_q_slerp(Q1, Q1, 0.3) - Q1 ).max() < 1e-14
+
+    def test_batch_q_resample_constant_rate(self):
+        # slerp and squad are exact for a constant angular rate (uniform samples):
+        q0    = self.get_random_quaternions(1)[0]
+        w     = np.array([0.3, -0.5, 0.8])
+        t     = np.linspace(0, 10, 41)
+        t_new = np.sort( np.random.rand(200) * 10 )
+
+        Q     = kArrayNav.batch_q_propagate(q0, w, t)
+        Q_t   = kArrayNav.batch_q_propagate(q0, w, t_new)
+
+        for method in ("slerp", "squad"):
+            Q_new = kArrayNav.batch_q_resample(t, Q, t_new, method)
+            assert Q_new.shape == (200,4)
+            assert self.get_angle_between(Q_new, Q_t).max() < 1e-7
+
+        Q_new = kArrayNav.batch_q_resample(t, Q, t_new, "nlerp")
+        assert self.get_angle_between(Q_new, Q_t).max() < 1e-3
+
+        # same result with the signs of Q flipped:
+        Q[::2] *= -1
+        Q_new = kArrayNav.batch_q_resample(t, Q, t_new, "squad")
+        assert self.get_angle_between(Q_new, Q_t).max() < 1e-7
+
+    def test_batch_q_resample_squad(self):
+        # squad has a smaller error than slerp for a smooth trajectory:
+        fn    = lambda t: kArrayNav.batch_euler2Q( np.column_stack((0.5*np.sin(t), 0.3*np.cos(1.3*t), 0.2*t)) )
+        t     = np.linspace(0, 10, 41)
+        t_new = np.linspace(0, 10, 1000)
+
+        err_slerp = self.get_angle_between( kArrayNav.batch_q_resample(t, fn(t), t_new, "slerp"), fn(t_new) ).max()
+        err_squad = self.get_angle_between( kArrayNav.batch_q_resample(t, fn(t), t_new, "squad"), fn(t_new) ).max()
+        assert err_squad < (0.7 * err_slerp)
+
+        # at the samples, the attitudes are the same:
+        for method in ("slerp", "nlerp", "squad"):
+            assert self.get_angle_between( kArrayNav.batch_q_resample(t, fn(t), t, method), fn(t) ).max() < 1e-7
+
+    def test_batch_q_resample_limits(self):
+        Q = self.get_random_quaternions(5)
+        t = np.arange(5.)
+
+        Q_new = kArrayNav.batch_q_resample(t, Q, [-1., 0., 4., 7.])
+        assert self.get_angle_between(Q_new, Q[[0, 0, 4, 4]]).max() < 1e-7
+
+        with pytest.raises(NameError):
+            kArrayNav.batch_q_resample(t, Q, [1.5], method="cubic")
+
     def test_dynamics(self):
         #----------------------#
         # some dynamic tests:
@@ -702,4 +958,193 @@ class TestClass_kArrayNav:
 
         assert (w_ie_n + w_en_n) == w_in_n
 
+    def test_batch_earth_model(self):
+        N   = 30
+        lat = (np.random.rand(N)-0.5) * 0.99*pi
+        lon = (np.random.rand(N)-0.5) * 2*pi
+        h   = np.random.rand(N) * 1e4
+        vN, vE, vD = np.random.randn(3,N) * 100
+
+        R_lbd = kArrayNav.batch_Rlambda(lat)
+        R_phi = kArrayNav.batch_Rphi(lat)
+        g     = kArrayNav.batch_gravity(lat, h)
+        dLat  = kArrayNav.batch_dLat_dt(vN, lat, h)
+        dLon  = kArrayNav.batch_dLong_dt(vE, lat, h)
+        Re2n  = kArrayNav.batch_Re2n(lat, lon)
+        g_n   = kArrayNav.batch_gravity_n(lat, h)
+        dLLH  = kArrayNav.batch_dLLH_dt(vN, vE, vD, lat, h)
+        w_ie  = kArrayNav.batch_w_ie_n(lat)
+        w_en  = kArrayNav.batch_w_en_n(dLat, dLon, lat)
+        w_in  = kArrayNav.batch_w_in_n(vN, vE, lat, h)
+
+        for x in [R_lbd, R_phi, g, dLat, dLon]:
+            assert x.shape == (N,)
+        for x in [g_n, dLLH, w_ie, w_en, w_in]:
+            assert x.shape == (N,3)
+        assert Re2n.shape == (N,3,3)
+
+        for i in range(N):
+            assert R_lbd[i] == pytest.approx( kArrayNav.Rlambda(lat[i]), rel=1e-12 )
+            assert R_phi[i] == pytest.approx( kArrayNav.Rphi(lat[i]), rel=1e-12 )
+            assert g[i]     == pytest.approx( kArrayNav.gravity(lat[i], h[i]), rel=1e-12 )
+            assert dLat[i]  == pytest.approx( kArrayNav.dLat_dt(vN[i], lat[i], h[i]), rel=1e-12 )
+            assert dLon[i]  == pytest.approx( kArrayNav.dLong_dt(vE[i], lat[i], h[i]), rel=1e-12 )
+
+            assert kArrayNav.Re2n(lat[i], lon[i]) == Re2n[i]
+            assert kArrayNav.gravity_n(lat[i], h[i]) == kArrayNav(g_n[i], hvector=False)
+            assert kArrayNav.dLLH_dt(vN[i], vE[i], vD[i], lat[i], h[i]) == kArrayNav(dLLH[i], hvector=False)
+            assert kArrayNav.w_ie_n(lat[i]) == kArrayNav(w_ie[i], hvector=False)
+            assert kArrayNav.w_en_n(dLat[i], dLon[i], lat[i]) == kArrayNav(w_en[i], hvector=False)
+            assert kArrayNav.w_in_n(vN[i], vE[i], lat[i], h[i]) == kArrayNav(w_in[i], hvector=False)
+
+    def test_batch_earth_model_broadcast(self):
+        # a single height for all latitudes:
+        lat = np.linspace(-1, 1, 5)
+        assert kArrayNav.batch_gravity(lat, 100.0).shape == (5,)
+        assert kArrayNav.batch_dLLH_dt(1.0, 2.0, 3.0, lat, 100.0).shape == (5,3)
+        assert kArrayNav.batch_Re2n(lat, 0.5).shape == (5,3,3)
+
+    def test_batch_earth_model_scalar(self):
+        # scalar inputs give stacks with N = 1:
+        lat, h, vN, vE, vD = 0.5, 100.0, 10.0, 20.0, 1.0
+        assert kArrayNav.batch_w_ie_n(lat).shape == (1,3)
+        assert kArrayNav.batch_gravity_n(lat, h).shape == (1,3)
+        assert kArrayNav.batch_dLLH_dt(vN, vE, vD, lat, h).shape == (1,3)
+        assert kArrayNav.batch_w_en_n(1e-6, 2e-6, lat).shape == (1,3)
+        assert kArrayNav.batch_w_in_n(vN, vE, lat, h).shape == (1,3)
+        assert kArrayNav.batch_dWen_dt(lat, vN, vE, vD, h, 0.1, 0.2).shape == (1,3)
+        assert kArrayNav.batch_Jacobian_dwin_LLH(vN, vE, lat, h).shape == (1,3,3)
+        assert kArrayNav.batch_Re2n(lat, 0.3).shape == (1,3,3)
+
+        assert kArrayNav.w_ie_n(lat) == kArrayNav(kArrayNav.batch_w_ie_n(lat)[0], hvector=False)
+        assert kArrayNav.gravity_n(lat, h) == kArrayNav(kArrayNav.batch_gravity_n(lat, h)[0], hvector=False)
+
+    def get_random_llh_stack(self, N):
+        # [N x 3] (lat, lon, h) with heights in [-10 km, 1000 km]:
+        return np.stack( (
+            (np.random.rand(N)-0.5) * pi,
+            (np.random.rand(N)-0.5) * 2*pi,
+            (np.random.rand(N)*1.01e6) - 1e4 ), axis=1 )
+
+    def test_batch_ecef_llh2xyz(self):
+        LLH = self.get_random_llh_stack(50)
+        XYZ = kArrayNav.batch_ecef_llh2xyz(LLH)
+        assert XYZ.shape == (50,3)
+
+        for llh, xyz in zip(LLH, XYZ):
+            assert kArrayNav(llh).ecef_llh2xyz() == kArrayNav(xyz, hvector=False)
+
+    def test_batch_ecef_xyz2llh_accuracy(self):
+        LLH = self.get_random_llh_stack(10000)
+        LLH[:4] = [[pi/2, 0, 10], [-pi/2, 1, -100], [0, 0, 0], [0, pi/2, 5]]
+
+        LLH_t = kArrayNav.batch_ecef_xyz2llh( kArrayNav.batch_ecef_llh2xyz(LLH) )
+        assert LLH_t.shape == (10000,3)
+
+        # round trip (the longitude is undefined at the poles):
+        assert np.abs(LLH_t[:,0] - LLH[:,0]).max() < 1e-14
+        assert np.abs(LLH_t[2:,1] - LLH[2:,1]).max() < 1e-14
+        assert np.abs(LLH_t[:,2] - LLH[:,2]).max() < 1e-7
+
+    def test_batch_ecef_xyz2llh_vs_scalar(self):
+        LLH = self.get_random_llh_stack(50)
+        XYZ = kArrayNav.batch_ecef_llh2xyz(LLH)
+        LLH_t = kArrayNav.batch_ecef_xyz2llh(XYZ)
+
+        # the scalar version stops at 1 cm:
+        for xyz, llh in zip(XYZ, LLH_t):
+            lat, lon, h = kArrayNav(xyz).ecef_xyz2llh().to_list()
+            assert abs(lat - llh[0]) < 1e-10
+            assert abs(lon - llh[1]) < 1e-14
+            assert abs(h - llh[2]) < 1e-2
+
+    def assert_close(self, a, b, tol=1e-12):
+        # relative to the largest element (the elements may cancel each other):
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        assert a.shape == b.shape
+        assert np.abs(a-b).max() <= tol * np.abs(b).max()
+
+    def test_epoch(self):
+        for i in range(50):
+            lat = (np.random.rand()-0.5) * 0.99*pi
+            h   = np.random.rand() * 1e4
+            vN, vE, vD, vNp, vEp = np.random.randn(5) * 100
+
+            ep = kArrayNav.epoch(lat, h)
+            assert ep.Rphi == pytest.approx( kArrayNav.Rphi(lat), rel=1e-14 )
+            assert ep.Rlambda == pytest.approx( kArrayNav.Rlambda(lat), rel=1e-14 )
+            assert ep.gravity() == pytest.approx( kArrayNav.gravity(lat, h), rel=1e-14 )
+            assert ep.dLat_dt(vN) == pytest.approx( kArrayNav.dLat_dt(vN, lat, h), rel=1e-14 )
+            assert ep.dLong_dt(vE) == pytest.approx( kArrayNav.dLong_dt(vE, lat, h), rel=1e-14 )
+
+            dLat = kArrayNav.dLat_dt(vN, lat, h)
+            dLon = kArrayNav.dLong_dt(vE, lat, h)
+
+            for x, y in [
+                    ( ep.gravity_n(),               kArrayNav.gravity_n(lat, h) ),
+                    ( ep.dLLH_dt(vN, vE, vD),       kArrayNav.dLLH_dt(vN, vE, vD, lat, h) ),
+                    ( ep.w_ie_n(),                  kArrayNav.w_ie_n(lat) ),
+                    ( ep.w_en_n(vN, vE),            kArrayNav.w_en_n(dLat, dLon, lat) ),
+                    ( ep.w_in_n(vN, vE),            kArrayNav.w_in_n(vN, vE, lat, h) ),
+                    ( ep.dWen_dt(vN, vE, vD, vNp, vEp), kArrayNav.dWen_dt(lat, vN, vE, vD, h, vNp, vEp) ),
+                    ( ep.Jacobian_dwin_vNED(),      kArrayNav.Jacobian_dwin_vNED(lat, h) ),
+                    ( ep.Jacobian_dwin_LLH(vN, vE), kArrayNav.Jacobian_dwin_LLH(vN, vE, lat, h) ),
+                ]:
+                assert type(x) == kArrayNav
+                self.assert_close(x, y)
+
+    #( --- raw sympy expressions, as reference of the kernels after CSE --- )#
+    def sympy_dWen_dt(self, cls, lat_rad, vN, vE, vD, h_m, vNp, vEp):
+        dLat     = cls.dLat_dt(vN, lat_rad, h_m)
+        slat     = math.sin(lat_rad)
+        clat     = math.cos(lat_rad)
+        e2s2l2   = cls.earth_e2 * slat**2.0
+
+        wp_en_x =  ((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vEp - (1.0*cls.earth_a*cls.earth_e2*slat*clat*dLat + (-e2s2l2 + 1.0)**(3/2)*-vD)*vE)/((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)**2*sqrt(-e2s2l2 + 1.0))
+        wp_en_y =  ((cls.earth_a*(cls.earth_e2 - 1.0) - (-e2s2l2 + 1.0)**1.5*h_m)*(-e2s2l2 + 1.0)**1.5*vNp - (-e2s2l2 + 1.0)**0.5*(1.5*cls.earth_a*cls.earth_e2*(cls.earth_e2 - 1.0)*math.sin(2*lat_rad)*dLat - (-e2s2l2 + 1.0)**2.5*-vD)*vN)/(cls.earth_a*(cls.earth_e2 - 1.0) - (-e2s2l2 + 1.0)**1.5*h_m)**2
+        wp_en_z =  (-(cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vE*slat**2*dLat - (cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*vE*clat**2*dLat - (cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)*(-e2s2l2 + 1.0)*slat*clat*vEp + (1.0*cls.earth_a*cls.earth_e2*slat*clat*dLat + (-e2s2l2 + 1.0)**(3/2)*-vD)*vE*slat*clat)/((cls.earth_a + sqrt(-e2s2l2 + 1.0)*h_m)**2*sqrt(-e2s2l2 + 1.0)*clat**2)
+
+        return [ wp_en_x, wp_en_y, wp_en_z ]
+
+    def sympy_Jacobian_dwin_LLH(self, cls, vN, vE, lat_rad, h_m):
+        slat  = math.sin(lat_rad)
+        clat  = math.cos(lat_rad)
+        s2lat = math.sin(2*lat_rad)
+        c2lat = math.cos(2*lat_rad)
+        slat2 = slat**2
+        clat2 = clat**2
+        lat   = lat_rad
+        h     = h_m
+
+        J_00 = -1.0*cls.earth_a*cls.earth_e2*vE*slat**1.0*clat/((cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0)) - cls.wie*slat
+        J_10 = -1.06066017177982*cls.earth_a*cls.earth_e2*vN*(cls.earth_e2 - 1.0)*(cls.earth_e2*c2lat - cls.earth_e2 + 2)**0.5*s2lat/(-cls.earth_a*cls.earth_e2 + cls.earth_a + h*(0.5*cls.earth_e2*c2lat - 0.5*cls.earth_e2 + 1)**1.5)**2
+        J_20 = (1.0*cls.earth_a*cls.earth_e2*vE*slat2 - vE*(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))*(-cls.earth_e2*slat2 + 1.0)/clat2 - cls.wie*(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0)*clat)/(
+                (cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2*sqrt(-cls.earth_e2*slat2 + 1.0))
+        J_01 = vE*(cls.earth_e2*slat2 - 1.0)/(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2
+        J_11 = vN*(-cls.earth_e2*slat2 + 1.0)**3.0/(cls.earth_a*(cls.earth_e2 - 1.0) - h*(-cls.earth_e2*slat2 + 1.0)**1.5)**2
+        J_21 = vE*(-cls.earth_e2*slat2 + 1.0)*math.tan(lat)/(cls.earth_a + h*sqrt(-cls.earth_e2*slat2 + 1.0))**2
+
+        return [[J_00, 0.0, J_01], [J_10, 0.0, J_11], [J_20, 0.0, J_21]]
+
+    def test_cse_kernels_vs_sympy(self):
+        N   = 100
+        lat = (np.random.rand(N)-0.5) * 0.99*pi
+        h   = (np.random.rand(N) * 2e4) - 1e3
+        vN, vE, vD, vNp, vEp = np.random.randn(5,N) * 100
+
+        dWen = kArrayNav.batch_dWen_dt(lat, vN, vE, vD, h, vNp, vEp)
+        J    = kArrayNav.batch_Jacobian_dwin_LLH(vN, vE, lat, h)
+        assert dWen.shape == (N,3)
+        assert J.shape == (N,3,3)
+
+        for i in range(N):
+            ref_dWen = self.sympy_dWen_dt(kArrayNav, lat[i], vN[i], vE[i], vD[i], h[i], vNp[i], vEp[i])
+            ref_J    = self.sympy_Jacobian_dwin_LLH(kArrayNav, vN[i], vE[i], lat[i], h[i])
+
+            self.assert_close( kArrayNav.dWen_dt(lat[i], vN[i], vE[i], vD[i], h[i], vNp[i], vEp[i]), np.reshape(ref_dWen, (3,1)) )
+            self.assert_close( kArrayNav.Jacobian_dwin_LLH(vN[i], vE[i], lat[i], h[i]), ref_J )
+            self.assert_close( dWen[i], ref_dWen )
+            self.assert_close( J[i], ref_J )
+
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
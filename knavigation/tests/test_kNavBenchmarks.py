@@ -0,0 +1,26 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from knavigation import kNavBenchmarks
+import json
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kNavBenchmarks:
+
+    def test_json_report(self, tmp_path):
+        # smoke test only, with few calls:
+        bench    = kNavBenchmarks(calls=10, repeat=1, sizes=(5,))
+        filename = tmp_path / "bench.json"
+        report   = bench.do_benchmarks(str(filename))
+
+        with open(filename) as f:
+            saved = json.load(f)
+
+        names = [ i["name"] for i in saved["results"] ]
+        assert names.count("slicing") == 2*len(kNavBenchmarks.SLICING)
+        assert names.count("earth_model") == len(kNavBenchmarks.EARTH_MODEL) + len(kNavBenchmarks.EARTH_MODEL_BATCH)
+        assert names.count("quaternion") == len(kNavBenchmarks.QUATERNION) + 1
+        assert names.count("resample") == len(kNavBenchmarks.RESAMPLE)
+        assert names.count("strapdown") == 1
+        assert len(saved["results"]) == len(report["results"])
+        assert all( [i["min_s"] > 0 for i in saved["results"]] )
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
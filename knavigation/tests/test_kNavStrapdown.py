@@ -0,0 +1,127 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from knavigation import kArrayNav, kNavLib, kNavStrapdown
+import numpy as np
+import pytest
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kNavStrapdown:
+
+    def get_stationary_imu(self, lat, h, euler, dt, n):
+        """
+        Increments of an IMU at rest on the earth, with attitude 'euler'.
+        """
+        Cn2b  = kArrayNav(euler).euler2C().to_numpy()
+        f_b   = Cn2b @ np.array([0, 0, -kArrayNav.gravity(lat, h)])
+        w_b   = Cn2b @ kArrayNav.w_ie_n(lat).to_numpy().ravel()
+        return np.tile(w_b*dt, (n,1)), np.tile(f_b*dt, (n,1))
+
+    def get_oscillation(self, t, a_rad, b_m_s2, axis_w, axis_f, freq_Hz=10.):
+        """
+        Exact increments of w_ib_b = a.sin(W.t) around axis_w and f_b = b.sin(W.t)
+        along axis_f, at the instants 't'. With axis_w != axis_f, the motion has
+        sculling; the coning motion is in get_coning().
+        """
+        W      = 2*np.pi*freq_Hz
+        c      = -(np.cos(W*t[1:]) - np.cos(W*t[:-1])) / W
+        dtheta = np.zeros((len(c),3))
+        dv     = np.zeros((len(c),3))
+        dtheta[:,axis_w] = a_rad  * c
+        dv[:,axis_f]     = b_m_s2 * c
+        return dtheta, dv
+
+    def get_coning(self, t, a_rad=0.05, freq_Hz=10.):
+        """
+        Exact increments of w_ib_b = [0, a.cos(W.t), a.sin(W.t)].
+        """
+        W      = 2*np.pi*freq_Hz
+        dtheta = np.zeros((len(t)-1,3))
+        dtheta[:,1] =  (a_rad/W) * (np.sin(W*t[1:]) - np.sin(W*t[:-1]))
+        dtheta[:,2] = -(a_rad/W) * (np.cos(W*t[1:]) - np.cos(W*t[:-1]))
+        return dtheta, np.zeros_like(dtheta)
+
+    def run(self, T, dt, increments, compensated=True):
+        t          = np.arange(0, T + (0.5*dt), dt)
+        dtheta, dv = increments(t)
+        ins        = kNavStrapdown([0.7, 0, 0], [0, 0, 0], [1, 0, 0, 0], dt, coning=compensated, sculling=compensated)
+        return ins.run(dtheta, dv)
+
+    def test_shapes(self):
+        ins        = kNavStrapdown([0.7, 0.1, 10.], [1, 2, 3], [1, 0, 0, 0], 0.01)
+        Q, V, LLH  = ins.run(np.zeros((5,3)), np.zeros((5,3)))
+        assert Q.shape == (6,4)
+        assert V.shape == (6,3)
+        assert LLH.shape == (6,3)
+        assert np.all(Q[0] == [1, 0, 0, 0])
+        assert np.all(V[0] == [1, 2, 3])
+        assert np.all(LLH[0] == [0.7, 0.1, 10.])
+
+    def test_errors(self):
+        with pytest.raises(NameError):
+            kNavStrapdown([0.7, 0.1], [0, 0, 0], [1, 0, 0, 0], 0.01)
+        with pytest.raises(NameError):
+            kNavStrapdown([0.7, 0.1, 0], [0, 0, 0], [1, 0, 0, 0], 0.0)
+        with pytest.raises(NameError):
+            kNavStrapdown([0.7, 0.1, 0], [0, 0, 0], [1, 0, 0, 0], 0.01).run(np.zeros((5,3)), np.zeros((4,3)))
+
+    @pytest.mark.parametrize("euler", [ [0, 0, 0], [0.1, -0.2, 1.0], [-1.0, 1.2, -2.5] ])
+    def test_stationary(self, euler):
+        # at rest, the navigation shall stay at rest (60 s at 200 Hz):
+        lat, lon, h = 0.7, 0.3, 100.
+        dt          = 1/200.
+        dtheta, dv  = self.get_stationary_imu(lat, h, euler, dt, 12000)
+        q0          = kArrayNav(euler).euler2Q()
+
+        Q, V, LLH   = kNavStrapdown([lat, lon, h], [0, 0, 0], q0, dt).run(dtheta, dv)
+
+        assert np.max(np.abs(V))                     < 1e-8
+        assert np.max(np.abs(LLH[:,:2] - [lat, lon])) < 1e-12
+        assert np.max(np.abs(LLH[:,2] - h))           < 1e-6
+        assert np.max(np.abs(kArrayNav.batch_Q2euler(Q[-1:]) - euler)) < 1e-10
+
+    def test_earth_model_of_nav(self):
+        # the gravity of the class 'nav' is used (here constant, 10 m/s2):
+        class kNavLibConstantGravity(kNavLib):
+            earth_gravity = (10.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        dt          = 1/200.
+        dtheta, dv  = self.get_stationary_imu(0.7, 0., [0, 0, 0], dt, 2000)
+        dv[:,2]     = -10.0 * dt
+        _, V, _     = kNavStrapdown([0.7, 0, 0], [0, 0, 0], [1, 0, 0, 0], dt, nav=kNavLibConstantGravity).run(dtheta, dv)
+        assert np.max(np.abs(V)) < 1e-8
+
+    def test_blocks(self):
+        # the state (also of coning/sculling) is kept between the calls of run():
+        t          = np.arange(0, 1.0, 0.005)
+        dtheta, dv = self.get_oscillation(t, 0.05, 1.0, 0, 1)
+
+        ins_a  = kNavStrapdown([0.7, 0, 0], [0, 0, 0], [1, 0, 0, 0], 0.005)
+        ret_a  = ins_a.run(dtheta, dv)
+
+        ins_b  = kNavStrapdown([0.7, 0, 0], [0, 0, 0], [1, 0, 0, 0], 0.005)
+        ret_b0 = ins_b.run(dtheta[:77], dv[:77])
+        ret_b1 = ins_b.run(dtheta[77:], dv[77:])
+
+        for a, b0, b1 in zip(ret_a, ret_b0, ret_b1):
+            assert np.all( a == np.vstack((b0, b1[1:])) )
+
+    def test_coning(self):
+        # compared with the same motion sampled 50x faster:
+        dt    = 1/200.
+        q_ref = self.run(5., dt/50, self.get_coning)[0][-1]
+        q_on  = self.run(5., dt,    self.get_coning, True)[0][-1]
+        q_off = self.run(5., dt,    self.get_coning, False)[0][-1]
+
+        err_on  = 2*np.arccos(min(1., abs(q_on  @ q_ref)))
+        err_off = 2*np.arccos(min(1., abs(q_off @ q_ref)))
+        assert err_on < (err_off / 10.)
+
+    def test_sculling(self):
+        dt     = 1/200.
+        motion = lambda t: self.get_oscillation(t, 0.05, 1.0, 0, 1)
+        v_ref  = self.run(5., dt/50, motion)[1][-1]
+        v_on   = self.run(5., dt,    motion, True)[1][-1]
+        v_off  = self.run(5., dt,    motion, False)[1][-1]
+
+        assert np.linalg.norm(v_on - v_ref) < (np.linalg.norm(v_off - v_ref) / 10.)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
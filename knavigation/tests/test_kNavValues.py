@@ -0,0 +1,127 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from knavigation import kArrayNav, Vec3, Mat3, Quat
+from knavigation.tests.test_import import run_python
+import numpy as np
+import pytest
+from numpy import pi
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kNavValues:
+
+    def get_random_euler_rad(self):
+        # [3] random euler angles [-pi/2, pi/2]
+        return ((((np.random.rand(3)*2.0)-1)*90) * pi/180).tolist()
+
+    def assert_same(self, value, array):
+        # value type vs. kArrayNav:
+        assert value.to_list() == pytest.approx(array.to_list(), abs=1e-12)
+
+    def test_slots(self):
+        for v in [ Vec3(1,2,3), Mat3.eye(), Quat(1,0,0,0) ]:
+            assert not hasattr(v, "__dict__")
+
+    def test_conversion(self):
+        a = kArrayNav( [1,2,3], hvector=False )
+        v = Vec3.from_kArrayNav(a)
+        assert v == Vec3(1,2,3)
+        assert v.to_kArrayNav() == a
+        assert v.to_kArrayNav().shape == (3,1)
+        assert v.to_kArrayNav(hvector=True).shape == (1,3)
+
+        q = Quat.from_kArrayNav( kArrayNav([1,2,3,4], hvector=False) )
+        assert q.to_kArrayNav().shape == (4,1)
+        assert Quat.from_kArrayNav( q.to_kArrayNav() ) == q
+
+        M = kArrayNav( np.arange(9).reshape(3,3) )
+        assert Mat3.from_kArrayNav(M).to_kArrayNav() == M
+        assert Mat3.from_kArrayNav(M)[1,2] == 5.
+
+    def test_conversion_keeps_package_classes(self):
+        # to_kArrayNav() shall not bind the module kArrayNav on the package:
+        out, _ = run_python(
+            "from knavigation.kNavValues import Vec3, Mat3, Quat\n"
+            "Vec3(1, 2, 3).to_kArrayNav(); Mat3.eye().to_kArrayNav(); Quat(1, 0, 0, 0).to_kArrayNav()\n"
+            "from knavigation import kArray, kArrayNav\n"
+            "print(isinstance(kArray, type), isinstance(kArrayNav, type))")
+        assert out.strip() == "True True"
+
+    def test_vec3_arithmetic(self):
+        a = Vec3(1,2,3)
+        b = Vec3(-4,5,0.5)
+        A = a.to_kArrayNav()
+        B = b.to_kArrayNav()
+
+        self.assert_same( a + b, A + B )
+        self.assert_same( a - b, A - B )
+        self.assert_same( -a, -A )
+        self.assert_same( 2*a, 2*A )
+        self.assert_same( a.X(b), A.X(B) )
+        self.assert_same( a.to_skew(), A.to_skew() )
+        assert a.norm() == pytest.approx( A.norm() )
+        assert a.dot(b) == pytest.approx( A.T*B )
+
+    def test_mat3_products(self):
+        M = Mat3( *np.random.randn(9) )
+        N = Mat3( *np.random.randn(9) )
+        v = Vec3( *np.random.randn(3) )
+
+        self.assert_same( M*N, M.to_kArrayNav() * N.to_kArrayNav() )
+        self.assert_same( M*v, M.to_kArrayNav() * v.to_kArrayNav() )
+        self.assert_same( M.T, M.to_kArrayNav().T )
+        self.assert_same( 3.0*M, 3.0*M.to_kArrayNav() )
+
+    def test_same_as_kArrayNav(self):
+        for i in range(20):
+            euler = self.get_random_euler_rad()
+            w     = np.random.randn(3).tolist()
+            r     = np.random.randn(3).tolist()
+
+            e_v = Vec3( *euler )
+            e_a = kArrayNav( euler )
+
+            self.assert_same( e_v.euler2Q(), e_a.euler2Q() )
+            self.assert_same( e_v.euler2C(), e_a.euler2C() )
+            self.assert_same( e_v.dEulerDt(w), e_a.dEulerDt(w) )
+            self.assert_same( e_v.to_deg(), e_a.to_deg() )
+
+            q_v = e_v.euler2Q()
+            q_a = e_a.euler2Q()
+            self.assert_same( q_v.Q2euler(), q_a.Q2euler() )
+            self.assert_same( q_v.Q2C(), q_a.Q2C() )
+            self.assert_same( q_v.q_conj(), q_a.q_conj() )
+            self.assert_same( q_v.q_inv(), q_a.q_inv() )
+            self.assert_same( (q_v*3).q_norm(), (q_a*3).q_norm() )
+            self.assert_same( q_v.dqdt(w), q_a.dqdt(w) )
+            self.assert_same( (q_v*1.01).dqdt(w), (q_a*1.01).dqdt(w) )
+            self.assert_same( q_v.q_propagate(w, 0.01), q_a.q_propagate(w, 0.01) )
+            self.assert_same( q_v.q_x_3d(Vec3(*r)), q_a.q_x_3d(kArrayNav(r, hvector=False)) )
+
+            q2_v = Vec3( *self.get_random_euler_rad() ).euler2Q()
+            self.assert_same( q_v.q_x_q(q2_v), q_a.q_x_q(q2_v.to_kArrayNav()) )
+
+            C_v = q_v.Q2C()
+            C_a = q_a.Q2C()
+            self.assert_same( C_v.C2euler(), C_a.C2euler() )
+            self.assert_same( C_v.C2Q(), C_a.C2Q() )
+
+    def test_ecef(self):
+        for i in range(20):
+            llh = [ (np.random.rand()-0.5)*pi, (np.random.rand()-0.5)*2*pi, np.random.rand()*1e4 ]
+
+            xyz_v = Vec3(*llh).ecef_llh2xyz()
+            xyz_a = kArrayNav(llh).ecef_llh2xyz()
+            assert xyz_v.to_list() == pytest.approx(xyz_a.to_list(), rel=1e-12)
+
+            llh_v = xyz_v.ecef_xyz2llh()
+            llh_a = xyz_a.ecef_xyz2llh()
+            assert llh_v.to_list() == pytest.approx(llh_a.to_list(), rel=1e-9, abs=1e-9)
+
+    def test_Q2euler_with_incorrect_Q(self):
+        with pytest.raises(ValueError):
+            Quat(1,2,3,4).Q2euler()
+
+    def test_mat3_size(self):
+        with pytest.raises(NameError):
+            Mat3(1,2,3)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
@@ -1,5 +1,7 @@
 from .kSosode           import kSosode, kSosodeFunction, kSosodeTests
 from .kSosodeIntegrator import kSosodeUtils, kSosodeIntegrator, kSosodeIntegratorTests
+from .kSosodeKernel     import kSosodeKernel
+from .kSosodeBenchmarks import kSosodeBenchmarks
 
 __version__ = "1.0.0"
 __author__  = "Luciano A. Kruk"
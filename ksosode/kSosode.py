@@ -39,6 +39,9 @@
 ##@@##@@##@@ ##@@##@@##@@ ##@@##@@##@@ ###@@##@@##@ @#@@##@@##@@ ##@@##@@##@@ ##@@##@@##@@
 ##>>                                                                                  <<##
 ##@@##@@##@@ ##@@##@@##@@ ##@@##@@##@@ ###@@##@@##@ @#@@##@@##@@ ##@@##@@##@@ ##@@##@@##@@
+from itertools import chain
+import numpy as np
+
 class kSosodeFunction:
     def __init__(self, handler):
         self.handler = handler
@@ -75,9 +78,13 @@ class kSosode:
             order_states :  list with the order of states in the state vector.
         """
 
-        self.list_fn      = []
-        self.reverse      = reverse
-        self.order_states = order_states
+        self.list_fn          = []
+        self.reverse          = reverse
+        self.order_states     = order_states
+        self.required_outputs = None
+        self.pruned_functions = []
+        self.recording        = False
+        self._record_at       = None
 
         for i in fn_objs:
             self.register(i)
@@ -97,11 +104,25 @@ class kSosode:
             print("    output params: {:s}".format(j.o_param.__str__()))
 
 
-    def create_nets(self):
+    def create_nets(self, required_outputs=None):
+        """
+        Use:
+            required_outputs :  None to calculate all parameters (default), or a list with
+                                the labels of the parameters to keep available besides the
+                                ones needed by the derivatives of the states. The parameter
+                                functions not needed are pruned from the nets, and their
+                                parameters remain zero in the parameter vector.
+        """
 
         ret = self._check_sanity()
 
         if ret:
+            if required_outputs is not None:
+                unknown = [ i for i in required_outputs if i not in self.list_of_outputs ]
+                if len(unknown) > 0:
+                    raise(NameError("create_net: required outputs {:s} are not calculated by any function.".format(unknown.__str__())))
+
+            self.required_outputs = required_outputs
             self._create_all_sets()
             self._create_net_params()
             self._create_net_states()
@@ -111,6 +132,19 @@ class kSosode:
         return ret
 
 
+    def create_kernel(self, jit=True):
+        """
+        Exports the nets as a single RHS function with a fixed-step RK4 loop
+        (see kSosodeKernel). With `jit=True` the kernel is compiled by Numba
+        when all handlers are jittable, otherwise it falls back to the python path.
+
+        Call self.create_nets() before.
+        """
+
+        from .kSosodeKernel import kSosodeKernel
+        return kSosodeKernel(self, jit=jit)
+
+
     def __call__(self, *args):
         """
         Calculates d(state)/dt : derivative of the states (same order as self.list_of_states)
@@ -132,14 +166,123 @@ class kSosode:
             print(state)
 
         params = self._calc_all_parameters(t)
+
+        if (self._record_at is not None) and (t == self._record_at):
+            self._record(t, params)
+
         return self._calc_all_ddtstates(t, state, params)
 
 
+    def start_recording(self, nb_samples):
+        """
+        Recording mode: preallocates a log buffer for 'nb_samples' parameter
+        vectors (same order as self.list_of_params). Call self.create_nets() before.
+
+        After self.record_next(t), the parameters calculated by the next call of
+        the RHS at the time 't' are copied into the buffer, so they are not
+        calculated again just to be logged.
+
+        The parameters can be scalars or arrays (eg. a 3D vector). The buffer has
+        one row per sample with all parameters flattened; the slot of each one is
+        sized at the first recorded sample (see self.log_slices).
+        """
+
+        self.log_time   = np.zeros(nb_samples)
+        self.log_params = None
+        self.log_slices = None
+        self.log_count  = 0
+        self.recording  = True
+        self._record_at = None
+
+
+    def stop_recording(self):
+        self.recording  = False
+        self._record_at = None
+
+
+    def record_next(self, t):
+        """
+        Asks to copy the parameters of the next RHS evaluation at the time 't'.
+        """
+
+        if self.recording:
+            self._record_at = t
+
+
+    def _create_log_buffer(self, params):
+        """
+        Slot of each parameter in the rows of the buffer: (start, stop, shape),
+        from the values of the first sample.
+        """
+
+        self.log_slices = []
+        start = 0
+        for p in params:
+            shape = np.shape(p)
+            stop  = start + int(np.prod(shape))
+            self.log_slices.append( (start, stop, shape) )
+            start = stop
+
+        self.log_params = np.zeros((len(self.log_time), start))
+
+
+    def _record(self, t, params):
+        if self.log_count >= len(self.log_time):
+            raise(NameError("record: the log buffer is full ({:d} samples).".format(self.log_count)))
+
+        if self.log_params is None:
+            self._create_log_buffer(params)
+
+        row = self.log_params[self.log_count]
+        for (start, stop, shape), p in zip(self.log_slices, params):
+            if len(shape) == 0:
+                row[start] = p
+            else:
+                row[start:stop] = np.ravel(p)
+
+        self.log_time[self.log_count] = t
+        self.log_count += 1
+        self._record_at = None
+
+
+    def get_log(self, *labels):
+        """
+        Returns the recorded (time, parameters) as views of the log buffer.
+
+            self.get_log()                  (time, [N x ...] all parameters, flattened)
+            self.get_log('tta')             (time, values of 'tta': [N] if scalar,
+                                                    [N x dim] if a vector)
+            self.get_log('tta', 'gravity')  (time, [N x (dim_tta + dim_gravity)] array)
+        """
+
+        n = self.log_count
+        if self.log_params is None:
+            return self.log_time[:0], np.zeros((0, 0))
+
+        if len(labels) == 0:
+            return self.log_time[:n], self.log_params[:n]
+
+        slots = [ self.log_slices[self.list_of_params.index(i)] for i in labels ]
+        if len(slots) == 1:
+            start, stop, shape = slots[0]
+            if len(shape) == 0:
+                return self.log_time[:n], self.log_params[:n, start]
+            return self.log_time[:n], self.log_params[:n, start:stop]
+        else:
+            idx = np.concatenate( [ np.arange(start, stop) for start, stop, _ in slots ] )
+            return self.log_time[:n], self.log_params[:n, idx]
+
+
     def _create_all_sets(self):
-        self.list_of_outputs = list( set( sum( [i.o_state + i.o_param for i in self.list_fn ], [] ) ) )
-        self.list_of_inputs  = list( set( sum( [i.i_state + i.i_param for i in self.list_fn ], [] ) ) )
-        self.list_of_params  = list( set( sum( [i.i_param + i.o_param for i in self.list_fn ], [] ) ) )
-        self.list_of_states  = list( set( sum( [i.i_state + i.o_state for i in self.list_fn ], [] ) ) )
+        o_state = set( chain.from_iterable( [i.o_state for i in self.list_fn] ) )
+        o_param = set( chain.from_iterable( [i.o_param for i in self.list_fn] ) )
+        i_state = set( chain.from_iterable( [i.i_state for i in self.list_fn] ) )
+        i_param = set( chain.from_iterable( [i.i_param for i in self.list_fn] ) )
+
+        self.list_of_outputs = list( o_state | o_param )
+        self.list_of_inputs  = list( i_state | i_param )
+        self.list_of_params  = list( i_param | o_param )
+        self.list_of_states  = list( i_state | o_state )
 
         if self.order_states is not None:
             if set(self.list_of_states) == set(self.order_states):
@@ -215,45 +358,204 @@ class kSosode:
         return ret
 
 
+    def diagnose(self):
+        """
+        Analyses the graph of registered functions with hash maps, in linear time
+        with the number of functions and labels. Nothing is printed.
+
+        return: dict with
+            "duplicates"     : {output: [fn, ...]}  outputs calculated by more than one function
+            "no_outputs"     : [fn, ...]            functions without any output
+            "missing_inputs" : {input: [fn, ...]}   inputs not calculated by any function
+            "mixed"          : [fn, ...]            functions calculating derivatives AND parameters
+            "no_states"      : True when there is no derivative of states to integrate
+            "cycles"         : [[fn, ...], ...]     parameter functions depending on each other in loop
+            "dead_functions" : [fn, ...]            parameter functions not needed by any derivative
+            "unused_states"  : [state, ...]         integrated states not read by any function
+            "ok"             : True when the net can be created (dead functions and
+                               unused states are only warnings)
+
+        where 'fn' is the index of the function in self.list_fn.
+        """
+
+        producers = self._map_producers()
+        consumers = {} # input  -> functions reading it
+        read_states = set()
+        all_states  = set()
+
+        report = {
+            "duplicates"     : {},
+            "no_outputs"     : [],
+            "missing_inputs" : {},
+            "mixed"          : [],
+            "no_states"      : False,
+            "cycles"         : [],
+            "dead_functions" : [],
+            "unused_states"  : [],
+            "ok"             : True,
+        }
+
+        for i,fn in enumerate(self.list_fn):
+            outputs = set(fn.o_state) | set(fn.o_param)
+            if len(outputs) == 0:
+                report["no_outputs"].append(i)
+
+            if (len(fn.o_state) > 0) and (len(fn.o_param) > 0):
+                report["mixed"].append(i)
+
+            for j in set(fn.i_state) | set(fn.i_param):
+                consumers.setdefault(j, []).append(i)
+
+            read_states.update(fn.i_state)
+            all_states.update(fn.i_state)
+            all_states.update(fn.o_state)
+
+        report["duplicates"]     = { k:v for k,v in producers.items() if len(v) > 1 }
+        report["missing_inputs"] = { k:v for k,v in consumers.items() if k not in producers }
+        report["no_states"]      = len(all_states) == 0
+        report["cycles"]         = self._find_param_cycles(producers)
+        report["unused_states"]  = sorted( [ k for k in all_states if k not in read_states ] )
+
+        live = self._live_functions(producers)
+        report["dead_functions"] = [
+            i for i,fn in enumerate(self.list_fn) if (i not in live) and (len(fn.o_state) == 0) and (len(fn.o_param) > 0)
+        ]
+
+        report["ok"] = not ( report["duplicates"] or report["no_outputs"] or report["missing_inputs"]
+                             or report["mixed"] or report["no_states"] or report["cycles"] )
+
+        return report
+
+
+    def _map_producers(self):
+        """
+        Returns a dict {output: [fn, ...]} with the functions calculating each output.
+        """
+
+        producers = {}
+        for i,fn in enumerate(self.list_fn):
+            for j in set(fn.o_state) | set(fn.o_param):
+                producers.setdefault(j, []).append(i)
+
+        return producers
+
+
+    def _live_functions(self, producers, required_outputs=()):
+        """
+        Returns the set of functions necessary to calculate all derivatives of
+        states and the outputs in 'required_outputs', walking backwards from the
+        state functions through the parameters they need.
+
+            producers : {output: [fn, ...]} as created in self.diagnose()
+        """
+
+        live  = set()
+        stack = [ i for i,fn in enumerate(self.list_fn) if len(fn.o_state) > 0 ]
+        for j in required_outputs:
+            stack += producers.get(j, [])
+
+        while len(stack) > 0:
+            i = stack.pop()
+            if i in live: continue
+            live.add(i)
+
+            for j in self.list_fn[i].i_param:
+                stack += producers.get(j, [])
+
+        return live
+
+
+    def _find_param_cycles(self, producers):
+        """
+        Returns the loops among parameter functions (strongly connected
+        components of the graph 'fn calculates a param read by fn'), with the
+        iterative Tarjan algorithm.
+        """
+
+        # successors: fn -> functions it needs to be called before:
+        succ = [ [k for j in fn.i_param for k in producers.get(j, [])] for fn in self.list_fn ]
+
+        index   = {}
+        lowlink = {}
+        on_stk  = set()
+        stk     = []
+        cycles  = []
+        counter = 0
+
+        for root in range(len(self.list_fn)):
+            if root in index: continue
+
+            work = [(root, 0)]
+            while len(work) > 0:
+                v, pos = work.pop()
+                if pos == 0:
+                    index[v]   = counter
+                    lowlink[v] = counter
+                    counter   += 1
+                    stk.append(v)
+                    on_stk.add(v)
+
+                recurse = False
+                for k in range(pos, len(succ[v])):
+                    w = succ[v][k]
+                    if w not in index:
+                        work.append((v, k+1))
+                        work.append((w, 0))
+                        recurse = True
+                        break
+                    elif w in on_stk:
+                        lowlink[v] = min(lowlink[v], index[w])
+
+                if recurse: continue
+
+                if lowlink[v] == index[v]:
+                    scc = []
+                    while True:
+                        w = stk.pop()
+                        on_stk.discard(w)
+                        scc.append(w)
+                        if w == v: break
+
+                    if (len(scc) > 1) or (v in succ[v]):
+                        cycles.append(sorted(scc))
+
+                if len(work) > 0:
+                    u = work[-1][0]
+                    lowlink[u] = min(lowlink[u], lowlink[v])
+
+        return cycles
+
+
     def _check_sanity(self):
         self._create_all_sets()
-        ret = True
+        report = self.diagnose()
 
         # 1) each output is calculated by a unique function.
-        for i in self.list_of_outputs:
-            c = 0
-            for j in self.list_fn:
-                c += 1 if i in j.o_param + j.o_state else 0
-
-            if c != 1:
-                print("sanity check: output '{:s}' is calculated by more than one function.".format(i))
-                ret = False
+        for i in report["duplicates"]:
+            print("sanity check: output '{:s}' is calculated by more than one function.".format(i))
 
         # 2) each function calculates at least one output.
-        for i,j in enumerate(self.list_fn):
-            if len(j.o_param + j.o_state) == 0:
-                print("sanity check: function #{:d} do not calculate any output.".format(i))
-                ret = False
+        for i in report["no_outputs"]:
+            print("sanity check: function #{:d} do not calculate any output.".format(i))
 
         # 3) the necessary inputs for the functions are in the list_of_outputs.
-        for i in self.list_of_inputs:
-            if i not in self.list_of_outputs:
-                print("sanity check: input '{:s}' is not calculated by any function.".format(i))
-                ret = False
+        for i in report["missing_inputs"]:
+            print("sanity check: input '{:s}' is not calculated by any function.".format(i))
 
         # 4) derivative functions cannot calculate parameters AND parameter
         #    functions cannot calculate derivatives.
-        for i,j in enumerate(self.list_fn):
-            if (len(j.o_state) > 0) and (len(j.o_param) > 0):
-                print("sanity check: funtion #{:d} calculates derivatives AND parameters.".format(i))
-                ret = False
+        for i in report["mixed"]:
+            print("sanity check: funtion #{:d} calculates derivatives AND parameters.".format(i))
 
         # 5) at least one state to integrate.
-        if len(self.list_of_states) == 0:
+        if report["no_states"]:
             print("sanity check: there is no derivative of states to integrate.")
-            ret = False
 
-        return ret
+        # 6) parameters cannot depend on themselves.
+        for i in report["cycles"]:
+            print("sanity check: functions {:s} depend on each other in a loop.".format(i.__str__()))
+
+        return report["ok"]
 
 
     def _create_net_params(self):
@@ -277,11 +579,25 @@ class kSosode:
         # Results for the calculated parameters:
         #values_params         = [0 for i in range(nb_param)]
 
+        # functions to prune (outputs not needed):
+        producers = self._map_producers()
+        if self.required_outputs is None:
+            live = range(len(self.list_fn))
+        else:
+            live = self._live_functions(producers, self.required_outputs)
+
+        self.pruned_functions = [
+            i for i,fn in enumerate(self.list_fn) if (i not in live) and (len(fn.o_param) > 0)
+        ]
+
         for idx_p, p in enumerate(list_of_params):
 
             # already calculated?
             if flag_param_calculated[idx_p]: continue
 
+            # not needed?
+            if producers.get(p, [-1])[0] not in live: continue
+
             # with the reverse(), the first item does not have dependences other than time:
             seq_fn = self._sequence_calc_parameter(p)
             if len(seq_fn) > 0: seq_fn.reverse()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kSosodeBenchmarks.py
+Beschreibung: Benchmarks of kSosode and kSosodeIntegrator, with results written
+    to JSON to track regressions along the time.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz: Please keep this header with the file.
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+##WWww=--  import section: --=wwWW##
+
+import numpy as np
+from kunspecific.kBenchmarks import kBenchmarks
+from .kSosode           import kSosode, kSosodeFunction
+from .kSosodeIntegrator import kExample_RC_discharge
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+# handlers of the systems under test (plain functions, so they are jittable):
+
+def _lorenz_tta(t):
+    return 8. if t < 10 else -2.
+
+def _lorenz_eq0(t, y, *args):
+    return (-8.*y[0]) + (args[0]*y[1])
+
+def _lorenz_eq1(t, y):
+    return (30*y[0]) + y[1] - (y[0]*y[2])
+
+def _lorenz_eq2(t, y):
+    return (y[0]*y[1]) - (8.*y[2]/3)
+
+def _synthetic_param_t(t):
+    return 1.0 + (0.01*t)
+
+def _synthetic_param_p(t, p):
+    return 0.5*p
+
+def _synthetic_state(t, y, p):
+    return (-p*y[0]) + (0.1*y[1])
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+class kSosodeBenchmarks(kBenchmarks):
+    """
+    Benchmarks:
+        create_nets    :  time to build the nets vs. number of functions
+        rhs            :  latency of one call of the RHS (python and, if available, compiled kernel)
+        integrator     :  throughput of kSosodeIntegrator.update() at several sample rates
+
+    Use:
+        kSosodeBenchmarks(verbose=True).do_benchmarks("bench_sosode.json")
+
+    The timing and the report are the ones of kunspecific.kBenchmarks.
+    """
+
+    BENCHMARKS = ("bench_create_nets", "bench_rhs", "bench_integrator")
+
+    def __init__(self, sizes=(10, 100, 1000), sample_rates_Hz=(10, 100, 1000), repeat=5, verbose=False):
+        super().__init__(repeat=repeat, verbose=verbose)
+        self.sizes           = sizes
+        self.sample_rates_Hz = sample_rates_Hz
+
+    def create_lorenz(self):
+        """
+        The "full system" of kSosodeTests.
+        """
+
+        fn0 = kSosodeFunction(_lorenz_eq0)
+        fn0.set_i_state([ 'y0', 'y1' ])
+        fn0.set_i_param([ 'tta' ])
+        fn0.set_o_state([ 'y0' ])
+
+        fn1 = kSosodeFunction(_lorenz_eq1)
+        fn1.set_i_state([ 'y0', 'y1', 'y2' ])
+        fn1.set_o_state([ 'y1' ])
+
+        fn2 = kSosodeFunction(_lorenz_eq2)
+        fn2.set_i_state([ 'y0', 'y1', 'y2' ])
+        fn2.set_o_state([ 'y2' ])
+
+        g0 = kSosodeFunction(_lorenz_tta)
+        g0.set_o_param([ 'tta' ])
+
+        return kSosode( fn0, fn1, fn2, g0, reverse=True, order_states=[ 'y0', 'y1', 'y2' ] )
+
+    def create_synthetic(self, nb_fn):
+        """
+        A graph with 'nb_fn' functions: half of them calculate parameters (in
+        pairs: one from the time, the next from the previous parameter), and
+        the other half calculate one derivative each, coupled to the previous state.
+        """
+
+        nb_states = nb_fn // 2
+        nb_params = nb_fn - nb_states
+        fns       = []
+
+        for i in range(nb_params):
+            fn = kSosodeFunction(_synthetic_param_t if (i % 2) == 0 else _synthetic_param_p)
+            if (i % 2) == 1:
+                fn.set_i_param([ 'p{:d}'.format(i-1) ])
+            fn.set_o_param([ 'p{:d}'.format(i) ])
+            fns.append(fn)
+
+        order_states = [ 'y{:d}'.format(i) for i in range(nb_states) ]
+        for i in range(nb_states):
+            fn = kSosodeFunction(_synthetic_state)
+            fn.set_i_state([ order_states[i], order_states[i-1] ])
+            fn.set_i_param([ 'p{:d}'.format(i % nb_params) ])
+            fn.set_o_state([ order_states[i] ])
+            fns.append(fn)
+
+        return kSosode( *fns, reverse=True, order_states=order_states )
+
+    def bench_create_nets(self):
+        for n in self.sizes:
+            self._measure("create_nets", { "nb_fn": n }, lambda: self.create_synthetic(n).create_nets())
+
+    def bench_rhs(self, calls=200):
+        systems = [ ("lorenz", self.create_lorenz()) ] + [ ("synthetic_{:d}".format(n), self.create_synthetic(n)) for n in self.sizes ]
+
+        for label, b in systems:
+            b.create_nets()
+            y = np.ones(len(b.list_of_states))
+
+            def run():
+                for i in range(calls):
+                    b(y, 0.0)
+
+            self._measure("rhs", { "system": label, "kernel": "python" }, run, samples=calls)
+
+            k = b.create_kernel()
+            if k.jitted:
+                def run_kernel():
+                    for i in range(calls):
+                        k.rhs(0.0, y)
+
+                self._measure("rhs", { "system": label, "kernel": "numba" }, run_kernel, samples=calls)
+
+    def bench_integrator(self, t_max_s=1.0):
+        for fs in self.sample_rates_Hz:
+            nb_steps = int(t_max_s * fs)
+
+            def run():
+                rc = kExample_RC_discharge(fs, R=1e6)
+                for i in range(nb_steps):
+                    rc.update()
+
+            self._measure("integrator", { "sample_freq_Hz": fs, "t_max_s": t_max_s }, run, samples=nb_steps)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
@@ -14,7 +14,6 @@ GitHub:
 ##WWww=--  import section: --=wwWW##
 
 import numpy            as np
-import scipy.integrate  as Int
 from .kSosode import *
 
 #>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
@@ -84,6 +83,9 @@ class kSosodeIntegrator:
             self.state      :  most update state of the system
             self.state0     :  provided state vector for t=0[s]
             self.sys        :  system of systems of ODE with the model to integrate
+
+        When `self.sys` is recording (see kSosode.start_recording()), the parameters
+        at `self.curr_time` are captured while integrating the step out of it.
         """
 
         if self.curr_time < 0:
@@ -95,7 +97,13 @@ class kSosodeIntegrator:
         # target-time, one step:
         t = self.curr_time + self.dt
 
-        # integrate one step:
+        # the first evaluation of the RHS is at the accepted state (curr_time);
+        # (a kSosodeKernel has no recording mode):
+        if getattr(self.sys, "recording", False):
+            self.sys.record_next(self.curr_time)
+
+        # integrate one step (scipy is loaded only when needed):
+        import scipy.integrate as Int
         R = Int.odeint( self.sys, self.state, [self.curr_time, t], args=() )
         self.curr_time = t
         self.state     = R[1]
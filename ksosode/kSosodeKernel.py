@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kSosodeKernel.py
+Beschreibung: Exports the nets of a kSosode object as a single (optionally
+    Numba-compiled) RHS function, together with a fixed-step RK4 loop.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz: Please keep this header with the file.
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+##WWww=--  import section: --=wwWW##
+
+import numpy as np
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+
+def _first(x):
+    """
+    Returns `x` when it is a scalar, or its first element otherwise. It mimics
+    how the python net of the states stores the result of functions with a
+    single output (the net of the parameters stores the whole result).
+    """
+    return x[0] if hasattr(x, '__iter__') else x
+
+_numba_ready = False
+
+def _import_numba():
+    """
+    Numba is optional. Returns the module, or None when it is not available.
+    The first successful import also registers the overloads used by the
+    generated kernels.
+    """
+    global _numba_ready
+
+    try:
+        import numba
+        from numba.core import types
+        from numba.extending import overload
+    except ImportError:
+        return None
+
+    if not _numba_ready:
+        @overload(_first)
+        def _ol_first(x):
+            if isinstance(x, types.Number):
+                return lambda x: x
+            return lambda x: x[0]
+
+        _numba_ready = True
+
+    return numba
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+
+class kSosodeKernel:
+    """
+    A flat version of the nets of a kSosode object.
+
+    The nets (`net_params` and `net_states`) are translated into an index plan,
+    i.e. a list of calls with the positions of their inputs and outputs in the
+    parameter and state vectors. When Numba is available and all registered
+    handlers are jittable, the plan is written as the source of a single
+    `@njit` function, and a fixed-step RK4 loop is compiled on top of it, so a
+    whole trajectory runs without re-entering the interpreter.
+
+    When Numba is not installed, or any handler cannot be compiled, the kernel
+    falls back to the python path of the kSosode object. In this case
+    `self.jitted` is False and `self.reason` tells why. The compiled path holds
+    the parameters in a vector of floats, so it also falls back when a
+    parameter is not a scalar.
+
+    The functions are compiled with explicit signatures, without calling the
+    handlers.
+
+    Use:
+        b = kSosode( ..., order_states=[...] )
+        b.create_nets()
+
+        k = b.create_kernel()
+        Y = k.integrate([-1, 0, 1], t0=0.0, dt=1e-3, n=12000)
+    """
+
+    def __init__(self, sosode, jit=True):
+        """
+        Use:
+            sosode :  kSosode object, after `create_nets()`
+            jit    :  False to skip Numba and use the python path
+        """
+
+        if not hasattr(sosode, 'net_states'):
+            raise(NameError("kSosodeKernel: call create_nets() before creating the kernel."))
+
+        self.sosode    = sosode
+        self.nb_params = len(sosode.list_of_params)
+        self.nb_states = len(sosode.list_of_states)
+        self.plan      = self._create_plan()
+        self.jitted    = False
+        self.reason    = "jit not requested" if not jit else ""
+
+        self.rhs       = self._python_rhs
+        self._loop     = self._python_loop
+
+        if jit:
+            try:
+                self._create_jit()
+            except Exception as e:
+                self.reason = "{:s}: {:s}".format(e.__class__.__name__, str(e).split('\n')[0])
+                self.rhs    = self._python_rhs
+                self._loop  = self._python_loop
+                self.jitted = False
+
+    def _create_plan(self):
+        """
+        Translates the nets into a list of tuples:
+
+            ("param", fn, (idx of input params), (idx of output params))
+            ("state", fn, (idx of input params), (idx of input states), (idx of output states))
+
+        in the order they shall be called.
+        """
+
+        plan = []
+
+        net = self.sosode.net_params
+        idx = 0
+        while idx < len(net):
+            # "new arg" / "arg"...:
+            count  = net[idx]['count']
+            i_par  = tuple( net[idx+i+1]['idx_param'] for i in range(count) )
+            idx   += count + 1
+
+            # "callfn":
+            fn     = net[idx]['fn']
+            idx   += 1
+
+            # "save result" / "value ..."...:
+            count  = net[idx]['count']
+            o_par  = tuple( net[idx+i+1]['idx_param'] for i in range(count) )
+            idx   += count + 1
+
+            plan.append(("param", fn, i_par, o_par))
+
+        net = self.sosode.net_states
+        idx = 0
+        while idx < len(net):
+            # "new params" / "arg"...:
+            count  = net[idx]['count']
+            i_par  = tuple( net[idx+i+1]['idx_param'] for i in range(count) )
+            idx   += count + 1
+
+            # "new state" / "state"...:
+            count  = net[idx]['count']
+            i_sta  = tuple( net[idx+i+1]['idx_param'] for i in range(count) )
+            idx   += count + 1
+
+            # "callfn":
+            fn     = net[idx]['fn']
+            idx   += 1
+
+            # "save result" / "value state"...:
+            count  = net[idx]['count']
+            o_sta  = tuple( net[idx+i+1]['idx_param'] for i in range(count) )
+            idx   += count + 1
+
+            plan.append(("state", fn, i_par, i_sta, o_sta))
+
+        return plan
+
+    def _create_source(self):
+        """
+        Writes the plan as the source code of a flat RHS function.
+        """
+
+        src = [
+            "def _rhs(t, y):",
+            "    p  = np.zeros({:d})".format(self.nb_params),
+            "    dy = np.zeros({:d})".format(self.nb_states),
+        ]
+
+        for step in self.plan:
+            if step[0] == "param":
+                _, fn, i_par, o_par = step
+                args = "".join( [", p[{:d}]".format(i) for i in i_par] )
+                src.append("    _o = _h{:d}(t{:s})".format(fn, args))
+
+                # (a parameter that is not a scalar fails the compilation)
+                if len(o_par) == 1:
+                    src.append("    p[{:d}] = _o".format(o_par[0]))
+                else:
+                    for k,i in enumerate(o_par):
+                        src.append("    p[{:d}] = _o[{:d}]".format(i, k))
+
+            else:
+                _, fn, i_par, i_sta, o_sta = step
+                src.append("    _s = np.empty({:d})".format(len(i_sta)))
+                for k,i in enumerate(i_sta):
+                    src.append("    _s[{:d}] = y[{:d}]".format(k, i))
+
+                args = "".join( [", p[{:d}]".format(i) for i in i_par] )
+                src.append("    _o = _h{:d}(t, _s{:s})".format(fn, args))
+
+                if len(o_sta) == 1:
+                    src.append("    dy[{:d}] = _first(_o)".format(o_sta[0]))
+                else:
+                    for k,i in enumerate(o_sta):
+                        src.append("    dy[{:d}] = _o[{:d}]".format(i, k))
+
+        src.append("    return dy")
+
+        return "\n".join(src)
+
+    def _create_jit(self):
+        numba = _import_numba()
+        if numba is None:
+            raise(ImportError("numba is not available"))
+
+        # every handler shall be jittable:
+        namespace = { "np": np, "_first": _first }
+        for i in set( [step[1] for step in self.plan] ):
+            handler = self.sosode.list_fn[i].handler
+            if not isinstance(handler, numba.core.registry.CPUDispatcher):
+                handler = numba.njit(handler, error_model='numpy')
+            namespace["_h{:d}".format(i)] = handler
+
+        # the signatures force the compilation here, so it raises when a
+        # handler is not jittable (the handlers are not called):
+        exec(self._create_source(), namespace)
+        rhs = numba.njit("f8[:](f8, f8[:])", error_model='numpy')(namespace["_rhs"])
+
+        namespace["_rhs"] = rhs
+        exec(_RK4_SOURCE, namespace)
+        loop = numba.njit("f8[:,:](f8, f8[:], f8, i8)", error_model='numpy')(namespace["_loop"])
+
+        self.rhs    = rhs
+        self._loop  = loop
+        self.jitted = True
+
+    def _python_rhs(self, t, y):
+        params = self.sosode._calc_all_parameters(t)
+        return np.asarray( self.sosode._calc_all_ddtstates(t, y, params), dtype=float )
+
+    def _python_loop(self, t0, y0, dt, n):
+        return _rk4_loop(self._python_rhs, t0, y0, dt, n)
+
+    def integrate(self, y0, t0=0.0, dt=1e-2, n=1):
+        """
+        Integrates `n` fixed steps of `dt` with RK4, starting at (t0, y0).
+
+        return:
+            array [(n+1) x nb_states] with the state at t0, t0+dt, ..., t0+n.dt
+        """
+
+        y0 = np.asarray(y0, dtype=float).reshape(-1)
+        assert len(y0) == self.nb_states
+
+        return self._loop(float(t0), y0, float(dt), int(n))
+
+    def __call__(self, *args):
+        """
+        Same interface as kSosode.__call__(), for the integrators.
+        """
+
+        if self.sosode.reverse:
+            t      = args[1]
+            state  = args[0]
+        else:
+            t      = args[0]
+            state  = args[1]
+
+        return self.rhs(float(t), np.asarray(state, dtype=float))
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+
+def _rk4_loop(rhs, t0, y0, dt, n):
+    """
+    Fixed-step RK4 (python path).
+    """
+    Y    = np.empty((n+1, len(y0)))
+    Y[0] = y0
+    y    = y0.copy()
+    for k in range(n):
+        t  = t0 + (k*dt)
+        k1 = rhs(t, y)
+        k2 = rhs(t + (0.5*dt), y + (0.5*dt*k1))
+        k3 = rhs(t + (0.5*dt), y + (0.5*dt*k2))
+        k4 = rhs(t + dt, y + (dt*k3))
+        y  = y + ((dt/6.)*(k1 + (2.*k2) + (2.*k3) + k4))
+        Y[k+1] = y
+    return Y
+
+# same loop, to be compiled with `_rhs` as a global:
+_RK4_SOURCE = """
+def _loop(t0, y0, dt, n):
+    Y    = np.empty((n+1, y0.shape[0]))
+    Y[0] = y0
+    y    = y0.copy()
+    for k in range(n):
+        t  = t0 + (k*dt)
+        k1 = _rhs(t, y)
+        k2 = _rhs(t + (0.5*dt), y + (0.5*dt*k1))
+        k3 = _rhs(t + (0.5*dt), y + (0.5*dt*k2))
+        k4 = _rhs(t + dt, y + (dt*k3))
+        y  = y + ((dt/6.)*(k1 + (2.*k2) + (2.*k3) + k4))
+        Y[k+1] = y
+    return Y
+"""
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
@@ -0,0 +1,284 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from ksosode import kSosode, kSosodeFunction, kSosodeIntegrator
+import numpy as np
+import pytest
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+def new_fn(i_state=[], i_param=[], o_state=[], o_param=[]):
+    fn = kSosodeFunction(None)
+    fn.set_i_state(i_state)
+    fn.set_i_param(i_param)
+    fn.set_o_state(o_state)
+    fn.set_o_param(o_param)
+    return fn
+
+def create_chain(nb_fn):
+    """
+    One state 'y' driven by a chain of 'nb_fn' parameter functions:
+    p0 <- p1 <- ... <- p(nb_fn-1)
+    """
+    fns = [ new_fn(i_state=['y'], i_param=['p0'], o_state=['y']) ]
+    for i in range(nb_fn-1):
+        fns.append( new_fn(i_param=['p{:d}'.format(i+1)], o_param=['p{:d}'.format(i)]) )
+    fns.append( new_fn(o_param=['p{:d}'.format(nb_fn-1)]) )
+    return kSosode( *fns )
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kSosodeDiagnose:
+
+    def test_valid_system(self):
+        b = create_chain(5)
+        report = b.diagnose()
+
+        assert report["ok"]
+        assert b._check_sanity()
+        for i in ["duplicates", "no_outputs", "missing_inputs", "mixed", "cycles", "dead_functions", "unused_states"]:
+            assert len(report[i]) == 0
+
+    def test_duplicates(self):
+        b = kSosode( new_fn(i_state=['y'], o_state=['y']), new_fn(i_state=['y'], o_state=['y']) )
+        report = b.diagnose()
+
+        assert not report["ok"]
+        assert report["duplicates"] == { 'y': [0, 1] }
+        assert not b._check_sanity()
+
+    def test_no_outputs_and_missing_inputs(self):
+        b = kSosode( new_fn(i_state=['y'], o_state=['y']), new_fn(i_param=['p']) )
+        report = b.diagnose()
+
+        assert not report["ok"]
+        assert report["no_outputs"] == [1]
+        assert report["missing_inputs"] == { 'p': [1] }
+
+    def test_mixed(self):
+        b = kSosode( new_fn(i_state=['y'], o_state=['y'], o_param=['p']) )
+        assert b.diagnose()["mixed"] == [0]
+
+    def test_no_states(self):
+        b = kSosode( new_fn(o_param=['p']) )
+        report = b.diagnose()
+        assert report["no_states"]
+        assert not report["ok"]
+
+    def test_cycles(self):
+        b = kSosode(
+            new_fn(i_state=['y'], i_param=['p0'], o_state=['y']),
+            new_fn(i_param=['p1'], o_param=['p0']),
+            new_fn(i_param=['p2'], o_param=['p1']),
+            new_fn(i_param=['p0'], o_param=['p2']),
+            new_fn(i_param=['p3'], o_param=['p3']),
+        )
+        report = b.diagnose()
+
+        assert not report["ok"]
+        assert sorted(report["cycles"]) == [ [1, 2, 3], [4] ]
+        assert not b._check_sanity()
+
+        with pytest.raises(NameError):
+            b.create_nets()
+
+    def test_dead_functions_and_unused_states(self):
+        b = kSosode(
+            new_fn(i_state=['y'], i_param=['p0'], o_state=['y']),
+            new_fn(i_state=['z'], o_state=['x']),
+            new_fn(o_param=['p0']),
+            new_fn(i_param=['p2'], o_param=['p1']), # <= not needed
+            new_fn(o_param=['p2']),                 # <= only needed by a dead function
+            new_fn(o_state=['z']),
+        )
+        report = b.diagnose()
+
+        assert report["ok"]
+        assert report["dead_functions"] == [3, 4]
+        assert report["unused_states"]  == ['x']
+
+    def test_large_model(self):
+        b = create_chain(5000)
+        report = b.diagnose()
+
+        assert report["ok"]
+        assert len(report["dead_functions"]) == 0
+        assert b._check_sanity()
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kSosodePruning:
+
+    def create_system(self, calls):
+        def dydt(t, y, *args):
+            return [ -args[0]*y[0] ]
+
+        def gain(t):
+            calls.append('gain')
+            return 2.0
+
+        def diagnostic(t, *args):
+            calls.append('diagnostic')
+            return 10.0*args[0]
+
+        fn0 = kSosodeFunction(dydt)
+        fn0.set_i_state(['y'])
+        fn0.set_i_param(['k'])
+        fn0.set_o_state(['y'])
+
+        fn1 = kSosodeFunction(gain)
+        fn1.set_o_param(['k'])
+
+        fn2 = kSosodeFunction(diagnostic)
+        fn2.set_i_param(['k'])
+        fn2.set_o_param(['k10'])
+
+        return kSosode( fn0, fn1, fn2 )
+
+    def test_all_parameters_by_default(self):
+        calls = []
+        b = self.create_system(calls)
+        b.create_nets()
+
+        assert b.pruned_functions == []
+        params = b._calc_all_parameters(0.0)
+        assert params[b.list_of_params.index('k10')] == 20.0
+        assert sorted(calls) == ['diagnostic', 'gain']
+
+    def test_pruned_parameters(self):
+        calls = []
+        b = self.create_system(calls)
+        b.create_nets(required_outputs=[])
+
+        assert b.pruned_functions == [2]
+        assert b(0.0, [3.0]) == [-6.0]
+        assert calls == ['gain']
+
+        params = b._calc_all_parameters(0.0)
+        assert params[b.list_of_params.index('k10')] == 0
+
+    def test_required_parameters(self):
+        calls = []
+        b = self.create_system(calls)
+        b.create_nets(required_outputs=['k10'])
+
+        assert b.pruned_functions == []
+        params = b._calc_all_parameters(0.0)
+        assert params[b.list_of_params.index('k10')] == 20.0
+
+    def test_unknown_required_output(self):
+        b = self.create_system([])
+        with pytest.raises(NameError):
+            b.create_nets(required_outputs=['not there'])
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kSosodeRecording:
+
+    def create_system(self, calls):
+        def dydt(t, y, *args):
+            return [ -args[0]*y[0] ]
+
+        def gain(t):
+            calls.append(t)
+            return 1.0 if t < 0.5 else 2.0
+
+        fn0 = kSosodeFunction(dydt)
+        fn0.set_i_state(['y'])
+        fn0.set_i_param(['k'])
+        fn0.set_o_state(['y'])
+
+        fn1 = kSosodeFunction(gain)
+        fn1.set_o_param(['k'])
+
+        b = kSosode( fn0, fn1, reverse=True )
+        b.create_nets()
+        return b
+
+    def test_no_recording_by_default(self):
+        b = self.create_system([])
+        b.record_next(0.0)
+        b([1.0], 0.0)
+        assert not b.recording
+
+    def test_record_from_rhs(self):
+        calls = []
+        b = self.create_system(calls)
+        b.start_recording(4)
+
+        for t in [0.0, 0.25, 0.5, 0.75]:
+            b.record_next(t)
+            b([1.0], t + 0.1) # <= other times are not recorded
+            b([1.0], t)
+
+        assert len(calls) == 8 # <= no extra evaluation to log
+        T, k = b.get_log('k')
+        assert list(T) == [0.0, 0.25, 0.5, 0.75]
+        assert list(k) == [1.0, 1.0, 2.0, 2.0]
+
+        with pytest.raises(NameError):
+            b.record_next(1.0)
+            b([1.0], 1.0)
+
+    def test_record_with_integrator(self):
+        calls = []
+        sys   = self.create_system(calls)
+
+        class Example(kSosodeIntegrator):
+            def __init__(self):
+                self.sys    = sys
+                self.state0 = [1.0]
+                self.dt     = 0.1
+                super().__init__()
+
+        a = Example()
+        a.sys.start_recording(20)
+        for _ in range(11):
+            a.update()
+
+        T, k = a.sys.get_log('k')
+        assert np.allclose(T, np.arange(10)*0.1)
+        assert list(k) == [1.0]*5 + [2.0]*5
+
+        T, P = a.sys.get_log()
+        assert P.shape == (10, 1)
+
+    def test_record_vector_parameter(self):
+        def dydt(t, y, *args):
+            return [ -args[0][0]*y[0] ]
+
+        def rate(t):
+            return np.array([1., 2., 3.]) * (1 + t)
+
+        def gain(t):
+            return 0.5
+
+        fn0 = kSosodeFunction(dydt)
+        fn0.set_i_state(['y'])
+        fn0.set_i_param(['w'])
+        fn0.set_o_state(['y'])
+
+        fn1 = kSosodeFunction(rate)
+        fn1.set_o_param(['w'])
+
+        fn2 = kSosodeFunction(gain)
+        fn2.set_o_param(['k'])
+
+        b = kSosode( fn0, fn1, fn2, reverse=True )
+        b.create_nets()
+        b.start_recording(10)
+
+        for t in [0.0, 1.0]:
+            b.record_next(t)
+            b([1.], t)
+
+        T, w = b.get_log('w')
+        assert w.shape == (2, 3)
+        assert np.all( w == [[1., 2., 3.], [2., 4., 6.]] )
+
+        T, k = b.get_log('k')
+        assert k.shape == (2,)
+        assert list(k) == [0.5, 0.5]
+
+        T, wk = b.get_log('w', 'k')
+        assert wk.shape == (2, 4)
+        assert np.all( wk[1] == [2., 4., 6., 0.5] )
+
+        T, P = b.get_log()
+        assert P.shape == (2, 4)
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
@@ -0,0 +1,35 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from ksosode import kSosodeBenchmarks
+import json
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kSosodeBenchmarks:
+
+    def test_synthetic_graph(self):
+        b = kSosodeBenchmarks().create_synthetic(10)
+        assert b.create_nets()
+        assert len(b.list_of_states) == 5
+        assert len(b.list_of_params) == 5
+
+    def test_json_report(self, tmp_path):
+        # smoke test only, with small sizes:
+        bench    = kSosodeBenchmarks(sizes=(4,), sample_rates_Hz=(10,), repeat=1)
+        filename = tmp_path / "bench.json"
+        report   = bench.do_benchmarks(str(filename))
+
+        with open(filename) as f:
+            saved = json.load(f)
+
+        names = set( [i["name"] for i in saved["results"]] )
+        assert names == { "create_nets", "rhs", "integrator" }
+        assert len(saved["results"]) == len(report["results"])
+        assert all( [i["min_s"] > 0 for i in saved["results"]] )
+
+    def test_verbose(self, capsys):
+        kSosodeBenchmarks(sizes=(4,), sample_rates_Hz=(10,), repeat=1).bench_integrator()
+        assert capsys.readouterr().out == ""
+
+        kSosodeBenchmarks(sizes=(4,), sample_rates_Hz=(10,), repeat=1, verbose=True).bench_integrator()
+        assert capsys.readouterr().out.startswith("integrator")
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
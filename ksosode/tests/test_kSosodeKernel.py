@@ -0,0 +1,168 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+from ksosode import kSosode, kSosodeFunction, kSosodeKernel, kSosodeIntegrator
+import numpy as np
+import pytest
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+# the "full system" of kSosodeTests:
+
+def tta(t):
+    return 8. if t < 10 else -2.
+
+def eq0(t, y, *args):
+    tta = args[0]
+    return (-8.*y[0]) + (tta*y[1])
+
+def eq1(t, y):
+    return (30*y[0]) + y[1] - (y[0]*y[2])
+
+def eq2(t, y):
+    return (y[0]*y[1]) - (8.*y[2]/3)
+
+def create_system(handler_tta=tta):
+    fn0 = kSosodeFunction(eq0)
+    fn0.set_i_state([ 'y0', 'y1' ])
+    fn0.set_i_param([ 'tta' ])
+    fn0.set_o_state([ 'y0' ])
+
+    fn1 = kSosodeFunction(eq1)
+    fn1.set_i_state([ 'y0', 'y1', 'y2' ])
+    fn1.set_o_state([ 'y1' ])
+
+    fn2 = kSosodeFunction(eq2)
+    fn2.set_i_state([ 'y0', 'y1', 'y2' ])
+    fn2.set_o_state([ 'y2' ])
+
+    g0 = kSosodeFunction(handler_tta)
+    g0.set_o_param([ 'tta' ])
+
+    b = kSosode( fn0, fn1, fn2, g0, reverse=True, order_states= [ 'y0', 'y1', 'y2' ] )
+    b.create_nets()
+    return b
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_kSosodeKernel:
+
+    def test_without_nets(self):
+        b = kSosode( kSosodeFunction(eq1) )
+        with pytest.raises(NameError):
+            b.create_kernel()
+
+    def test_python_path(self):
+        b = create_system()
+        k = b.create_kernel(jit=False)
+
+        assert isinstance(k, kSosodeKernel)
+        assert not k.jitted
+
+        for t in np.linspace(0, 12, 25):
+            y = np.random.randn(3)
+            assert np.allclose(k(y, t), b(y, t))
+
+    def test_with_integrator(self):
+        # a kernel has the interface of kSosode.__call__() for kSosodeIntegrator:
+        def create(sys):
+            class Example(kSosodeIntegrator):
+                def __init__(self):
+                    self.sys    = sys
+                    self.state0 = [-1., 0., 1.]
+                    self.dt     = 0.01
+                    super().__init__()
+            return Example()
+
+        b = create_system()
+        a = create(b)
+        k = create(b.create_kernel(jit=False))
+        for _ in range(20):
+            a.update()
+            k.update()
+
+        assert k.curr_time == a.curr_time
+        assert np.allclose(k.state, a.state)
+
+    def test_jit_rhs(self):
+        pytest.importorskip("numba")
+        b = create_system()
+        k = b.create_kernel()
+
+        assert k.jitted, k.reason
+
+        for t in np.linspace(0, 12, 25):
+            y = np.random.randn(3)
+            assert np.allclose(k.rhs(t, y), b(y, t))
+
+    def test_jit_integrate(self):
+        pytest.importorskip("numba")
+        b  = create_system()
+        kj = b.create_kernel()
+        kp = b.create_kernel(jit=False)
+
+        Yj = kj.integrate([-1, 0, 1], t0=0.0, dt=1e-3, n=12000)
+        Yp = kp.integrate([-1, 0, 1], t0=0.0, dt=1e-3, n=200)
+
+        assert Yj.shape == (12001, 3)
+        assert np.allclose(Yj[:201], Yp)
+
+    def test_vector_parameter(self):
+        # the python nets keep the whole vector; the kernel shall agree with them:
+        def gains(t):
+            return np.array([ -1.0, 0.1*t ])
+
+        def eq(t, y, k):
+            return (k[0]*y[0]) + (k[1]*y[1])
+
+        def eq_y1(t, y):
+            return -y[0]
+
+        g  = kSosodeFunction(gains)
+        g.set_o_param([ 'k' ])
+        f0 = kSosodeFunction(eq)
+        f0.set_i_state([ 'y0', 'y1' ])
+        f0.set_i_param([ 'k' ])
+        f0.set_o_state([ 'y0' ])
+        f1 = kSosodeFunction(eq_y1)
+        f1.set_i_state([ 'y0' ])
+        f1.set_o_state([ 'y1' ])
+
+        b = kSosode( g, f0, f1, reverse=True, order_states=[ 'y0', 'y1' ] )
+        b.create_nets()
+        for jit in [False, True]:
+            k = b.create_kernel(jit=jit)
+            assert not k.jitted # (the compiled path only holds scalar parameters)
+            for t in np.linspace(0, 5, 11):
+                y = np.random.randn(2)
+                assert np.allclose(k.rhs(t, y), b(y, t))
+
+    def test_jit_does_not_call_handlers(self):
+        pytest.importorskip("numba")
+
+        # a handler that only accepts t >= 1:
+        def tta_late(t):
+            if t < 1.0:
+                raise ValueError("t < 1")
+            return 8.
+
+        b = create_system(tta_late)
+        k = b.create_kernel()
+        assert k.jitted, k.reason
+
+        Y = k.integrate([-1, 0, 1], t0=1.0, dt=1e-3, n=10)
+        assert np.allclose(Y, b.create_kernel(jit=False).integrate([-1, 0, 1], t0=1.0, dt=1e-3, n=10))
+
+    def test_fallback_when_not_jittable(self):
+        pytest.importorskip("numba")
+        table = { "before": 8., "after": -2. }
+
+        def tta_from_dict(t):
+            return table["before" if t < 10 else "after"]
+
+        b = create_system(tta_from_dict)
+        k = b.create_kernel()
+
+        assert not k.jitted
+        assert len(k.reason) > 0
+
+        y = np.random.randn(3)
+        assert np.allclose(k.rhs(1.0, y), b(y, 1.0))
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
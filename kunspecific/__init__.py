@@ -3,6 +3,7 @@ from .kDefault    import kDefault
 from .kGenerator  import kSignalGenerator
 from .kFile       import kFile
 from .kTimeLogger import kTimeLogger
+from .kBenchmarks import kBenchmarks
 
 __version__ = "1.0.0"
 __author__  = "Luciano A. Kruk"
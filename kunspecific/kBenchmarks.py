@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+"""
+Datei: kBenchmarks.py
+Beschreibung: Base of the benchmarks of the packages: timing with timeit and
+    report in JSON, to track regressions along the time.
+Autor: Luciano Auguto Kruk
+Erstellt am: 19.10.2026
+Version: 1.0.0
+Lizenz: Please keep this header with the file.
+GitHub:
+"""
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+##WWww=--  import section: --=wwWW##
+
+import json
+import platform
+import time
+import timeit
+import numpy as np
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+#                                                                                  #
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
+class kBenchmarks:
+    """
+    The subclasses implement the benchmarks as methods listed in BENCHMARKS,
+    which call _measure() once per result. do_benchmarks() runs all of them and
+    writes the report:
+
+        class kMyBenchmarks(kBenchmarks):
+            BENCHMARKS = ("bench_a",)
+
+            def bench_a(self):
+                self._measure("a", { "N": 10 }, "sum(x)", number=1000, namespace={ "x": range(10) })
+
+    Each result is a dict with "name", "params", "min_s", "mean_s" and "calls"
+    (number of operations timed per repetition; the times are per operation).
+    The minimum over the repetitions is the value to be tracked. With
+    verbose=True, each result is also printed.
+    """
+
+    # names of the methods that run the benchmarks, in order:
+    BENCHMARKS = ()
+
+    def __init__(self, repeat=5, verbose=False):
+        self.repeat  = repeat
+        self.verbose = verbose
+        self.results = []
+
+    def _measure(self, name, params, stmt, number=1, samples=1, namespace=None):
+        """
+        Times 'stmt' (a callable, or a statement evaluated in 'namespace'),
+        executed 'number' times per repetition. 'samples' is the number of
+        operations of one execution (eg. the calls of an inner loop, or the
+        points of a batch); the times are given per operation.
+        """
+        times = timeit.repeat(stmt, globals=namespace, number=number, repeat=self.repeat)
+        calls = number * samples
+        ret   = {
+            "name"   : name,
+            "params" : params,
+            "min_s"  : min(times) / calls,
+            "mean_s" : (sum(times) / len(times)) / calls,
+            "calls"  : calls,
+        }
+        self.results.append(ret)
+        if self.verbose:
+            print("{:<12s} {:<40s} {:12.3f} [us]".format(name, str(params), ret["min_s"]*1e6))
+        return ret
+
+    def do_benchmarks(self, filename=None):
+        """
+        Runs the benchmarks and returns the report; with 'filename', the report
+        is also written to JSON.
+        """
+        self.results = []
+        for i in self.BENCHMARKS:
+            getattr(self, i)()
+
+        report = {
+            "date"     : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python"   : platform.python_version(),
+            "numpy"    : np.__version__,
+            "machine"  : platform.machine(),
+            "results"  : self.results,
+        }
+
+        if filename is not None:
+            with open(filename, "w") as f:
+                json.dump(report, f, indent=2)
+
+        return report
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>#
@@ -0,0 +1,17 @@
+import sys    
+print(f"** __name__    = {__name__}")
+print(f"** __package__ = {__package__}")
+print(f"** sys.path[0] = {sys.path[0]}")
+
+# when this is called from within the folder 'tests/', we
+# need to add the path to the package __init__.py:
+sys.path.append("..")
+
+from ksosode import kSosodeBenchmarks
+
+if __name__ == "__main__":
+    # usage: python do_sos_benchmarks.py [output.json]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "bench_sosode.json"
+
+    bench = kSosodeBenchmarks(verbose=True)
+    bench.do_benchmarks(filename)
@@ -0,0 +1,75 @@
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+# Cold-import budget of the packages, measured with `python -X importtime`.
+#
+# The budgets are the targets documented in the README.md of the repository,
+# with margin for slow machines. Only the entry of the package is measured, not
+# the start-up of the interpreter. Most of the time of a cold import is spent by
+# numpy; scipy, mpmath, matplotlib and numba shall only be loaded on first use.
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+import subprocess
+import sys
+import os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statement : budget [ms]
+IMPORT_BUDGET_MS = {
+    "import knavigation"                : 400,
+    "from knavigation import kNavLib"   : 400,
+    "from knavigation import kArrayNav" : 400,
+    "import kltisystems"                : 400,
+    "import ksosode"                    : 400,
+    "import kunspecific"                : 400,
+}
+
+HEAVY_MODULES = ("scipy", "mpmath", "matplotlib", "numba")
+
+def importtime(statement):
+    """
+    Runs 'statement' in a fresh interpreter with `-X importtime`.
+
+    return:
+        total [ms]  :  cumulative time of the package imported by 'statement'
+                       (its own entry, so the interpreter start-up and the
+                       site imports are not counted)
+        modules     :  set with the names of all imported modules
+    """
+    ret = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+            cwd=ROOT, capture_output=True, text=True)
+    assert ret.returncode == 0, ret.stderr
+
+    package = statement.split()[1].split(".")[0]
+    total   = None
+    modules = set()
+    for line in ret.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if name.strip() == package and not name[1:].startswith(" "): # <= top-level entry of the package
+            total = int(cumulative)
+
+    assert total is not None, ret.stderr
+    return total * 1e-3, modules
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>
+class TestClass_ImportTime:
+
+    @pytest.mark.parametrize("statement", list(IMPORT_BUDGET_MS))
+    def test_cold_import(self, statement):
+        total_ms, modules = importtime(statement)
+        print("\n{:s}: {:.1f} [ms] (budget {:d} [ms])".format(statement, total_ms, IMPORT_BUDGET_MS[statement]))
+
+        heavy = [ i for i in modules if i.split(".")[0] in HEAVY_MODULES ]
+        assert heavy == []
+        assert total_ms < IMPORT_BUDGET_MS[statement]
+
+    def test_heavy_modules_on_first_use(self):
+        _, modules = importtime(
+            "from knavigation import kArray\n"
+            "kArray([[1,2],[3,4]]).to_orth()")
+        assert "scipy.linalg" in modules
+
+#>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>--<<..>>